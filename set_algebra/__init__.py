@@ -6,6 +6,14 @@ Provides:
     Endpoint
     Interval
     Set
+    PersistentSet
+    GapIndex
+    IntSet
+    BitmapSet
+    SetView
+    DiskSet
+    SharedSet
+    stream: Set operations over iterables of pieces
 """
 
 __version__ = '0.3.5'
@@ -18,4 +26,11 @@ from set_algebra.endpoint import Endpoint, are_bounding
 from set_algebra.infinity import Infinity, NegativeInfinity, is_finite, inf, neg_inf
 from set_algebra.interval import Interval, is_interval, is_scalar, unbounded
 from set_algebra.set_ import Set
+from set_algebra.persistent import PersistentSet
+from set_algebra.gap_index import GapIndex
+from set_algebra.int_set import IntSet
+from set_algebra.bitmap import BitmapSet
+from set_algebra.view import SetView
+from set_algebra.disk import DiskSet
+from set_algebra.shared import SharedSet
 
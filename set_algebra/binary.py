@@ -0,0 +1,216 @@
+"""
+Binary format of pieces of a Set, see Set.to_bytes() and Set.from_buffer().
+
+Layout, all numbers little-endian:
+    header    16 bytes: b'SETA', format version (1 byte),
+              value type code (1 byte), 2 zero bytes, number of pieces n (8 bytes)
+    starts    n values of 8 bytes, start of every piece
+    ends      n values of 8 bytes, end of every piece
+    flags     n bytes, bit flags of every piece, see below
+
+Value type codes:
+    q   64-bit signed integers
+    d   64-bit floats, for Sets of floats or of floats and ints
+    M   naive datetimes as 64-bit number of microseconds since 1970-01-01
+    D   dates as 64-bit proleptic Gregorian ordinals, see date.toordinal()
+
+Infinite bounds are marked with flags and stored as the least and the
+greatest value of the type, so starts and ends are sorted in ascending
+order and can be binary searched right in the buffer.
+"""
+import datetime
+import numbers
+import struct
+
+from set_algebra.endpoint import Endpoint
+from set_algebra.infinity import inf, is_finite, neg_inf
+from set_algebra.interval import Interval
+
+
+MAGIC = b'SETA'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sBcxxQ')
+# Bytes per piece: start, end and flags.
+PIECE_SIZE = 17
+
+# Flags of a piece.
+A_OPEN = 1      # start is open
+B_OPEN = 2      # end is open
+SCALAR = 4      # piece is a scalar, start and end are equal
+A_INF = 8       # start is -inf
+B_INF = 16      # end is inf
+A_INT = 32      # start is int stored as float
+B_INT = 64      # end is int stored as float
+
+INT_MIN = -2**63
+INT_MAX = 2**63 - 1
+# Ints up to 2**53 are stored as floats exactly.
+FLOAT_INT_MAX = 2**53
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+# struct format character of every value type.
+STRUCT_FORMATS = {b'q': 'q', b'd': 'd', b'M': 'q', b'D': 'q'}
+
+# Stored values standing for -inf and inf.
+SENTINELS = {
+    b'q': (INT_MIN, INT_MAX),
+    b'd': (float('-inf'), float('inf')),
+    b'M': (INT_MIN, INT_MAX),
+    b'D': (INT_MIN, INT_MAX),
+}
+
+
+def _is_int(value):
+    return isinstance(value, numbers.Integral) and not isinstance(value, bool)
+
+
+def to_micros(value):
+    """Return number of microseconds from EPOCH to naive datetime value."""
+    delta = value - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def from_micros(micros):
+    """Return naive datetime given number of microseconds from EPOCH."""
+    return EPOCH + datetime.timedelta(microseconds=micros)
+
+
+ENCODERS = {b'M': to_micros, b'D': datetime.date.toordinal}
+DECODERS = {b'M': from_micros, b'D': datetime.date.fromordinal}
+
+
+def value_type(values):
+    """
+    Return type code for iterable of finite values,
+    raise ValueError if they cannot be stored in the binary format.
+    """
+    code = None
+    big_int = False
+    for value in values:
+        if isinstance(value, datetime.datetime):
+            if value.tzinfo is not None:
+                raise ValueError('Only naive datetimes can be stored, not %r' % (value,))
+            kind = b'M'
+        elif isinstance(value, datetime.date):
+            kind = b'D'
+        elif isinstance(value, float):
+            kind = b'd'
+        elif _is_int(value):
+            if not INT_MIN <= value <= INT_MAX:
+                raise ValueError('%s is out of range of 64-bit integer' % value)
+            big_int = big_int or abs(value) > FLOAT_INT_MAX
+            kind = b'q'
+        else:
+            raise ValueError('%s values cannot be stored' % type(value).__name__)
+        if code is None or code == kind:
+            code = kind
+        elif code in (b'q', b'd') and kind in (b'q', b'd'):
+            code = b'd'
+        else:
+            raise ValueError('%r cannot be stored along with values of other types' % (value,))
+    if code == b'd' and big_int:
+        raise ValueError('Ints greater than 2**53 cannot be stored along with floats')
+    return code or b'q'
+
+
+def pack(pieces):
+    """Return bytes with list of pieces in the binary format."""
+    n = len(pieces)
+    starts = []
+    ends = []
+    flags = bytearray(n)
+    for i, p in enumerate(pieces):
+        if isinstance(p, Interval):
+            starts.append(p.a.value)
+            ends.append(p.b.value)
+            flags[i] = (A_OPEN if p.a.open else 0) | (B_OPEN if p.b.open else 0)
+        else:
+            starts.append(p)
+            ends.append(p)
+            flags[i] = SCALAR
+
+    code = value_type(v for v in starts + ends if is_finite(v))
+    encode = ENCODERS.get(code)
+    lowest, greatest = SENTINELS[code]
+    for i in range(n):
+        a = starts[i]
+        b = ends[i]
+        if a == neg_inf:
+            flags[i] |= A_INF
+            starts[i] = lowest
+        elif encode is not None:
+            starts[i] = encode(a)
+        elif code == b'd' and _is_int(a):
+            flags[i] |= A_INT
+        if b == inf:
+            flags[i] |= B_INF
+            ends[i] = greatest
+        elif encode is not None:
+            ends[i] = encode(b)
+        elif code == b'd' and _is_int(b):
+            flags[i] |= B_INT
+
+    values_format = '<%d%s' % (n, STRUCT_FORMATS[code])
+    return b''.join([
+        HEADER.pack(MAGIC, FORMAT_VERSION, code, n),
+        struct.pack(values_format, *starts),
+        struct.pack(values_format, *ends),
+        bytes(flags),
+    ])
+
+
+def read_header(buf):
+    """
+    Return tuple (type code, number of pieces) from header in buffer buf,
+    raise ValueError if buf does not hold pieces in the binary format.
+    """
+    if len(buf) < HEADER.size:
+        raise ValueError('Buffer is too short for Set header')
+    magic, version, code, n = HEADER.unpack_from(buf)
+    if magic != MAGIC:
+        raise ValueError('Buffer does not contain Set')
+    if version != FORMAT_VERSION:
+        raise ValueError('Unsupported Set format version %s' % version)
+    if code not in STRUCT_FORMATS:
+        raise ValueError('Unknown Set value type %r' % code)
+    if len(buf) < HEADER.size + PIECE_SIZE * n:
+        raise ValueError('Buffer is too short for %d pieces' % n)
+    return code, n
+
+
+def unpack(buf):
+    """
+    Return list of pieces stored in the binary format in buffer buf,
+    which is any object supporting buffer protocol - bytes, memoryview, mmap.
+    Values are unpacked in bulk and pieces made without validation,
+    so buf must be made by pack().
+    """
+    code, n = read_header(buf)
+    values_format = '<%d%s' % (n, STRUCT_FORMATS[code])
+    offset = HEADER.size
+    starts = struct.unpack_from(values_format, buf, offset)
+    ends = struct.unpack_from(values_format, buf, offset + 8 * n)
+    flags = bytearray(buf[offset + 16 * n:offset + PIECE_SIZE * n])
+    return [decode_piece(code, starts[i], ends[i], flags[i]) for i in range(n)]
+
+
+def decode_piece(code, a, b, f):
+    """Return scalar or Interval given stored start a, end b and flags f."""
+    decode = DECODERS.get(code)
+    if f & A_INF:
+        a = neg_inf
+    elif decode is not None:
+        a = decode(a)
+    elif f & A_INT:
+        a = int(a)
+    if f & SCALAR:
+        return a
+    if f & B_INF:
+        b = inf
+    elif decode is not None:
+        b = decode(b)
+    elif f & B_INT:
+        b = int(b)
+    make = Endpoint._make
+    return Interval._make(make(a, f & A_OPEN == A_OPEN, True), make(b, f & B_OPEN == B_OPEN, False))
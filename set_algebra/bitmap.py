@@ -0,0 +1,587 @@
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+
+from set_algebra.int_set import MAX, MIN, IntSet, _array, _run
+from set_algebra.parser import string_types
+from set_algebra.set_ import Set
+
+
+# Every chunk holds 2**16 integers sharing the same high bits.
+CHUNK_BITS = 16
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+# Run list of 2 shorts per run takes more memory than 2**16 bit bitmap
+# when there are more runs than that.
+RUNS_MAX = (1 << CHUNK_BITS) // 32
+
+_ones = re.compile('1+')
+
+
+class _Runs(object):
+    """Chunk container: runs of consecutive integers, both ends included."""
+    __slots__ = ('starts', 'ends')
+
+    def __init__(self, starts, ends):
+        self.starts = starts
+        self.ends = ends
+
+    def copy(self):
+        return _Runs(array('H', self.starts), array('H', self.ends))
+
+
+def _mask(start, end):
+    """Return bitmap with bits from start to end set."""
+    return ((1 << (end - start + 1)) - 1) << start
+
+
+def _bitmap(c):
+    """Return chunk container as bitmap."""
+    if isinstance(c, _Runs):
+        bitmap = 0
+        for start, end in zip(c.starts, c.ends):
+            bitmap |= _mask(start, end)
+        return bitmap
+    return c
+
+
+if hasattr(int, 'bit_count'):
+    _popcount = int.bit_count
+else:
+    def _popcount(bitmap):
+        """Return number of bits set in non-negative int bitmap."""
+        return bin(bitmap).count('1')
+
+
+def _run_count(bitmap):
+    """Return number of runs of bits set in bitmap."""
+    return _popcount(bitmap & ~(bitmap << 1))
+
+
+# Runs of sparse bitmaps are found with arithmetic, of others with bin().
+SPARSE_RUNS = 32
+
+
+def _bitmap_runs(bitmap):
+    """Return list of runs (start, end) of bits set in bitmap."""
+    if _run_count(bitmap) <= SPARSE_RUNS:
+        runs = []
+        while bitmap:
+            low = bitmap & -bitmap
+            # Adding the lowest bit clears its run and sets the bit after it.
+            carry = bitmap + low
+            high = carry & -carry
+            runs.append((low.bit_length() - 1, high.bit_length() - 2))
+            bitmap &= carry
+        return runs
+    # bin() is most significant bit first, reversed so that index is bit number.
+    bits = bin(bitmap)[:1:-1]
+    return [(m.start(), m.end() - 1) for m in _ones.finditer(bits)]
+
+
+def _runs_container(runs):
+    """
+    Return run list container for list of runs (start, end),
+    or bitmap if there are too many runs, or None if there are none.
+    """
+    if not runs:
+        return None
+    c = _Runs(array('H', [r[0] for r in runs]), array('H', [r[1] for r in runs]))
+    if len(runs) > RUNS_MAX:
+        return _bitmap(c)
+    return c
+
+
+def _container(bitmap):
+    """
+    Return the smaller of run list and bitmap containers for bitmap,
+    or None if bitmap is empty.
+    """
+    if not bitmap:
+        return None
+    if _run_count(bitmap) > RUNS_MAX:
+        return bitmap
+    return _runs_container(_bitmap_runs(bitmap))
+
+
+def _toggles(c):
+    """Return list of positions where membership changes in run list c: starts and ends + 1."""
+    return [x for start, end in zip(c.starts, c.ends) for x in (start, end + 1)]
+
+
+def _merge_runs(c1, c2, op):
+    """
+    Return container of integers x of run lists c1 and c2, for which
+    op(x in c1, x in c2) is 1, with op being a bitwise function of 0s and 1s.
+    Sweeps over the bounds of runs in O(r1 + r2) time.
+    """
+    toggles1 = _toggles(c1)
+    toggles2 = _toggles(c2)
+    n, m = len(toggles1), len(toggles2)
+    # Positions after all the others.
+    toggles1.append(CHUNK_MASK + 2)
+    toggles2.append(CHUNK_MASK + 2)
+    runs = []
+    i = j = 0
+    in1 = in2 = inside = 0
+    start = None
+    while i < n or j < m:
+        x = min(toggles1[i], toggles2[j])
+        if toggles1[i] == x:
+            in1 ^= 1
+            i += 1
+        if toggles2[j] == x:
+            in2 ^= 1
+            j += 1
+        now = op(in1, in2) & 1
+        if now != inside:
+            if now:
+                start = x
+            else:
+                runs.append((start, x - 1))
+            inside = now
+    return _runs_container(runs)
+
+
+def _chunk_runs(c):
+    """Return list of runs (start, end) of chunk container."""
+    if isinstance(c, _Runs):
+        return list(zip(c.starts, c.ends))
+    return _bitmap_runs(c)
+
+
+def _chunks_equal(c1, c2):
+    if isinstance(c1, _Runs) and isinstance(c2, _Runs):
+        return c1.starts == c2.starts and c1.ends == c2.ends
+    return _bitmap(c1) == _bitmap(c2)
+
+
+class BitmapSet(object):
+    """
+    Set of integers stored in chunks of 2**16 integers, roaring bitmap style.
+
+    Each non-empty chunk is kept either as run list (two arrays of 16-bit
+    starts and ends) or as bitmap (Python int of 2**16 bits), whichever takes
+    less memory. So millions of scattered integers take a few bytes each,
+    dense chunks take one bit per integer, and runs of any length are cheap.
+    Union, intersection and difference are done chunk by chunk: run lists
+    with run lists by merging their runs, and with word-level bitwise
+    operations when either chunk is a bitmap.
+
+    BitmapSet contains finite integers only, any integer values are allowed.
+    It can be instantiated from either:
+        - iterable of integers and/or bounded intervals
+        - notation string, same as for Set
+        - Set, IntSet or BitmapSet
+        - nothing for empty BitmapSet
+    Non-integer and open bounds are normalized as in IntSet.
+    Use to_set() or to_int_set() to convert back to interval-based representation.
+
+    >>> s = BitmapSet([1, 2, 3, 10, Interval('[100, 200)')])
+    >>> s.notation
+    '[1, 3], {10}, [100, 199]'
+    >>> len(s)
+    104
+    """
+    __slots__ = ('keys', 'chunks')
+
+    def __init__(self, arg=None):
+        self.keys = []
+        self.chunks = []
+        if arg is None:
+            return
+        if isinstance(arg, BitmapSet):
+            self.keys = list(arg.keys)
+            self.chunks = [c.copy() if isinstance(c, _Runs) else c for c in arg.chunks]
+            return
+        if isinstance(arg, string_types):
+            arg = Set(arg)
+        if isinstance(arg, (Set, IntSet)):
+            arg = arg.pieces
+        # Sorting first makes every insertion an append to the last chunk.
+        runs = sorted(r for r in map(self._run, arg) if r is not None)
+        for start, end in runs:
+            self._add_run(start, end)
+
+    @staticmethod
+    def _run(x):
+        run = _run(x)
+        if run is not None and (run[0] == MIN or run[1] == MAX):
+            raise ValueError('BitmapSet can not contain unbounded %s' % x)
+        return run
+
+    @classmethod
+    def _from_chunks(cls, keys, chunks):
+        new = cls.__new__(cls)
+        new.keys = keys
+        new.chunks = chunks
+        return new
+
+    def _iter_runs(self):
+        """Yield runs (start, end) of all integers in ascending order."""
+        last = None
+        for key, c in zip(self.keys, self.chunks):
+            base = key << CHUNK_BITS
+            for start, end in _chunk_runs(c):
+                start += base
+                end += base
+                if last is None:
+                    last = [start, end]
+                elif start == last[1] + 1:
+                    last[1] = end
+                else:
+                    yield tuple(last)
+                    last = [start, end]
+        if last is not None:
+            yield tuple(last)
+
+    def to_int_set(self):
+        """Return IntSet containing the same integers."""
+        runs = list(self._iter_runs())
+        starts = _array(r[0] for r in runs)
+        ends = _array(r[1] for r in runs)
+        return IntSet._from_runs((starts, ends))
+
+    def to_set(self):
+        """Return Set containing the same integers as runs of closed intervals."""
+        return self.to_int_set().to_set()
+
+    @property
+    def pieces(self):
+        """List of runs as scalars and closed intervals, like Set.pieces."""
+        return self.to_int_set().pieces
+
+    @property
+    def notation(self):
+        return self.to_set().notation
+
+    def __repr__(self):
+        return '%s(%s)' % (type(self).__name__, self.pieces)
+
+    def __bool__(self):
+        return len(self.keys) > 0
+
+    def __nonzero__(self):
+        return len(self.keys) > 0
+
+    def __len__(self):
+        """Return number of integers in BitmapSet."""
+        n = 0
+        for c in self.chunks:
+            if isinstance(c, _Runs):
+                n += sum(c.ends) - sum(c.starts) + len(c.starts)
+            else:
+                n += _popcount(c)
+        return n
+
+    def __iter__(self):
+        """Iterate over integers in ascending order."""
+        for start, end in self._iter_runs():
+            for x in range(start, end + 1):
+                yield x
+
+    def _chunk(self, key):
+        """Return index of chunk with given key, or -1."""
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return i
+        return -1
+
+    def __contains__(self, x):
+        """
+        x in self
+        Test integer or interval x for membership in BitmapSet.
+        Interval is in BitmapSet if all the integers in the Interval are.
+        """
+        try:
+            run = _run(x)
+        except (TypeError, ValueError):
+            return False
+        if run is None:
+            return True
+        start, end = run
+        for key in range((start >> CHUNK_BITS), (end >> CHUNK_BITS) + 1):
+            i = self._chunk(key)
+            if i == -1:
+                return False
+            c = self.chunks[i]
+            lo = max(start - (key << CHUNK_BITS), 0)
+            hi = min(end - (key << CHUNK_BITS), CHUNK_MASK)
+            if isinstance(c, _Runs):
+                j = bisect_right(c.starts, lo) - 1
+                if j < 0 or hi > c.ends[j]:
+                    return False
+            else:
+                mask = _mask(lo, hi)
+                if c & mask != mask:
+                    return False
+        return True
+
+    def _add_run(self, start, end):
+        for key in range((start >> CHUNK_BITS), (end >> CHUNK_BITS) + 1):
+            lo = max(start - (key << CHUNK_BITS), 0)
+            hi = min(end - (key << CHUNK_BITS), CHUNK_MASK)
+            i = bisect_left(self.keys, key)
+            if i == len(self.keys) or self.keys[i] != key:
+                self.keys.insert(i, key)
+                self.chunks.insert(i, _Runs(array('H', [lo]), array('H', [hi])))
+                continue
+            c = self.chunks[i]
+            if not isinstance(c, _Runs):
+                self.chunks[i] = c | _mask(lo, hi)
+                continue
+            starts, ends = c.starts, c.ends
+            # Runs from j to k are intersecting or adjacent to lo..hi.
+            j = bisect_left(ends, lo - 1)
+            k = bisect_right(starts, hi + 1)
+            if j < k:
+                lo = min(lo, starts[j])
+                hi = max(hi, ends[k-1])
+            starts[j:k] = array('H', [lo])
+            ends[j:k] = array('H', [hi])
+            if len(starts) > RUNS_MAX:
+                self.chunks[i] = _bitmap(c)
+
+    def _remove_run(self, start, end):
+        for key in range((start >> CHUNK_BITS), (end >> CHUNK_BITS) + 1):
+            i = self._chunk(key)
+            if i == -1:
+                continue
+            lo = max(start - (key << CHUNK_BITS), 0)
+            hi = min(end - (key << CHUNK_BITS), CHUNK_MASK)
+            c = self.chunks[i]
+            if isinstance(c, _Runs):
+                starts, ends = c.starts, c.ends
+                # Runs from j to k are intersecting with lo..hi.
+                j = bisect_left(ends, lo)
+                k = bisect_right(starts, hi)
+                if j >= k:
+                    continue
+                new_starts = array('H')
+                new_ends = array('H')
+                if starts[j] < lo:
+                    new_starts.append(starts[j])
+                    new_ends.append(lo - 1)
+                if ends[k-1] > hi:
+                    new_starts.append(hi + 1)
+                    new_ends.append(ends[k-1])
+                starts[j:k] = new_starts
+                ends[j:k] = new_ends
+                empty = not starts
+                if len(starts) > RUNS_MAX:
+                    self.chunks[i] = _bitmap(c)
+            else:
+                c &= ~_mask(lo, hi)
+                self.chunks[i] = c
+                empty = not c
+            if empty:
+                del self.keys[i]
+                del self.chunks[i]
+
+    def add(self, x):
+        """Add integer or bounded interval x to BitmapSet."""
+        run = self._run(x)
+        if run is not None:
+            self._add_run(*run)
+
+    def remove(self, x):
+        """Remove integer or bounded interval x from BitmapSet."""
+        run = self._run(x)
+        if run is not None:
+            self._remove_run(*run)
+
+    def clear(self):
+        """Remove all integers from BitmapSet."""
+        self.keys = []
+        self.chunks = []
+
+    def copy(self):
+        """Return a copy of BitmapSet."""
+        return BitmapSet(self)
+
+    @staticmethod
+    def _check_operand(other, op):
+        if not isinstance(other, BitmapSet):
+            emsg = "unsupported operand type for %s: %s and %s"
+            raise TypeError(emsg % (op, BitmapSet, type(other)))
+
+    def _merge(self, other, op, keep_self, keep_other):
+        """
+        Return new BitmapSet combining chunks with bitwise function op.
+        Chunks present in one operand only are kept if keep_self or keep_other.
+        """
+        keys = []
+        chunks = []
+        i = j = 0
+        n, m = len(self.keys), len(other.keys)
+        while i < n or j < m:
+            if j == m or i < n and self.keys[i] < other.keys[j]:
+                if keep_self:
+                    keys.append(self.keys[i])
+                    c = self.chunks[i]
+                    chunks.append(c.copy() if isinstance(c, _Runs) else c)
+                i += 1
+            elif i == n or self.keys[i] > other.keys[j]:
+                if keep_other:
+                    keys.append(other.keys[j])
+                    c = other.chunks[j]
+                    chunks.append(c.copy() if isinstance(c, _Runs) else c)
+                j += 1
+            else:
+                c1 = self.chunks[i]
+                c2 = other.chunks[j]
+                if isinstance(c1, _Runs) and isinstance(c2, _Runs):
+                    c = _merge_runs(c1, c2, op)
+                else:
+                    c = _container(op(_bitmap(c1), _bitmap(c2)))
+                if c is not None:
+                    keys.append(self.keys[i])
+                    chunks.append(c)
+                i += 1
+                j += 1
+        return self._from_chunks(keys, chunks)
+
+    def __eq__(self, other):
+        return isinstance(other, BitmapSet) and self.keys == other.keys \
+           and all(_chunks_equal(a, b) for a, b in zip(self.chunks, other.chunks))
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __or__(self, other):
+        """
+        self | other
+        Return a new BitmapSet that is a union of the BitmapSet and the other.
+        """
+        self._check_operand(other, '|')
+        return self._merge(other, lambda a, b: a | b, True, True)
+
+    def __and__(self, other):
+        """
+        self & other
+        Return a new BitmapSet that is an intersection of the BitmapSet and the other.
+        """
+        self._check_operand(other, '&')
+        return self._merge(other, lambda a, b: a & b, False, False)
+
+    def __sub__(self, other):
+        """
+        self - other
+        Return a new BitmapSet with integers that are in the BitmapSet but not in the other.
+        """
+        self._check_operand(other, '-')
+        return self._merge(other, lambda a, b: a & ~b, True, False)
+
+    def __xor__(self, other):
+        """
+        self ^ other
+        Return a new BitmapSet with integers in either the BitmapSet or the other but not in both.
+        """
+        self._check_operand(other, '^')
+        return self._merge(other, lambda a, b: a ^ b, True, True)
+
+    def _update_from(self, new):
+        self.keys = new.keys
+        self.chunks = new.chunks
+        return self
+
+    def __ior__(self, other):
+        """self |= other"""
+        return self._update_from(self | other)
+
+    def __iand__(self, other):
+        """self &= other"""
+        return self._update_from(self & other)
+
+    def __isub__(self, other):
+        """self -= other"""
+        return self._update_from(self - other)
+
+    def __ixor__(self, other):
+        """self ^= other"""
+        return self._update_from(self ^ other)
+
+    def __ge__(self, other):
+        """
+        self >= other
+        Test whether every integer in the other is in the BitmapSet.
+        """
+        self._check_operand(other, '>=')
+        return not other - self
+
+    def __le__(self, other):
+        """
+        self <= other
+        Test whether every integer in the BitmapSet is in the other.
+        """
+        self._check_operand(other, '<=')
+        return not self - other
+
+    def __gt__(self, other):
+        """
+        self > other
+        Test whether the BitmapSet is a proper superset of the other.
+        """
+        return self >= other and self != other
+
+    def __lt__(self, other):
+        """
+        self < other
+        Test whether the BitmapSet is a proper subset of the other.
+        """
+        return self <= other and self != other
+
+    def isdisjoint(self, other):
+        """Return True if the BitmapSet has no integers in common with the other."""
+        return not self & BitmapSet(other)
+
+    def issubset(self, other):
+        """Test whether every integer in the BitmapSet is in the other."""
+        return self <= BitmapSet(other)
+
+    def issuperset(self, other):
+        """Test whether every integer in the other is in the BitmapSet."""
+        return self >= BitmapSet(other)
+
+    def union(self, *others):
+        """Return a new BitmapSet that is a union of the BitmapSet and all the others."""
+        new = self.copy()
+        for other in others:
+            new |= BitmapSet(other)
+        return new
+
+    def update(self, *others):
+        """Update the BitmapSet, adding integers from all the others."""
+        self._update_from(self.union(*others))
+
+    def intersection(self, *others):
+        """Return a new BitmapSet that is an intersection of the BitmapSet and all the others."""
+        new = self.copy()
+        for other in others:
+            new &= BitmapSet(other)
+        return new
+
+    def intersection_update(self, *others):
+        """Update the BitmapSet, removing everything that is not in any of the others."""
+        self._update_from(self.intersection(*others))
+
+    def difference(self, *others):
+        """Return a new BitmapSet without integers that are in any of the others."""
+        new = self.copy()
+        for other in others:
+            new -= BitmapSet(other)
+        return new
+
+    def difference_update(self, *others):
+        """Update the BitmapSet, removing integers found in the others."""
+        self._update_from(self.difference(*others))
+
+    def symmetric_difference(self, *others):
+        """Return a new BitmapSet with integers in odd number of the BitmapSet and the others."""
+        new = self.copy()
+        for other in others:
+            new ^= BitmapSet(other)
+        return new
+
+    def symmetric_difference_update(self, *others):
+        """Update the BitmapSet, keeping integers found in odd number of the BitmapSet and the others."""
+        self._update_from(self.symmetric_difference(*others))
@@ -0,0 +1,355 @@
+import os
+import pickle
+import shutil
+import tempfile
+from bisect import bisect_left, bisect_right
+from itertools import islice
+
+from set_algebra.interval import Interval
+from set_algebra.set_ import Set, search_pieces
+from set_algebra.stream import (_difference, _intersection, _sweep,
+    _symmetric_difference, _union)
+
+try:
+    from itertools import zip_longest
+except ImportError:
+    from itertools import izip_longest as zip_longest
+
+
+# Maximum number of pieces in a chunk file of DiskSet.
+CHUNK_SIZE = 4096
+# Number of unsorted pieces sorted in memory at a time by DiskSet.from_iterable().
+RUN_SIZE = 65536
+
+INDEX_NAME = 'index'
+INDEX_VERSION = 1
+
+
+def _chunk_name(i):
+    return '%08d.chunk' % i
+
+
+def _bounds(x):
+    """Return the lowest and the highest bounds of scalar or interval x."""
+    if isinstance(x, Interval):
+        return x.a, x.b
+    return x, x
+
+
+def _pieces(s):
+    """Return iterable of pieces of Set, DiskSet or iterable of pieces s."""
+    return s.pieces if isinstance(s, Set) else s
+
+
+class DiskSet(object):
+    """
+    Immutable Set stored on disk, for Sets that do not fit into memory.
+
+    Pieces are kept in a directory, in chunk files of at most chunk_size
+    pieces each. Only the index of chunks is held in memory - the first and
+    the last bounds and the number of pieces of every chunk. search() and "in"
+    find the chunk with binary search over the index and read that chunk only,
+    the last chunk read is kept in memory for subsequent searches.
+
+    DiskSet(directory) opens a DiskSet written before. New DiskSets are
+    written with:
+        DiskSet.from_sorted(directory, pieces) - from pieces sorted in
+            ascending order, e.g. Set.pieces or result of set_algebra.stream.
+        DiskSet.from_iterable(directory, pieces) - from pieces in any order,
+            possibly intersecting. Runs of RUN_SIZE pieces are sorted
+            in memory, written to temporary DiskSets and merged (external sort).
+
+    union(), intersection(), difference() and symmetric_difference(),
+    as well as | & - ^, accept Sets and DiskSets and stream chunks of all the
+    operands through a merge, holding one chunk of each in memory.
+    Their optional directory argument tells where to write the result;
+    by default a new temporary directory is made, removing it is up to the
+    caller, see destroy().
+
+    Read API is the same as of Set: search(), "in", irange(), iteration,
+    len(), pieces, notation, to_set().
+
+    Chunk files are pickled tuples of pieces, so values can be of any
+    picklable comparable type. DiskSet files must not be changed while open.
+
+    Security: the index and chunk files are read with pickle, which can
+    execute arbitrary code. Open only DiskSet directories written by
+    a trusted process and not writable by anyone else.
+
+    >>> d = DiskSet.from_sorted('/tmp/ranges', Set('[1, 5], [10, 20]').pieces)
+    >>> 15 in d
+    True
+    >>> DiskSet('/tmp/ranges').notation
+    '[1, 5], [10, 20]'
+    """
+    __slots__ = ('directory', '_starts', '_ends', '_offsets', '_size', '_cached')
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, INDEX_NAME), 'rb') as f:
+            index = pickle.load(f)
+        if index['version'] != INDEX_VERSION:
+            raise ValueError('Unsupported DiskSet version %s' % index['version'])
+        self.directory = directory
+        self._starts = index['starts']
+        self._ends = index['ends']
+        offsets = []
+        size = 0
+        for count in index['counts']:
+            offsets.append(size)
+            size += count
+        self._offsets = offsets
+        self._size = size
+        # Index and pieces of the last chunk read by search().
+        self._cached = (None, None)
+
+    @classmethod
+    def from_sorted(cls, directory, pieces, chunk_size=CHUNK_SIZE):
+        """
+        Write pieces sorted in ascending order to directory, return DiskSet.
+        directory must not exist or be empty, None means a new temporary one.
+        Touching pieces are coalesced, ValueError is raised if pieces
+        intersect or are not sorted. pieces are consumed one at a time,
+        so they can be a generator of any length. If writing fails,
+        e.g. pieces raise, nothing is left in directory.
+        """
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be positive')
+        if directory is None:
+            directory = temp = tempfile.mkdtemp(prefix='diskset-')
+        else:
+            if os.path.exists(os.path.join(directory, INDEX_NAME)):
+                raise ValueError('%s already contains a DiskSet' % directory)
+            if os.path.isdir(directory) and os.listdir(directory):
+                raise ValueError('%s is not empty' % directory)
+            parent = os.path.dirname(os.path.abspath(directory))
+            if not os.path.isdir(parent):
+                os.makedirs(parent)
+            # Files are written to a temporary sibling directory renamed
+            # to directory at the end, so a failure leaves nothing behind.
+            temp = tempfile.mkdtemp(dir=parent, prefix='.%s.' % os.path.basename(directory))
+        try:
+            cls._write(temp, pieces, chunk_size)
+            if temp != directory:
+                if os.path.isdir(directory):
+                    os.rmdir(directory)
+                os.rename(temp, directory)
+        except BaseException:
+            shutil.rmtree(temp)
+            raise
+        return cls(directory)
+
+    @staticmethod
+    def _write(directory, pieces, chunk_size):
+        """Write chunk files and index of sorted pieces to existing directory."""
+        starts = []
+        ends = []
+        counts = []
+        # Sweep validates order and coalesces touching pieces.
+        canonical = _sweep([pieces], _union)
+        while True:
+            chunk = tuple(islice(canonical, chunk_size))
+            if not chunk:
+                break
+            with open(os.path.join(directory, _chunk_name(len(counts))), 'wb') as f:
+                pickle.dump(chunk, f, pickle.HIGHEST_PROTOCOL)
+            starts.append(_bounds(chunk[0])[0])
+            ends.append(_bounds(chunk[-1])[1])
+            counts.append(len(chunk))
+
+        index = {'version': INDEX_VERSION, 'starts': starts, 'ends': ends, 'counts': counts}
+        with open(os.path.join(directory, INDEX_NAME), 'wb') as f:
+            pickle.dump(index, f, pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def from_iterable(cls, directory, pieces, chunk_size=CHUNK_SIZE, run_size=RUN_SIZE):
+        """
+        Write union of pieces given in any order to directory, return DiskSet.
+        At most run_size pieces are held in memory at a time.
+        """
+        if run_size < 1:
+            raise ValueError('run_size must be positive')
+        temp = tempfile.mkdtemp(prefix='diskset-runs-')
+        try:
+            runs = []
+            it = iter(pieces)
+            while True:
+                run = Set(islice(it, run_size))
+                if not run:
+                    break
+                path = os.path.join(temp, str(len(runs)))
+                runs.append(cls.from_sorted(path, run.pieces, chunk_size))
+            return cls.from_sorted(directory, _sweep(runs, _union), chunk_size)
+        finally:
+            shutil.rmtree(temp)
+
+    def destroy(self):
+        """Remove the directory of the DiskSet with all its files."""
+        shutil.rmtree(self.directory)
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, self.directory)
+
+    def _load(self, i):
+        """Read and return tuple of pieces of chunk i."""
+        with open(os.path.join(self.directory, _chunk_name(i)), 'rb') as f:
+            return pickle.load(f)
+
+    def _chunk(self, i):
+        """Return chunk i, reading it unless it is the last one read."""
+        cached_i, chunk = self._cached
+        if cached_i != i:
+            chunk = self._load(i)
+            self._cached = (i, chunk)
+        return chunk
+
+    def __iter__(self):
+        """Iterate over pieces in ascending order, reading one chunk at a time."""
+        for i in range(len(self._offsets)):
+            for piece in self._load(i):
+                yield piece
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __nonzero__(self):
+        return self._size > 0
+
+    @property
+    def pieces(self):
+        """List of all the pieces, read into memory."""
+        return list(self)
+
+    @property
+    def notation(self):
+        chunks = []
+        for p in self:
+            if isinstance(p, Interval):
+                chunks.append(p.notation)
+            else:
+                chunks.append('{%s}' % p)
+        return ', '.join(chunks)
+
+    def to_set(self):
+        """Return a Set with all the pieces, read into memory."""
+        new = Set()
+        new.pieces = self.pieces
+        return new
+
+    def search(self, x, lo=0, hi=None):
+        """
+        Search scalar x in DiskSet, same as Set.search().
+        Return tuple of two elements:
+            the index where to insert x in list of pieces.
+            piece that contains x or equals to x, or None if none found.
+        Optional args lo (default 0) and hi (default len(self)) bound
+            the indices of pieces to be searched.
+        Reads at most one chunk.
+        """
+        if lo < 0:
+            raise ValueError('lo must be non-negative')
+        if hi is None or hi > self._size:
+            hi = self._size
+        if lo >= hi:
+            return lo, None
+        offsets = self._offsets
+        c_lo = bisect_right(offsets, lo) - 1
+        c_hi = bisect_left(offsets, hi)
+        c = bisect_left(self._ends, x, c_lo, c_hi)
+        if c == c_hi:
+            return hi, None
+        base = offsets[c]
+        if self._starts[c] > x:
+            # x is in the gap before chunk c.
+            return max(base, lo), None
+        chunk = self._chunk(c)
+        idx, piece = search_pieces(chunk, x, max(lo - base, 0), min(hi - base, len(chunk)))
+        return base + idx, piece
+
+    def __contains__(self, x):
+        """
+        x in self
+        Test scalar or interval x for membership in DiskSet.
+        """
+        if isinstance(x, Interval):
+            _, piece = self.search(x.a)
+            return piece is not None and isinstance(piece, Interval) and x.b <= piece.b
+        else:
+            return self.search(x)[1] is not None
+
+    def irange(self, lo, hi, bounds='[]'):
+        """
+        Generate pieces of the DiskSet that overlap with the interval
+        from lo to hi, trimmed to fit into it, see Set.irange().
+        Only chunks overlapping with the interval are read.
+        """
+        window = Interval(lo, hi, bounds)
+        first = bisect_left(self._ends, window.a)
+        last = bisect_right(self._starts, window.b)
+        for c in range(first, last):
+            s = Set()
+            s.pieces = list(self._load(c))
+            for piece in s.irange(lo, hi, bounds):
+                yield piece
+
+    def __eq__(self, other):
+        """
+        self == other
+        other can be either DiskSet or Set. Pieces are compared chunk by chunk.
+        """
+        if not isinstance(other, (DiskSet, Set)) or len(self) != len(_pieces(other)):
+            return False
+        return all(p == q for p, q in zip_longest(self, _pieces(other)))
+
+    def __ne__(self, other):
+        return not self == other
+
+    def _operation(self, others, predicate, directory):
+        for other in others:
+            if not isinstance(other, (DiskSet, Set)):
+                raise TypeError('DiskSet operand must be Set or DiskSet, not %s'
+                                % type(other).__name__)
+        operands = [self] + [_pieces(other) for other in others]
+        return DiskSet.from_sorted(directory, _sweep(operands, predicate))
+
+    def union(self, *others, **kwargs):
+        """
+        Return a new DiskSet with pieces from the DiskSet and all the others.
+        Optional keyword argument directory tells where to write it.
+        """
+        return self._operation(others, _union, kwargs.get('directory'))
+
+    def intersection(self, *others, **kwargs):
+        """
+        Return a new DiskSet with pieces common to the DiskSet and all the others.
+        Optional keyword argument directory tells where to write it.
+        """
+        return self._operation(others, _intersection, kwargs.get('directory'))
+
+    def difference(self, *others, **kwargs):
+        """
+        Return a new DiskSet with pieces in the DiskSet that are not in the others.
+        Optional keyword argument directory tells where to write it.
+        """
+        return self._operation(others, _difference, kwargs.get('directory'))
+
+    def symmetric_difference(self, *others, **kwargs):
+        """
+        Return a new DiskSet with pieces in odd number of the DiskSet and the others.
+        Optional keyword argument directory tells where to write it.
+        """
+        return self._operation(others, _symmetric_difference, kwargs.get('directory'))
+
+    def __or__(self, other):
+        return self._operation([other], _union, None)
+
+    def __and__(self, other):
+        return self._operation([other], _intersection, None)
+
+    def __sub__(self, other):
+        return self._operation([other], _difference, None)
+
+    def __xor__(self, other):
+        return self._operation([other], _symmetric_difference, None)
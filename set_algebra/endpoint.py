@@ -37,6 +37,9 @@ class Endpoint(object):
 
     PARSABLE_TYPES = (int, float, Infinity, NegativeInfinity)
 
+    # Python 2 datetime and date compare to other types only if they have it.
+    timetuple = None
+
     def __init__(self, notation_or_value, bound=None):
         if bound is None:
             value, open, left = parse_endpoint_notation(notation_or_value)
@@ -51,6 +54,18 @@ class Endpoint(object):
         self.open = open
         self.left = left
 
+    @classmethod
+    def _make(cls, value, open, left):
+        """
+        Create Endpoint from value and "open" and "left" booleans
+        skipping validation. For values known to be valid only.
+        """
+        self = object.__new__(cls)
+        self.value = value
+        self.open = open
+        self.left = left
+        return self
+
     @property
     def right(self):
         return not self.left
@@ -189,13 +204,20 @@ class Endpoint(object):
         >>> ~Endpoint('[1')
         Endpoint('1)')
         """
-        bound = OPEN_LEFT_TO_BOUNDS_MAPPING[not self.open, not self.left]
-        return Endpoint(self.value, bound)
+        return self._make(self.value, not self.open, not self.left)
 
     def copy(self):
         """Return a shallow copy of the Endpoint"""
-        bound = OPEN_LEFT_TO_BOUNDS_MAPPING[self.open, self.left]
-        return Endpoint(self.value, bound)
+        return self._make(self.value, self.open, self.left)
+
+    def __reduce__(self):
+        """Pickle Endpoint as its 3 slots, restored without validation."""
+        return _endpoint, (self.value, self.open, self.left)
+
+
+def _endpoint(value, open, left):
+    """Restore pickled Endpoint."""
+    return Endpoint._make(value, open, left)
 
 
 def are_bounding(e1, e2):
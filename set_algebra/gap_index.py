@@ -0,0 +1,275 @@
+import random
+
+from set_algebra.endpoint import Endpoint
+from set_algebra.infinity import inf, neg_inf
+from set_algebra.interval import Interval
+
+
+class _Node(object):
+    """
+    Node of implicit treap (randomized binary search tree keyed by position)
+    holding one gap. Every node knows the size of its subtree and the length
+    of the longest gap in it.
+    """
+    __slots__ = ('gap', 'length', 'longest', 'size', 'priority', 'left', 'right')
+
+    def __init__(self, gap):
+        self.gap = gap
+        self.length = self.longest = gap.b.value - gap.a.value
+        self.size = 1
+        self.priority = random.random()
+        self.left = self.right = None
+
+
+def _update(node):
+    size = 1
+    longest = node.length
+    for child in (node.left, node.right):
+        if child is not None:
+            size += child.size
+            if child.longest > longest:
+                longest = child.longest
+    node.size = size
+    node.longest = longest
+
+
+def _merge(left, right):
+    """Merge two treaps, all positions of left go before positions of right."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+
+def _split(node, k):
+    """Split treap into two: the first k nodes and the rest."""
+    if node is None:
+        return None, None
+    left_size = node.left.size if node.left is not None else 0
+    if k <= left_size:
+        left, node.left = _split(node.left, k)
+        _update(node)
+        return left, node
+    node.right, right = _split(node.right, k - left_size - 1)
+    _update(node)
+    return node, right
+
+
+def _key(node):
+    """Key of node in treap ordered by length: (length, start of the gap)."""
+    return node.length, node.gap.a.value
+
+
+def _split_key(node, key):
+    """Split treap ordered by length into two: nodes with keys less than key and the rest."""
+    if node is None:
+        return None, None
+    if _key(node) < key:
+        node.right, right = _split_key(node.right, key)
+        _update(node)
+        return node, right
+    left, node.left = _split_key(node.left, key)
+    _update(node)
+    return left, node
+
+
+def _insert_key(root, node):
+    """Insert node into treap ordered by length, return the new root."""
+    left, right = _split_key(root, _key(node))
+    return _merge(_merge(left, node), right)
+
+
+def _remove_key(root, key):
+    """Remove node with key from treap ordered by length, return the new root."""
+    left, rest = _split_key(root, key)
+    _, right = _split(rest, 1)
+    return _merge(left, right)
+
+
+def _lower_bound(node, key):
+    """Return node with the least key not less than key, or None."""
+    found = None
+    while node is not None:
+        if _key(node) < key:
+            node = node.right
+        else:
+            found = node
+            node = node.left
+    return found
+
+
+def _build(nodes):
+    """Build treap from list of nodes in O(n), keeping their order."""
+    stack = []
+    for node in nodes:
+        last = None
+        while stack and stack[-1].priority < node.priority:
+            last = stack.pop()
+            _update(last)
+        node.left = last
+        node.right = None
+        if stack:
+            stack[-1].right = node
+        stack.append(node)
+    root = stack[0] if stack else None
+    while stack:
+        _update(stack.pop())
+    return root
+
+
+def _iter_nodes(node):
+    if node is not None:
+        for n in _iter_nodes(node.left):
+            yield n
+        yield node
+        for n in _iter_nodes(node.right):
+            yield n
+
+
+def _first_fit(node, pos, length, offset=0):
+    """Return the first node at position pos or later with gap of at least length."""
+    if node is None or node.longest < length:
+        return None
+    idx = offset + (node.left.size if node.left is not None else 0)
+    if pos < idx:
+        found = _first_fit(node.left, pos, length, offset)
+        if found is not None:
+            return found
+    if pos <= idx and node.length >= length:
+        return node
+    return _first_fit(node.right, pos, length, idx + 1)
+
+
+def _gap(pre, nex):
+    """Return Interval between two consecutive pieces."""
+    a = ~pre.b if isinstance(pre, Interval) else Endpoint(pre, '(')
+    b = ~nex.a if isinstance(nex, Interval) else Endpoint(nex, ')')
+    return Interval(a, b)
+
+
+class GapIndex(object):
+    """
+    Index of gaps between pieces of a Set for free slot search,
+    e.g. when the Set contains busy intervals of a schedule.
+
+    Gaps are the pieces of the complement of the Set. Lengths of the gaps
+    between pieces are kept in an implicit treap augmented with the longest
+    length in every subtree, and in another treap ordered by length, so that
+        first_fit(start, length) and best_fit(length)
+    take O(log n) time instead of a linear scan over the complement.
+    Values of the Set must support subtraction, and the differences
+    must be comparable with the requested lengths, e.g. numbers,
+    or datetimes and timedeltas.
+
+    The index watches the Set as observer (see Set.add_observer())
+    and updates the treaps in O((k + 1) log n) time when k pieces
+    of the Set change. Call close() to detach it.
+
+    >>> busy = Set('[0, 10), [12, 20), [30, 40)')
+    >>> gaps = GapIndex(busy)
+    >>> gaps.first_fit(5, 5)
+    Interval('[20, 30)')
+    >>> gaps.best_fit(1)
+    Interval('[10, 12)')
+    """
+
+    def __init__(self, s):
+        self.set = s
+        pieces = s.pieces
+        nodes = [_Node(_gap(pieces[k-1], pieces[k])) for k in range(1, len(pieces))]
+        self._root = _build(nodes)
+        self._by_length = _build(sorted((_Node(n.gap) for n in nodes), key=_key))
+        s.add_observer(self._on_change)
+
+    def close(self):
+        """Stop watching the Set. The index must not be used after that."""
+        self.set.remove_observer(self._on_change)
+
+    def _on_change(self, s, start, stop, new_pieces):
+        # Gap number k (k >= 1) is located between pieces k-1 and k
+        # and kept at position k-1 in the treap.
+        # Gaps touching pieces[start:stop] are numbered from start to stop.
+        pieces = s.pieces
+        n_new = len(pieces)
+        n_old = n_new - len(new_pieces) + stop - start
+        k0 = max(start, 1)
+        old_count = max(0, min(stop, n_old - 1) - k0 + 1)
+        new_count = max(0, min(start + len(new_pieces), n_new - 1) - k0 + 1)
+
+        left, rest = _split(self._root, k0 - 1)
+        old, right = _split(rest, old_count)
+
+        by_length = self._by_length
+        for node in _iter_nodes(old):
+            by_length = _remove_key(by_length, _key(node))
+
+        nodes = [_Node(_gap(pieces[k-1], pieces[k])) for k in range(k0, k0 + new_count)]
+        for node in nodes:
+            by_length = _insert_key(by_length, _Node(node.gap))
+        self._by_length = by_length
+
+        self._root = _merge(_merge(left, _build(nodes)), right)
+
+    def _outer_gaps(self):
+        """Return list of infinite gaps: after the last and before the first piece."""
+        pieces = self.set.pieces
+        if not pieces:
+            return [Interval(Endpoint(neg_inf, '('), Endpoint(inf, ')'))]
+        gaps = []
+        last = pieces[-1]
+        if not isinstance(last, Interval):
+            gaps.append(Interval(Endpoint(last, '('), Endpoint(inf, ')')))
+        elif last.b.value != inf:
+            gaps.append(Interval(~last.b, Endpoint(inf, ')')))
+        first = pieces[0]
+        if not isinstance(first, Interval):
+            gaps.append(Interval(Endpoint(neg_inf, '('), Endpoint(first, ')')))
+        elif first.a.value != neg_inf:
+            gaps.append(Interval(Endpoint(neg_inf, '('), ~first.a))
+        return gaps
+
+    def first_fit(self, start, length):
+        """
+        Return the first free slot of at least given length starting at
+        or after start, as Interval, or None if there is no such slot.
+        If start is not in the Set, the slot can start at start.
+        """
+        pieces = self.set.pieces
+        idx, piece = self.set.search(start)
+        if piece is None:
+            # start is in the gap before pieces[idx].
+            if idx < len(pieces):
+                nex = pieces[idx]
+                b = ~nex.a if isinstance(nex, Interval) else Endpoint(nex, ')')
+            else:
+                b = Endpoint(inf, ')')
+            if b.value == inf or b.value - start >= length:
+                return Interval(Endpoint(start, '['), b)
+        # Gaps after piece idx start at position idx.
+        node = _first_fit(self._root, idx, length)
+        if node is not None:
+            return node.gap.copy()
+        last = pieces[-1]
+        if not isinstance(last, Interval) or last.b.value != inf:
+            return self._outer_gaps()[0]
+        return None
+
+    def best_fit(self, length):
+        """
+        Return the shortest gap between pieces of the Set that is at least
+        of given length, as Interval. Of equal gaps the leftmost is returned.
+        If there are none, return infinite gap after the last piece or before
+        the first one, or None if there is no gap at all.
+        """
+        node = _lower_bound(self._by_length, (length,))
+        if node is not None:
+            return node.gap.copy()
+        gaps = self._outer_gaps()
+        return gaps[0] if gaps else None
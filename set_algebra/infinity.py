@@ -1,11 +1,26 @@
-class Infinity:
+from datetime import date, datetime
+
+_FLOAT_INF = float('inf')
+_FLOAT_NEG_INF = float('-inf')
+
+# Types whose values are never infinite.
+try:
+    _FINITE_TYPES = (int, long, date, datetime)
+except NameError:
+    _FINITE_TYPES = (int, date, datetime)
+
+
+class Infinity(object):
     """
     Class representing infinity. Supports comparsion operations.
     Instances of Infinity are greater than everything except infinities.
     """
 
+    # Python 2 datetime and date compare to other types only if they have it.
+    timetuple = None
+
     def __eq__(self, other):
-        return isinstance(other, self.__class__) or other == float('inf')
+        return isinstance(other, self.__class__) or other == _FLOAT_INF
 
     def __ne__(self, other):
         return not self == other
@@ -28,15 +43,22 @@ class Infinity:
     def __repr__(self):
         return 'inf'
 
+    def __reduce__(self):
+        # Pickled as reference to the module level instance.
+        return 'inf'
 
-class NegativeInfinity:
+
+class NegativeInfinity(object):
     """
     Class representing negative infinity. Supports comparsion operations.
     Its instances are less than everything except negative infinities.
     """
 
+    # Python 2 datetime and date compare to other types only if they have it.
+    timetuple = None
+
     def __eq__(self, other):
-        return isinstance(other, self.__class__) or other == float('-inf')
+        return isinstance(other, self.__class__) or other == _FLOAT_NEG_INF
 
     def __ne__(self, other):
         return not self == other
@@ -59,8 +81,13 @@ class NegativeInfinity:
     def __repr__(self):
         return 'neg_inf'
 
+    def __reduce__(self):
+        return 'neg_inf'
+
 
 def is_finite(value):
+    if type(value) in _FINITE_TYPES:
+        return True
     return neg_inf != value != inf
 
 
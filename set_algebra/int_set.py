@@ -0,0 +1,462 @@
+import math
+import numbers
+from array import array
+from bisect import bisect_left, bisect_right
+
+from set_algebra.endpoint import Endpoint
+from set_algebra.infinity import inf, neg_inf
+from set_algebra.interval import Interval
+from set_algebra.parser import string_types
+from set_algebra.set_ import Set
+
+
+# Extreme values of 64-bit signed integer stand for -inf and inf.
+MIN = -2**63
+MAX = 2**63 - 1
+
+try:
+    array('q')
+except ValueError:
+    # 'q' typecode is available since Python 3.3, older ones keep runs in lists.
+    def _array(values=()):
+        return list(values)
+else:
+    def _array(values=()):
+        return array('q', values)
+
+
+def _integer(value):
+    """Return value as int, raise ValueError if it is not an integer in range."""
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError('%s is not an integer' % value)
+        value = int(value)
+    elif not isinstance(value, numbers.Integral):
+        raise TypeError('IntSet can only contain integers, not %s' % type(value).__name__)
+    if not MIN < value < MAX:
+        raise ValueError('%s is out of range of IntSet' % value)
+    return value
+
+
+def _lower(endpoint):
+    """Return the least integer greater or equal to left Endpoint."""
+    value = endpoint.value
+    if value == neg_inf:
+        return MIN
+    if isinstance(value, float) and not value.is_integer():
+        return _integer(float(math.ceil(value)))
+    value = _integer(value)
+    return value + 1 if endpoint.open else value
+
+
+def _upper(endpoint):
+    """Return the greatest integer less or equal to right Endpoint."""
+    value = endpoint.value
+    if value == inf:
+        return MAX
+    if isinstance(value, float) and not value.is_integer():
+        return _integer(float(math.floor(value)))
+    value = _integer(value)
+    return value - 1 if endpoint.open else value
+
+
+def _run(x):
+    """
+    Return tuple (start, end) of integers contained in scalar or Interval x,
+    or None if there are no integers in x.
+    """
+    if isinstance(x, Interval):
+        start = _lower(x.a)
+        end = _upper(x.b)
+        if start > end:
+            return None
+        return start, end
+    x = _integer(x)
+    return x, x
+
+
+def _union(a, b):
+    """Return union of two sorted lists of runs as two arrays: starts and ends."""
+    starts = _array()
+    ends = _array()
+    i = j = 0
+    a_starts, a_ends = a
+    b_starts, b_ends = b
+    na, nb = len(a_starts), len(b_starts)
+    while i < na or j < nb:
+        if j == nb or i < na and a_starts[i] <= b_starts[j]:
+            start, end = a_starts[i], a_ends[i]
+            i += 1
+        else:
+            start, end = b_starts[j], b_ends[j]
+            j += 1
+        if ends and start <= ends[-1] + 1:
+            if end > ends[-1]:
+                ends[-1] = end
+        else:
+            starts.append(start)
+            ends.append(end)
+    return starts, ends
+
+
+def _intersection(a, b):
+    """Return intersection of two sorted lists of runs as two arrays: starts and ends."""
+    starts = _array()
+    ends = _array()
+    i = j = 0
+    a_starts, a_ends = a
+    b_starts, b_ends = b
+    na, nb = len(a_starts), len(b_starts)
+    while i < na and j < nb:
+        start = max(a_starts[i], b_starts[j])
+        end = min(a_ends[i], b_ends[j])
+        if start <= end:
+            starts.append(start)
+            ends.append(end)
+        if a_ends[i] < b_ends[j]:
+            i += 1
+        else:
+            j += 1
+    return starts, ends
+
+
+def _complement(a):
+    """Return complement of sorted list of runs as two arrays: starts and ends."""
+    a_starts, a_ends = a
+    starts = _array()
+    ends = _array()
+    if not a_starts or a_starts[0] != MIN:
+        starts.append(MIN)
+    starts.extend(e + 1 for e in a_ends if e != MAX)
+    if a_starts and a_starts[0] != MIN:
+        ends.extend(s - 1 for s in a_starts)
+    else:
+        ends.extend(s - 1 for s in a_starts[1:])
+    if not a_ends or a_ends[-1] != MAX:
+        ends.append(MAX)
+    return starts, ends
+
+
+class IntSet(object):
+    """
+    Set of integers.
+
+    IntSet keeps runs of consecutive integers as two compact arrays of
+    64-bit integers: starts and ends of the runs, both included.
+    Discrete normalization applies: open bounds become closed ones,
+    e.g. (1, 5) becomes [2, 4], and adjacent integers are merged into runs,
+    so {1}, {2}, [3, 4] becomes [1, 4].
+    On Python older than 3.3, which lacks 64-bit arrays, runs are kept in lists.
+    Values must be integers between -2**63 and 2**63 - 1 exclusive,
+    the extreme values stand for -inf and inf.
+
+    IntSet can be instantiated from either:
+        - iterable of integers and/or intervals (non-integer bounds are allowed)
+        - notation string, same as for Set
+        - Set or IntSet
+        - nothing for empty IntSet
+
+    IntSet supports the same operators as Set, "in" test for scalars and
+    intervals, add() and remove(). pieces and notation are given
+    in the normalized form.
+
+    >>> s = IntSet([1, 2, Interval('(2, 5)')])
+    >>> s.notation
+    '[1, 4]'
+    >>> (~s).notation
+    '(-inf, 0], [5, inf)'
+    """
+    __slots__ = ('starts', 'ends')
+
+    def __init__(self, arg=None):
+        self.starts = _array()
+        self.ends = _array()
+        if arg is None:
+            return
+        if isinstance(arg, IntSet):
+            self.starts.extend(arg.starts)
+            self.ends.extend(arg.ends)
+            return
+        if isinstance(arg, string_types):
+            arg = Set(arg)
+        if isinstance(arg, Set):
+            arg = arg.pieces
+        runs = sorted(r for r in map(_run, arg) if r is not None)
+        starts, ends = self.starts, self.ends
+        for start, end in runs:
+            if ends and start <= ends[-1] + 1:
+                if end > ends[-1]:
+                    ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+
+    @classmethod
+    def _from_runs(cls, runs):
+        new = cls.__new__(cls)
+        new.starts, new.ends = runs
+        return new
+
+    def _runs(self):
+        return self.starts, self.ends
+
+    @property
+    def pieces(self):
+        """List of runs as scalars and closed intervals, like Set.pieces."""
+        pieces = []
+        make = Endpoint._make
+        for start, end in zip(self.starts, self.ends):
+            if start == end:
+                pieces.append(start)
+                continue
+            if start == MIN:
+                a = make(neg_inf, True, True)
+            else:
+                a = make(start, False, True)
+            if end == MAX:
+                b = make(inf, True, False)
+            else:
+                b = make(end, False, False)
+            pieces.append(Interval._make(a, b))
+        return pieces
+
+    @property
+    def notation(self):
+        return self.to_set().notation
+
+    def to_set(self):
+        """Return Set containing the same integers as runs of closed intervals."""
+        new = Set()
+        new.pieces = self.pieces
+        return new
+
+    def __repr__(self):
+        return '%s(%s)' % (type(self).__name__, self.pieces)
+
+    def __bool__(self):
+        return len(self.starts) > 0
+
+    def __nonzero__(self):
+        return len(self.starts) > 0
+
+    def __contains__(self, x):
+        """
+        x in self
+        Test integer or interval x for membership in IntSet.
+        Interval is in IntSet if all the integers in the Interval are.
+        """
+        try:
+            run = _run(x)
+        except ValueError:
+            return False
+        if run is None:
+            return True
+        i = bisect_right(self.starts, run[0]) - 1
+        return i >= 0 and run[1] <= self.ends[i]
+
+    def add(self, x):
+        """Add integer or interval x to IntSet."""
+        run = _run(x)
+        if run is None:
+            return
+        start, end = run
+        starts, ends = self.starts, self.ends
+        # Runs from i to j are intersecting or adjacent to x.
+        i = bisect_left(ends, start - 1)
+        j = bisect_right(starts, end + 1)
+        if i < j:
+            start = min(start, starts[i])
+            end = max(end, ends[j-1])
+        starts[i:j] = _array([start])
+        ends[i:j] = _array([end])
+
+    def remove(self, x):
+        """Remove integer or interval x from IntSet."""
+        run = _run(x)
+        if run is None:
+            return
+        start, end = run
+        starts, ends = self.starts, self.ends
+        # Runs from i to j are intersecting with x.
+        i = bisect_left(ends, start)
+        j = bisect_right(starts, end)
+        if i >= j:
+            return
+        new_starts = _array()
+        new_ends = _array()
+        if starts[i] < start:
+            new_starts.append(starts[i])
+            new_ends.append(start - 1)
+        if ends[j-1] > end:
+            new_starts.append(end + 1)
+            new_ends.append(ends[j-1])
+        starts[i:j] = new_starts
+        ends[i:j] = new_ends
+
+    def clear(self):
+        """Remove all integers from IntSet."""
+        del self.starts[:]
+        del self.ends[:]
+
+    def copy(self):
+        """Return a copy of IntSet."""
+        return IntSet(self)
+
+    @staticmethod
+    def _check_operand(other, op):
+        if not isinstance(other, IntSet):
+            emsg = "unsupported operand type for %s: %s and %s"
+            raise TypeError(emsg % (op, IntSet, type(other)))
+
+    def __eq__(self, other):
+        return isinstance(other, IntSet) \
+           and self.starts == other.starts and self.ends == other.ends
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __invert__(self):
+        """
+        ~self
+        Return a new IntSet of integers that are not in the IntSet.
+        """
+        return self._from_runs(_complement(self._runs()))
+
+    def __or__(self, other):
+        """
+        self | other
+        Return a new IntSet that is a union of the IntSet and the other.
+        """
+        self._check_operand(other, '|')
+        return self._from_runs(_union(self._runs(), other._runs()))
+
+    def __and__(self, other):
+        """
+        self & other
+        Return a new IntSet that is an intersection of the IntSet and the other.
+        """
+        self._check_operand(other, '&')
+        return self._from_runs(_intersection(self._runs(), other._runs()))
+
+    def __sub__(self, other):
+        """
+        self - other
+        Return a new IntSet with integers that are in the IntSet but not in the other.
+        """
+        self._check_operand(other, '-')
+        return self._from_runs(_intersection(self._runs(), _complement(other._runs())))
+
+    def __xor__(self, other):
+        """
+        self ^ other
+        Return a new IntSet with integers in either the IntSet or the other but not in both.
+        """
+        self._check_operand(other, '^')
+        return (self - other) | (other - self)
+
+    def _update_from(self, new):
+        self.starts = new.starts
+        self.ends = new.ends
+        return self
+
+    def __ior__(self, other):
+        """self |= other"""
+        return self._update_from(self | other)
+
+    def __iand__(self, other):
+        """self &= other"""
+        return self._update_from(self & other)
+
+    def __isub__(self, other):
+        """self -= other"""
+        return self._update_from(self - other)
+
+    def __ixor__(self, other):
+        """self ^= other"""
+        return self._update_from(self ^ other)
+
+    def __ge__(self, other):
+        """
+        self >= other
+        Test whether every integer in the other is in the IntSet.
+        """
+        self._check_operand(other, '>=')
+        return not other - self
+
+    def __le__(self, other):
+        """
+        self <= other
+        Test whether every integer in the IntSet is in the other.
+        """
+        self._check_operand(other, '<=')
+        return not self - other
+
+    def __gt__(self, other):
+        """
+        self > other
+        Test whether the IntSet is a proper superset of the other.
+        """
+        return self >= other and self != other
+
+    def __lt__(self, other):
+        """
+        self < other
+        Test whether the IntSet is a proper subset of the other.
+        """
+        return self <= other and self != other
+
+    def isdisjoint(self, other):
+        """Return True if the IntSet has no integers in common with the other."""
+        return not self & IntSet(other)
+
+    def issubset(self, other):
+        """Test whether every integer in the IntSet is in the other."""
+        return self <= IntSet(other)
+
+    def issuperset(self, other):
+        """Test whether every integer in the other is in the IntSet."""
+        return self >= IntSet(other)
+
+    def union(self, *others):
+        """Return a new IntSet that is a union of the IntSet and all the others."""
+        new = self
+        for other in others:
+            new = new | IntSet(other)
+        return new if new is not self else self.copy()
+
+    def update(self, *others):
+        """Update the IntSet, adding integers from all the others."""
+        self._update_from(self.union(*others))
+
+    def intersection(self, *others):
+        """Return a new IntSet that is an intersection of the IntSet and all the others."""
+        new = self
+        for other in others:
+            new = new & IntSet(other)
+        return new if new is not self else self.copy()
+
+    def intersection_update(self, *others):
+        """Update the IntSet, removing everything that is not in any of the others."""
+        self._update_from(self.intersection(*others))
+
+    def difference(self, *others):
+        """Return a new IntSet without integers that are in any of the others."""
+        new = self
+        for other in others:
+            new = new - IntSet(other)
+        return new if new is not self else self.copy()
+
+    def difference_update(self, *others):
+        """Update the IntSet, removing integers found in the others."""
+        self._update_from(self.difference(*others))
+
+    def symmetric_difference(self, *others):
+        """Return a new IntSet with integers in odd number of the IntSet and the others."""
+        new = self
+        for other in others:
+            new = new ^ IntSet(other)
+        return new if new is not self else self.copy()
+
+    def symmetric_difference_update(self, *others):
+        """Update the IntSet, keeping integers found in odd number of the IntSet and the others."""
+        self._update_from(self.symmetric_difference(*others))
@@ -1,5 +1,6 @@
 from set_algebra.endpoint import Endpoint
-from set_algebra.parser import OPEN_LEFT_TO_BOUNDS_MAPPING, string_types
+from set_algebra.parser import (OPEN_LEFT_TO_BOUNDS_MAPPING, parse_interval_notation,
+    string_types)
 
 
 class Interval(object):
@@ -73,12 +74,11 @@ class Interval(object):
             # Init from notation.
             if bounds is not None:
                 raise TypeError('bounds are only accepted with both "notation_or_a" and "b"')
-            notation = notation_or_a.strip()
-            a_str, b_str = notation.split(',')
-            if ',' in b_str:
-                raise ValueError('There should be one and only one comma in interval notation')
-            a = Endpoint(a_str)
-            b = Endpoint(b_str)
+            (value_a, open_a, left_a), (value_b, open_b, left_b) = \
+                parse_interval_notation(notation_or_a)
+            # Endpoints validate values only, notation is already parsed.
+            a = Endpoint(value_a, OPEN_LEFT_TO_BOUNDS_MAPPING[open_a, left_a])
+            b = Endpoint(value_b, OPEN_LEFT_TO_BOUNDS_MAPPING[open_b, left_b])
 
         else:
             if isinstance(notation_or_a, Endpoint) ^ isinstance(b, Endpoint):
@@ -117,6 +117,17 @@ class Interval(object):
         self.a = a
         self.b = b
 
+    @classmethod
+    def _make(cls, a, b):
+        """
+        Create Interval from two Endpoints skipping validation.
+        For endpoints known to make a valid Interval only.
+        """
+        self = object.__new__(cls)
+        self.a = a
+        self.b = b
+        return self
+
     @property
     def notation(self):
         return '%s, %s' % (self.a.notation, self.b.notation)
@@ -149,7 +160,17 @@ class Interval(object):
         Endpoints are recreated.
         copy is safe as long as endpoint values are of immutable types.
         """
-        return Interval(self.a.copy(), self.b.copy())
+        return self._make(self.a.copy(), self.b.copy())
+
+    def __reduce__(self):
+        """Pickle Interval as values of endpoints and their "open" flags."""
+        return _interval, (self.a.value, self.a.open, self.b.value, self.b.open)
+
+
+def _interval(value_a, open_a, value_b, open_b):
+    """Restore pickled Interval without validation."""
+    make = Endpoint._make
+    return Interval._make(make(value_a, open_a, True), make(value_b, open_b, False))
 
 
 def is_interval(obj):
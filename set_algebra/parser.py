@@ -1,3 +1,7 @@
+import re
+from collections import OrderedDict, namedtuple
+from datetime import date, datetime, timedelta
+
 from set_algebra.infinity import inf, neg_inf
 
 
@@ -6,20 +10,33 @@ try:
 except NameError:
     string_types = str
 
+try:
+    from datetime import timezone
+except ImportError:
+    timezone = None
+
 
 def parse_value(value_str):
     """
-    Parse numeric string, return either:
+    Parse numeric or ISO-8601 string, return either:
     int
     float
     Infinity, NegativeInfinity
+    date for 'YYYY-MM-DD'
+    datetime for 'YYYY-MM-DDTHH:MM:SS' and the like, see parse_datetime()
     """
     if not isinstance(value_str, string_types):
         raise TypeError('value_str must be a string, not %s' % type(value_str).__name__)
 
-    value_str = value_str.strip()
+    return _parse_value(value_str.strip())
+
+
+def _parse_value(value_str):
+    """Parse stripped string value_str, see parse_value()."""
     if value_str.isdigit() or (value_str[0] == '-' and value_str[1:].isdigit()):
         value = int(value_str)
+    elif value_str[4:5] == '-' and value_str[:4].isdigit():
+        value = parse_datetime(value_str)
     elif value_str in ('-inf', 'neg_inf'):
         value = neg_inf
     elif value_str == 'inf':
@@ -30,6 +47,63 @@ def parse_value(value_str):
     return value
 
 
+# ISO-8601 date, optionally followed by time and UTC offset.
+ISO_DATETIME = re.compile(
+    r'(\d{4})-(\d\d)-(\d\d)'
+    r'(?:[T ](\d\d)(?::(\d\d)(?::(\d\d)(?:\.(\d{1,6}))?)?)?(Z|[+-]\d\d:\d\d)?)?$')
+
+# C implementations of ISO-8601 parsing, since Python 3.7.
+_date_fromisoformat = getattr(date, 'fromisoformat', None)
+_datetime_fromisoformat = getattr(datetime, 'fromisoformat', None)
+
+
+def parse_datetime(value_str):
+    """
+    Parse ISO-8601 string value_str without surrounding whitespace,
+    return date for 'YYYY-MM-DD', otherwise datetime for
+    'YYYY-MM-DDTHH[:MM[:SS[.ffffff]]]' optionally followed by
+    'Z' or '+HH:MM' UTC offset. Date and time can be separated by 'T'
+    or space, so str() and isoformat() of date and datetime are parsed.
+    Raises ValueError for invalid string.
+
+    Fixed-format strings go to date.fromisoformat() and
+    datetime.fromisoformat() where available, which are as fast as float().
+
+    >>> parse_datetime('2020-01-31')
+    datetime.date(2020, 1, 31)
+    >>> parse_datetime('2020-01-31T12:30')
+    datetime.datetime(2020, 1, 31, 12, 30)
+    """
+    if _datetime_fromisoformat is not None:
+        try:
+            if len(value_str) == 10:
+                return _date_fromisoformat(value_str)
+            return _datetime_fromisoformat(value_str)
+        except ValueError:
+            pass
+
+    m = ISO_DATETIME.match(value_str)
+    if m is None:
+        raise ValueError('Invalid ISO-8601 date or datetime: %r' % value_str)
+    year, month, day, hour, minute, second, fraction, offset = m.groups()
+    if hour is None:
+        return date(int(year), int(month), int(day))
+    microsecond = int(fraction.ljust(6, '0')) if fraction else 0
+    tzinfo = None if offset is None else _parse_utc_offset(offset)
+    return datetime(int(year), int(month), int(day), int(hour), int(minute or 0),
+                    int(second or 0), microsecond, tzinfo)
+
+
+def _parse_utc_offset(offset):
+    """Return tzinfo for 'Z' or '+HH:MM' UTC offset."""
+    if timezone is None:
+        raise ValueError('UTC offset %s requires datetime.timezone, Python 3.2+' % offset)
+    if offset == 'Z':
+        return timezone.utc
+    delta = timedelta(hours=int(offset[1:3]), minutes=int(offset[4:6]))
+    return timezone(-delta if offset[0] == '-' else delta)
+
+
 BOUNDS_TO_OPEN_LEFT_MAPPING = {
     '[': (False, True),
     '(': (True, True),
@@ -58,10 +132,11 @@ def parse_endpoint_notation(notation):
     Parse string representing Endpoint (endpoint notation).
 
     Returns tuple of 3 elements:
-        0: int or float instance, or inf or neg_inf
+        0: value returned by parse_value()
         1: bool indicating whether endpoint is open
         2: bool indicating whether endpoint is left
     Raises ValueError for invalid notation.
+    Results are cached if parse cache is enabled, see enable_parse_cache().
 
     >>> parse_endpoint_notation('[5.7')
     (5.7, False, True)
@@ -73,6 +148,12 @@ def parse_endpoint_notation(notation):
     if not isinstance(notation, string_types):
         raise TypeError('notation must be a string, not %s' % type(notation).__name__)
 
+    if _endpoint_cache is not None:
+        return _endpoint_cache(notation)
+    return _parse_endpoint_notation(notation)
+
+
+def _parse_endpoint_notation(notation):
     notation = notation.strip()
 
     if len(notation) < 2:
@@ -89,3 +170,208 @@ def parse_endpoint_notation(notation):
     value = parse_value(value_str)
 
     return value, open, left
+
+
+def parse_interval_notation(notation):
+    """
+    Parse string representing Interval (interval notation).
+    Returns tuple of 2 tuples returned by parse_endpoint_notation()
+    for its endpoints. Raises ValueError for invalid notation.
+    Results are cached if parse cache is enabled, see enable_parse_cache().
+
+    >>> parse_interval_notation('[0, inf)')
+    ((0, False, True), (inf, True, False))
+    """
+    if not isinstance(notation, string_types):
+        raise TypeError('notation must be a string, not %s' % type(notation).__name__)
+
+    if _interval_cache is not None:
+        return _interval_cache(notation)
+    return _parse_interval_notation(notation)
+
+
+def _parse_interval_notation(notation):
+    parts = notation.split(',')
+    if len(parts) != 2:
+        raise ValueError('There should be one and only one comma in interval notation')
+    return _parse_endpoint_notation(parts[0]), _parse_endpoint_notation(parts[1])
+
+
+ParseCacheInfo = namedtuple('ParseCacheInfo', 'hits misses maxsize currsize')
+
+
+class _ParseCache(object):
+    """Bounded LRU cache of results of function parse, see enable_parse_cache()."""
+    __slots__ = ('parse', 'maxsize', 'data', 'hits', 'misses')
+
+    def __init__(self, parse, maxsize):
+        self.parse = parse
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, notation):
+        data = self.data
+        try:
+            result = data.pop(notation)
+        except KeyError:
+            self.misses += 1
+            result = self.parse(notation)
+        else:
+            self.hits += 1
+        # Most recently used are the last ones.
+        data[notation] = result
+        if len(data) > self.maxsize:
+            data.popitem(last=False)
+        return result
+
+
+# Caches of parse_endpoint_notation() and parse_interval_notation(),
+# None while disabled.
+_endpoint_cache = None
+_interval_cache = None
+
+
+def enable_parse_cache(maxsize=1024):
+    """
+    Cache results of parsing up to maxsize distinct endpoint notations
+    and maxsize distinct interval notations, dropping the least recently
+    used ones. Speeds up Endpoint(notation) and Interval(notation)
+    for notation strings repeated over and over, e.g. from configs.
+    Parsed values are immutable, so they are shared by all the Endpoints
+    made from the same notation. Counters are reset.
+    """
+    global _endpoint_cache, _interval_cache
+    if maxsize < 1:
+        raise ValueError('maxsize must be positive')
+    _endpoint_cache = _ParseCache(_parse_endpoint_notation, maxsize)
+    _interval_cache = _ParseCache(_parse_interval_notation, maxsize)
+
+
+def disable_parse_cache():
+    """Disable and drop cache enabled with enable_parse_cache()."""
+    global _endpoint_cache, _interval_cache
+    _endpoint_cache = None
+    _interval_cache = None
+
+
+def parse_cache_info():
+    """
+    Return named tuple (hits, misses, maxsize, currsize) of parse cache,
+    all zeros if disabled. maxsize is the one passed to enable_parse_cache(),
+    the limit for endpoint and for interval notations each. hits, misses
+    and currsize count both of them.
+    """
+    if _endpoint_cache is None:
+        return ParseCacheInfo(0, 0, 0, 0)
+    caches = (_endpoint_cache, _interval_cache)
+    return ParseCacheInfo(sum(c.hits for c in caches),
+                          sum(c.misses for c in caches),
+                          _endpoint_cache.maxsize,
+                          sum(len(c.data) for c in caches))
+
+
+# Number of characters read_set_notation() reads at a time.
+BLOCK_SIZE = 65536
+# Longest piece read_set_notation() looks for, in characters.
+MAX_PIECE_LENGTH = 4096
+
+# Value in Set notation - anything but delimiters, stripped of whitespace.
+_VALUE = r'([^\s,\[\](){}](?:[^,\[\](){}]*[^\s,\[\](){}])?)'
+
+# One piece of Set notation with a comma after it, if any:
+# interval from group 1 to group 4 or scalar in group 5.
+SET_NOTATION_PIECE = re.compile(
+    r'\s*(?:([\[(])\s*%s\s*,\s*%s\s*([\])])|\{\s*%s\s*\})\s*(,)?' % (_VALUE, _VALUE, _VALUE))
+
+
+def _token(m, offset):
+    """Return tuple for piece matched by SET_NOTATION_PIECE, see scan_set_notation()."""
+    bound_a, value_a, value_b, bound_b, scalar, _ = m.groups()
+    start = m.start(1) if bound_a else m.string.index('{', m.start())
+    try:
+        if scalar is None:
+            return (offset + start, _parse_value(value_a), bound_a == '(',
+                    _parse_value(value_b), bound_b == ')')
+        return offset + start, _parse_value(scalar)
+    except ValueError:
+        raise ValueError('Invalid value at position %d: %r' % (offset + start, m.string[start:m.end()]))
+
+
+def _invalid_notation(notation, pos, offset=0):
+    """
+    Return ValueError telling where invalid part of notation starts after pos.
+    offset is the position of notation string in the whole notation.
+    """
+    rest = notation[pos:]
+    pos += len(rest) - len(rest.lstrip())
+    return ValueError('Invalid notation at position %d: %r' % (offset + pos, notation[pos:pos+20]))
+
+
+def scan_set_notation(notation):
+    """
+    Scan Set notation string in a single pass. For every piece yield tuple
+        (position, value) for scalar {value}
+        (position, value_a, open_a, value_b, open_b) for interval
+    where position is the index of the piece in the notation string.
+    Raises ValueError telling the position of invalid notation.
+
+    >>> list(scan_set_notation('[1, 2), {5}'))
+    [(0, 1, False, 2, True), (8, 5)]
+    """
+    match = SET_NOTATION_PIECE.match
+    pos = 0
+    while True:
+        m = match(notation, pos)
+        if m is None:
+            raise _invalid_notation(notation, pos)
+        yield _token(m, 0)
+        pos = m.end()
+        if m.group(6) is None:
+            break
+    if pos != len(notation):
+        raise _invalid_notation(notation, pos)
+
+
+def read_set_notation(fp, block_size=BLOCK_SIZE):
+    """
+    Scan Set notation read from text file-like object fp, same as
+    scan_set_notation(), reading it by blocks of block_size characters.
+    Only the part of notation that has not been scanned yet is kept,
+    and a piece is looked for in at most MAX_PIECE_LENGTH characters,
+    so memory stays bounded whatever is in fp. A piece longer than
+    MAX_PIECE_LENGTH characters, counting whitespace before it and
+    the comma after it, raises ValueError telling its position,
+    whatever the block_size. Empty or blank file has no pieces.
+    """
+    match = SET_NOTATION_PIECE.match
+    buf = ''
+    # Position of buf in the whole notation.
+    offset = 0
+    pos = 0
+    eof = False
+    while True:
+        m = match(buf, pos)
+        # Piece at the end of buf can be followed by a comma in the next block.
+        if m is None or m.group(6) is None and m.end() == len(buf) and not eof:
+            if eof:
+                if offset + pos == 0 and not buf.strip():
+                    return
+                raise _invalid_notation(buf, pos, offset)
+            if m is None and len(buf) - pos > MAX_PIECE_LENGTH:
+                raise _invalid_notation(buf, pos, offset)
+            block = fp.read(block_size)
+            eof = not block
+            offset += pos
+            buf = buf[pos:] + block
+            pos = 0
+            continue
+        if m.end() - pos > MAX_PIECE_LENGTH:
+            raise _invalid_notation(buf, pos, offset)
+        yield _token(m, offset)
+        pos = m.end()
+        if m.group(6) is None:
+            break
+    if pos != len(buf) or fp.read(1):
+        raise _invalid_notation(buf, pos, offset)
@@ -0,0 +1,320 @@
+from bisect import bisect_left, bisect_right
+
+from set_algebra.endpoint import Endpoint
+from set_algebra.interval import Interval, is_interval
+from set_algebra.set_ import Set, search_pieces
+
+
+# Maximum number of pieces in a chunk of PersistentSet.
+CHUNK_SIZE = 64
+
+
+def _split(pieces, size=CHUNK_SIZE):
+    """Split list of pieces into a tuple of chunks of about equal length."""
+    n = len(pieces)
+    count = (n + size - 1) // size
+    return tuple(tuple(pieces[i*n//count:(i+1)*n//count]) for i in range(count))
+
+
+def _replace_chunks(chunks, c1, c2, pieces):
+    """
+    Return tuple of chunks with chunks[c1:c2] replaced by chunks of pieces.
+    Less than half a chunk of pieces is joined with the smaller neighbour
+    chunk, so that chunks do not get smaller and smaller after removals.
+    """
+    if 0 < len(pieces) < CHUNK_SIZE // 2:
+        if c2 < len(chunks) and (c1 == 0 or len(chunks[c2]) <= len(chunks[c1-1])):
+            pieces = list(pieces) + list(chunks[c2])
+            c2 += 1
+        elif c1 > 0:
+            pieces = list(chunks[c1-1]) + list(pieces)
+            c1 -= 1
+    return chunks[:c1] + _split(pieces) + chunks[c2:]
+
+
+def _append_pieces(chunks, pieces):
+    """
+    Append chunks of pieces to list of chunks, see _replace_chunks().
+    Pieces must follow all the pieces in chunks.
+    """
+    if 0 < len(pieces) < CHUNK_SIZE // 2 and chunks:
+        pieces = list(chunks.pop()) + pieces
+    chunks.extend(_split(pieces))
+
+
+def _bounds(x):
+    """Return the lowest and the highest bounds of scalar or interval x."""
+    if isinstance(x, Interval):
+        return x.a, x.b
+    return x, x
+
+
+class PersistentSet(object):
+    """
+    Immutable Set with structural sharing between versions.
+
+    add(), remove() and operators return a new PersistentSet, leaving the
+    original one untouched. Pieces are kept in chunks - tuples of at most
+    CHUNK_SIZE pieces. A new version rebuilds only the chunks affected by the
+    change and shares all the others with the previous version.
+    The tuple of references to chunks is copied in every version,
+    so a version costs O(n / CHUNK_SIZE + size of change) time and memory
+    instead of O(n) for a full copy. Operators with the other Set rebuild
+    the chunks between its first and last pieces in one pass, except for
+    "&" which drops the chunks outside of the other, shares the chunks lying
+    wholly inside a piece of the other and rebuilds only the rest.
+    Rebuilt chunks of less than CHUNK_SIZE / 2 pieces are joined with
+    a neighbour chunk, so removals do not leave lots of tiny chunks.
+
+    PersistentSet can be instantiated from the same arguments as Set,
+    or from another PersistentSet. Versions are queryable with the same
+    search() and "in" API as Set.
+
+    Pieces are shared between versions and must never be mutated.
+
+    >>> v1 = PersistentSet('[1, 5]')
+    >>> v2 = v1.add(Interval('[10, 20]'))
+    >>> v1.notation
+    '[1, 5]'
+    >>> v2.notation
+    '[1, 5], [10, 20]'
+    """
+    __slots__ = ('_chunks', '_offsets', '_size')
+
+    def __init__(self, arg=None):
+        if isinstance(arg, PersistentSet):
+            chunks = arg._chunks
+        else:
+            # Set validates arg and copies its pieces.
+            chunks = _split(Set(arg).pieces)
+        self._set_chunks(chunks)
+
+    @classmethod
+    def _from_chunks(cls, chunks):
+        new = cls.__new__(cls)
+        new._set_chunks(chunks)
+        return new
+
+    def _set_chunks(self, chunks):
+        offsets = []
+        size = 0
+        for chunk in chunks:
+            offsets.append(size)
+            size += len(chunk)
+        self._chunks = chunks
+        self._offsets = tuple(offsets)
+        self._size = size
+
+    def __repr__(self):
+        return '%s(%s)' % (type(self).__name__, self.pieces)
+
+    @property
+    def pieces(self):
+        """List of copies of all the pieces."""
+        return [p.copy() if is_interval(p) else p
+                for chunk in self._chunks for p in chunk]
+
+    @property
+    def notation(self):
+        chunks = []
+        for chunk in self._chunks:
+            for p in chunk:
+                if isinstance(p, Interval):
+                    chunks.append(p.notation)
+                else:
+                    chunks.append('{%s}' % p)
+        return ', '.join(chunks)
+
+    def to_set(self):
+        """Return a mutable Set equal to the PersistentSet."""
+        new = Set()
+        new.pieces = self.pieces
+        return new
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __nonzero__(self):
+        return self._size > 0
+
+    def _find_chunk(self, x, lo, hi):
+        """Return index of the first chunk in [lo, hi) that does not end before x."""
+        chunks = self._chunks
+        while lo < hi:
+            mid = (lo+hi) // 2
+            last = chunks[mid][-1]
+            end = last.b if isinstance(last, Interval) else last
+            if end < x:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def search(self, x, lo=0, hi=None):
+        """
+        Search scalar x in PersistentSet, same as Set.search().
+        Return tuple of two elements:
+            the index where to insert x in list of pieces.
+            piece that contains x or equals to x, or None if none found.
+        """
+        if lo < 0:
+            raise ValueError('lo must be non-negative')
+        if hi is None or hi > self._size:
+            hi = self._size
+        if lo >= hi:
+            return lo, None
+        offsets = self._offsets
+        c_lo = bisect_right(offsets, lo) - 1
+        c_hi = bisect_left(offsets, hi)
+        c = self._find_chunk(x, c_lo, c_hi)
+        if c == c_hi:
+            return hi, None
+        chunk = self._chunks[c]
+        base = offsets[c]
+        idx, piece = search_pieces(chunk, x, max(lo-base, 0), min(hi-base, len(chunk)))
+        return base + idx, piece
+
+    def __contains__(self, x):
+        """
+        x in self
+        Test scalar or interval x for membership in PersistentSet.
+        """
+        if isinstance(x, Interval):
+            _, piece = self.search(x.a)
+            return piece is not None and is_interval(piece) and x.b <= piece.b
+        else:
+            return self.search(x)[1] is not None
+
+    def __eq__(self, other):
+        """
+        self == other
+        other can be either PersistentSet or Set.
+        """
+        if isinstance(other, PersistentSet):
+            return self._chunks is other._chunks or self.pieces == other.pieces
+        return isinstance(other, Set) and self.pieces == other.pieces
+
+    def __ne__(self, other):
+        return not self == other
+
+    def _change(self, lower, upper, fn):
+        """
+        Return a new version with function fn applied to a temporary Set
+        of the pieces between lower and upper.
+        Only the chunks within these bounds are copied and rebuilt.
+        """
+        chunks = self._chunks
+        n = len(chunks)
+        # Neighbour chunks are included since their pieces can be bounding.
+        c1 = max(self._find_chunk(lower, 0, n) - 1, 0)
+        c2 = min(self._find_chunk(upper, c1, n) + 1, n)
+        temp = Set()
+        temp.pieces = [p.copy() if is_interval(p) else p
+                       for chunk in chunks[c1:c2] for p in chunk]
+        fn(temp)
+        return self._from_chunks(_replace_chunks(chunks, c1, c2, temp.pieces))
+
+    def add(self, x):
+        """Return a new version with scalar or interval x added."""
+        lower, upper = _bounds(x)
+        return self._change(lower, upper, lambda s: s.add(x))
+
+    def remove(self, x):
+        """Return a new version with scalar or interval x removed."""
+        lower, upper = _bounds(x)
+        return self._change(lower, upper, lambda s: s.remove(x))
+
+    def _apply(self, other, op):
+        """
+        Return a new version with in-place Set operator op applied with other
+        in one pass. Only the chunks between the first and the last piece
+        of the other are rebuilt.
+        """
+        if isinstance(other, PersistentSet):
+            other = other.to_set()
+        pieces = other.pieces
+        if not pieces:
+            return self
+        lower = _bounds(pieces[0])[0]
+        upper = _bounds(pieces[-1])[1]
+        return self._change(lower, upper, lambda s: op(s, other))
+
+    @staticmethod
+    def _check_operand(other, op):
+        if not isinstance(other, (Set, PersistentSet)):
+            emsg = "unsupported operand type for %s: %s and %s"
+            raise TypeError(emsg % (op, PersistentSet, type(other)))
+
+    def __or__(self, other):
+        """
+        self | other
+        Return a new version that is a union of the PersistentSet and the other.
+        """
+        self._check_operand(other, '|')
+        return self._apply(other, Set.__ior__)
+
+    def __sub__(self, other):
+        """
+        self - other
+        Return a new version without anything that is in the other.
+        """
+        self._check_operand(other, '-')
+        return self._apply(other, Set.__isub__)
+
+    def __and__(self, other):
+        """
+        self & other
+        Return a new version without anything that is not in the other.
+        """
+        self._check_operand(other, '&')
+        if isinstance(other, PersistentSet):
+            other = other.to_set()
+        chunks = []
+        # Pieces of the rebuilt chunks between the reused ones.
+        pending = []
+        for chunk in self._chunks:
+            first = chunk[0]
+            last = chunk[-1]
+            if len(chunk) == 1 and not isinstance(first, Interval):
+                if first in other:
+                    pending.append(first)
+                continue
+            a = first.a if isinstance(first, Interval) else Endpoint(first, '[')
+            b = last.b if isinstance(last, Interval) else Endpoint(last, ']')
+            hull = Interval._make(a, b)
+            bounds = ('(' if a.open else '[') + (')' if b.open else ']')
+            # Pieces of the other between the first and the last pieces of the chunk.
+            clipped = list(other.irange(a.value, b.value, bounds))
+            if not clipped:
+                continue
+            if clipped == [hull]:
+                # The chunk lies wholly inside a piece of the other.
+                _append_pieces(chunks, pending)
+                pending = []
+                chunks.append(chunk)
+                continue
+            temp = Set()
+            temp.pieces = [p.copy() if is_interval(p) else p for p in chunk]
+            window = Set()
+            window.pieces = clipped
+            temp &= window
+            pending.extend(temp.pieces)
+        _append_pieces(chunks, pending)
+        return self._from_chunks(tuple(chunks))
+
+    def __xor__(self, other):
+        """
+        self ^ other
+        Return a new version with pieces in either the PersistentSet
+        or the other but not in both.
+        """
+        self._check_operand(other, '^')
+        return self._apply(other, Set.__ixor__)
+
+    def __invert__(self):
+        """
+        ~self
+        Return a new PersistentSet that is a complement of the PersistentSet.
+        Nothing can be shared with the original, so it is built from scratch.
+        """
+        return PersistentSet(~self.to_set())
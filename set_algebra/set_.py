@@ -1,9 +1,19 @@
 import functools
+import heapq
+import random
+from bisect import bisect_left, bisect_right
 
+from set_algebra import binary
 from set_algebra.infinity import is_finite, inf, neg_inf
 from set_algebra.endpoint import Endpoint, are_bounding
 from set_algebra.interval import Interval, is_interval, unbounded
-from set_algebra.parser import parse_value, parse_endpoint_notation, string_types
+from set_algebra.parser import BLOCK_SIZE, read_set_notation, scan_set_notation, string_types
+
+
+# Set.compile() inlines comparisons for up to this number of pieces.
+COMPILE_INLINE_MAX = 8
+# Set.write_notation() formats this number of pieces at a time.
+NOTATION_BATCH = 1024
 
 
 def _assert_pieces_are_ascending(fn):
@@ -50,10 +60,89 @@ def _assert_pieces_are_ascending(fn):
     return wrapper
 
 
+def search_pieces(pieces, x, lo=0, hi=None):
+    """
+    Binary search scalar x in sorted sequence of pieces, see Set.search().
+    """
+    if lo < 0:
+        raise ValueError('lo must be non-negative')
+    if hi is None:
+        hi = len(pieces)
+    while lo < hi:
+        mid = (lo+hi) // 2
+        piece = pieces[mid]
+        if isinstance(piece, Interval):
+            start, end = piece.a, piece.b
+        else:
+            start, end = piece, piece
+        if end < x:
+            lo = mid + 1
+        elif start > x:
+            hi = mid
+        else:
+            return mid, piece
+
+    return lo, None
+
+
+def _gap_length(pre, nex):
+    """Return distance between two consecutive pieces."""
+    end = pre.b.value if isinstance(pre, Interval) else pre
+    start = nex.a.value if isinstance(nex, Interval) else nex
+    return start - end
+
+
+def _zero_length(pieces):
+    """
+    Return zero length for values of pieces, e.g. timedelta(0) for datetimes:
+    difference of the first finite value and itself. Return 0 if there are
+    no finite values or they do not support subtraction.
+    """
+    for p in pieces:
+        for value in ((p.a.value, p.b.value) if isinstance(p, Interval) else (p,)):
+            if is_finite(value):
+                try:
+                    return value - value
+                except TypeError:
+                    return 0
+    return 0
+
+
+def _piece_notation(piece):
+    """Return notation of scalar or Interval piece."""
+    if isinstance(piece, Interval):
+        return piece.notation
+    return '{%s}' % piece
+
+
 def _copy_pieces(pieces):
     return [p.copy() if is_interval(p) else p for p in pieces]
 
 
+def _restore_set(cls, values, flags, max_gap):
+    """
+    Restore pickled Set from flat list of values and bytes of flags
+    of its pieces, see Set.__reduce__(). Pieces are made without validation.
+    """
+    make = Endpoint._make
+    pieces = []
+    i = 0
+    for f in bytearray(flags):
+        if f & binary.SCALAR:
+            pieces.append(values[i])
+            i += 1
+        else:
+            a = make(values[i], f & binary.A_OPEN == binary.A_OPEN, True)
+            b = make(values[i+1], f & binary.B_OPEN == binary.B_OPEN, False)
+            pieces.append(Interval._make(a, b))
+            i += 2
+    new = object.__new__(cls)
+    new.pieces = pieces
+    if max_gap is not None:
+        new.max_gap = max_gap
+    return new
+
+
 class Set(object):
     """
     Uncountable Infinite Set
@@ -75,80 +164,156 @@ class Set(object):
     In contrast, their operator based counterparts require their arguments to be Sets.
 
     In boolean context Set is True if it is not empty and False if it is empty.
-    """
 
-    def __init_from_notation(self, notation):
+    Changes of pieces can be watched with add_observer().
 
-        a = None
-        for part in notation.split(','):
-            part = part.strip()
+    Optional max_gap argument sets auto-coalescing policy: whenever a piece
+    is added, it is merged with neighbours separated from it by gaps not
+    longer than max_gap, see coalesce(). max_gap=0 closes single point gaps
+    only. max_gap attribute can be changed later, None disables the policy.
+    """
 
-            if part.startswith('{') and part.endswith('}'):
-                scalar = parse_value(part[1:-1])
-                if not is_finite(scalar):
-                    raise ValueError('scalar %s must be finite' % scalar)
-                if self.pieces:
-                    pre = self.pieces[-1]
-                    if isinstance(pre, Interval):
-                        pre = pre.b.value
-                    if pre >= scalar:
-                        raise ValueError('%s >= %s!' % (pre, scalar))
-                self.pieces.append(scalar)
+    # List of callables notified about changes of pieces, see add_observer().
+    _observers = None
+    # Auto-coalescing policy, see coalesce().
+    max_gap = None
+    # Prefix sums of lengths of pieces, see _prefix_measure().
+    _prefix = None
+    # NumPy arrays of prefix sums and starts of pieces, see sample().
+    _prefix_arrays = None
+    # One-item list telling whether functions made by compile() are valid.
+    _compiled = None
+
+    def _init_from_tokens(self, tokens):
+        """
+        Fill empty Set with pieces from tokens of notation scanned by
+        parser.scan_set_notation() or parser.read_set_notation().
+        Values go straight into Endpoints, order of pieces is checked
+        comparing values only.
+        """
+        make = Endpoint._make
+        pieces = self.pieces
+        # Value of the end of the last piece and whether it is open.
+        last = None
+        last_open = False
+        for token in tokens:
+            if len(token) == 2:
+                pos, scalar = token
+                if type(scalar) is not int and not is_finite(scalar):
+                    raise ValueError('scalar %s must be finite at position %d' % (scalar, pos))
+                if pieces and last >= scalar:
+                    raise ValueError('%s >= %s at position %d!' % (last, scalar, pos))
+                pieces.append(scalar)
+                last = scalar
+                last_open = False
 
             else:
-                endpoint = Endpoint(part)
-                if a is None:
-                    a = endpoint
-                else:
-                    interval = Interval(a, endpoint)
-                    if self.pieces:
-                        pre = self.pieces[-1]
-                        if isinstance(pre, Interval):
-                            if pre.b > interval.a:
-                                raise ValueError('%s > %s!' % (pre.b, interval.a))
-                            if are_bounding(pre.b, interval.a):
-                                raise ValueError('%s and %s have no gap!' % (pre.b, interval.a))
-                        else:
-                            if pre >= interval.a.value:
-                                raise ValueError('%s >= %s!' % (pre, interval.a))
-                    self.pieces.append(interval)
-                    a = None
-
-        if a is not None:
-            raise ValueError('Invalid notation')
+                pos, value_a, open_a, value_b, open_b = token
+                if not open_a and type(value_a) is not int and not is_finite(value_a) \
+                        or not open_b and type(value_b) is not int and not is_finite(value_b):
+                    raise ValueError('Not open value cannot be infinite at position %d' % pos)
+                if value_a > value_b or value_a == value_b and (open_a or open_b):
+                    raise ValueError('First endpoint must be less than the second one at position %d' % pos)
+                if pieces and (last > value_a or last == value_a and not (last_open and open_a)):
+                    raise ValueError('%s and %s overlap or have no gap at position %d!'
+                                     % (last, value_a, pos))
+                pieces.append(Interval._make(make(value_a, open_a, True), make(value_b, open_b, False)))
+                last = value_b
+                last_open = open_b
 
     @_assert_pieces_are_ascending
-    def __init__(self, arg=None):
+    def __init__(self, arg=None, max_gap=None):
         # TODO: init from interval?
+        if max_gap is not None:
+            self.max_gap = max_gap
         if isinstance(arg, Set):
             # Init from Set
             # TODO: "arg" is unclear signature
             self.pieces = _copy_pieces(arg.pieces)
-            return
-        self.pieces = []
-        if arg is None:
-            # Init empty Set from None
-            return
-        elif isinstance(arg, string_types):
-            # Init from notation string
-            self.__init_from_notation(arg)
         else:
-            # Init from iterable of intervals and/or scalars.
-            for p in arg:
-                self.add(p)
+            self.pieces = []
+            if arg is None:
+                # Init empty Set from None
+                return
+            elif isinstance(arg, string_types):
+                # Init from notation string
+                self._init_from_tokens(scan_set_notation(arg))
+            else:
+                # Init from iterable of intervals and/or scalars.
+                for p in arg:
+                    self.add(p)
+                return
+        if max_gap is not None:
+            self.pieces = self.coalesce(max_gap).pieces
 
     def __repr__(self):
         return '%s(%s)' % (type(self).__name__, self.pieces)
 
     @property
     def notation(self):
-        chunks = []
-        for i in self.pieces:
-            if isinstance(i, Interval):
-                chunks.append(i.notation)
-            else:
-                chunks.append('{%s}' % i)
-        return ', '.join(chunks)
+        return ', '.join(map(_piece_notation, self.pieces))
+
+    def write_notation(self, fp):
+        """
+        Write notation of the Set to text file-like object fp, same as
+        fp.write(self.notation) but formatting NOTATION_BATCH pieces at a time,
+        so the whole notation string is never held in memory.
+        """
+        pieces = self.pieces
+        for i in range(0, len(pieces), NOTATION_BATCH):
+            if i:
+                fp.write(', ')
+            fp.write(', '.join(map(_piece_notation, pieces[i:i+NOTATION_BATCH])))
+
+    @classmethod
+    def read_notation(cls, fp, block_size=BLOCK_SIZE):
+        """
+        Return a new Set with pieces in notation read from text file-like
+        object fp, e.g. written with write_notation(). Same as
+        Set(fp.read()) but notation is read and parsed by blocks of
+        block_size characters, see parser.read_set_notation().
+        Unlike Set(notation), pieces longer than parser.MAX_PIECE_LENGTH
+        characters raise ValueError. Empty file gives empty Set.
+        """
+        new = cls()
+        new._init_from_tokens(read_set_notation(fp, block_size))
+        return new
+
+    def add_observer(self, fn):
+        """
+        Register callable fn to be notified about every change of Set pieces.
+        fn is called as fn(s, start, stop, new_pieces) right after
+            pieces[start:stop] have been replaced with list new_pieces,
+        so dependants can be updated in O(len(new_pieces) + stop - start).
+        Sets without observers do not pay for notification.
+        """
+        if self._observers is None:
+            self._observers = []
+        self._observers.append(fn)
+
+    def remove_observer(self, fn):
+        """
+        Unregister callable fn added with add_observer().
+        Raises ValueError if fn is not registered.
+        """
+        if not self._observers or fn not in self._observers:
+            raise ValueError('%r is not an observer of the Set' % fn)
+        self._observers.remove(fn)
+        if not self._observers:
+            self._observers = None
+
+    def _notify(self, start, stop, new_pieces):
+        """Let observers know that pieces[start:stop] were replaced with new_pieces."""
+        # Iterate over a copy so observers can unregister themselves.
+        for fn in list(self._observers):
+            fn(self, start, stop, new_pieces)
+
+    def _replace_pieces(self, pieces):
+        """Replace all the pieces of the Set with list pieces."""
+        stop = len(self.pieces)
+        self.pieces = pieces
+        if self._observers:
+            self._notify(0, stop, pieces)
 
     def __bool__(self):
         return len(self.pieces) > 0
@@ -168,25 +333,79 @@ class Set(object):
         Optional args lo (default 0) and hi (default len(self.pieces)) bound the
             slice of self.pieces to be searched.
         """
-        if lo < 0:
-            raise ValueError('lo must be non-negative')
-        if hi is None:
-            hi = len(self.pieces)
-        while lo < hi:
-            mid = (lo+hi) // 2
-            piece = self.pieces[mid]
-            if isinstance(piece, Interval):
-                start, end = piece.a, piece.b
-            else:
-                start, end = piece, piece
-            if end < x:
-                lo = mid + 1
-            elif start > x:
-                hi = mid
-            else:
-                return mid, piece
+        return search_pieces(self.pieces, x, lo, hi)
+
+    def next_piece(self, x, lo=0, hi=None):
+        """
+        Find the piece that contains scalar x or the nearest one after x.
+        Return tuple of two elements:
+            index of the piece in list of Set pieces, or hi (default len(pieces))
+                if none found.
+            the piece, or None if none found.
+        Optional args lo and hi bound the search like in search(),
+            e.g. index returned by previous call can be passed as lo
+            when scanning in ascending order. Pieces at and after hi are ignored.
+        """
+        idx, piece = self.search(x, lo, hi)
+        if piece is None and idx < (len(self.pieces) if hi is None else hi):
+            piece = self.pieces[idx]
+        return idx, piece
 
-        return lo, None
+    def prev_piece(self, x, lo=0, hi=None):
+        """
+        Find the piece that contains scalar x or the nearest one before x.
+        Return tuple of two elements:
+            index of the piece in list of Set pieces, or lo - 1 (default -1)
+                if none found.
+            the piece, or None if none found.
+        Optional args lo and hi bound the search like in search(),
+            e.g. index returned by previous call plus 1 can be passed as hi
+            when scanning in descending order. Pieces before lo are ignored.
+        """
+        idx, piece = self.search(x, lo, hi)
+        if piece is None:
+            idx -= 1
+            if idx >= lo:
+                piece = self.pieces[idx]
+        return idx, piece
+
+    def ceil(self, x, lo=0, hi=None):
+        """
+        Return left Endpoint where the nearest part of the Set at or after x starts:
+            Endpoint(x, '[') if x is in the Set,
+            otherwise the left endpoint of the next piece.
+        The Endpoint is open when its value itself is not in the Set.
+        Return None if there is nothing in the Set at or after x.
+        Optional args lo and hi are the same as in next_piece().
+        """
+        idx, piece = self.search(x, lo, hi)
+        if piece is not None:
+            return Endpoint(x, '[')
+        if idx == (len(self.pieces) if hi is None else hi):
+            return None
+        piece = self.pieces[idx]
+        if isinstance(piece, Interval):
+            return piece.a.copy()
+        return Endpoint(piece, '[')
+
+    def floor(self, x, lo=0, hi=None):
+        """
+        Return right Endpoint where the nearest part of the Set at or before x ends:
+            Endpoint(x, ']') if x is in the Set,
+            otherwise the right endpoint of the previous piece.
+        The Endpoint is open when its value itself is not in the Set.
+        Return None if there is nothing in the Set at or before x.
+        Optional args lo and hi are the same as in prev_piece().
+        """
+        idx, piece = self.search(x, lo, hi)
+        if piece is not None:
+            return Endpoint(x, ']')
+        if idx == lo:
+            return None
+        piece = self.pieces[idx-1]
+        if isinstance(piece, Interval):
+            return piece.b.copy()
+        return Endpoint(piece, ']')
 
     def __contains__(self, x):
         """
@@ -200,7 +419,311 @@ class Set(object):
             return piece is not None and is_interval(piece) and x.b <= piece.b
         else:
             return self.search(x)[1] is not None
-        
+
+    def compile(self):
+        """
+        Return function f(x) testing scalar x for membership in the Set,
+        generated for the current pieces of the Set.
+        For a few pieces it is a chain of comparisons, e.g. for '[0, 5), {7}'
+            return 0 <= x < 5 or x == 7
+        for more pieces it is a binary search over tuples of endpoint values.
+        The function is much faster than "in", e.g. as filter() predicate.
+        It raises RuntimeError if called after the Set has been changed.
+        """
+        pieces = self.pieces
+        if self._compiled is None:
+            # Shared by all the functions compiled since the last change.
+            self._compiled = [True]
+            self.add_observer(self._drop_compiled)
+        namespace = {'_valid': self._compiled, '_bisect': bisect_right}
+
+        if len(pieces) <= COMPILE_INLINE_MAX:
+            def const(value):
+                """Return literal for int or float value, otherwise name bound to it."""
+                if type(value) in (int, float) and is_finite(value):
+                    return repr(value)
+                name = '_v%d' % len(namespace)
+                namespace[name] = value
+                return name
+
+            terms = []
+            for p in pieces:
+                if not isinstance(p, Interval):
+                    terms.append('x == %s' % const(p))
+                    continue
+                term = 'x'
+                if p.a.value != neg_inf:
+                    term = '%s %s %s' % (const(p.a.value), '<' if p.a.open else '<=', term)
+                if p.b.value != inf:
+                    term = '%s %s %s' % (term, '<' if p.b.open else '<=', const(p.b.value))
+                terms.append(term if term != 'x' else 'True')
+            body = '    return %s\n' % (' or '.join(terms) or 'False')
+        else:
+            intervals = [p if isinstance(p, Interval) else Interval(p, p, '[]') for p in pieces]
+            namespace['_starts'] = tuple(p.a.value for p in intervals)
+            namespace['_ends'] = tuple(p.b.value for p in intervals)
+            namespace['_a_open'] = tuple(p.a.open for p in intervals)
+            namespace['_b_open'] = tuple(p.b.open for p in intervals)
+            body = ('    i = _bisect(_starts, x) - 1\n'
+                    '    if i < 0 or x == _starts[i] and _a_open[i]:\n'
+                    '        return False\n'
+                    '    b = _ends[i]\n'
+                    '    return x < b or x == b and not _b_open[i]\n')
+
+        source = ('def contains(x):\n'
+                  '    if not _valid[0]:\n'
+                  '        raise RuntimeError("Set has changed since compile()")\n' + body)
+        exec(source, namespace)
+        return namespace['contains']
+
+    def _drop_compiled(self, s, start, stop, new_pieces):
+        """Observer invalidating functions made by compile() on the first change of the Set."""
+        self._compiled[0] = False
+        self._compiled = None
+        self.remove_observer(self._drop_compiled)
+
+    def irange(self, lo, hi, bounds='[]'):
+        """
+        Generate copies of pieces of the Set that overlap with the interval
+        from lo to hi, trimmed to fit into it.
+        bounds (default '[]') is a string of 2 characters telling whether
+        lo and hi are included, same as in Interval(lo, hi, bounds).
+
+        The first and the last overlapping pieces are found with binary search,
+        so pieces outside of the window are never touched.
+        """
+        window = Interval(lo, hi, bounds)
+        idx1, _ = self.search(window.a)
+        idx2, piece2 = self.search(window.b, idx1)
+        if piece2 is not None:
+            idx2 += 1
+        for piece in self.pieces[idx1:idx2]:
+            if isinstance(piece, Interval):
+                a = piece.a if piece.a >= window.a else window.a
+                b = piece.b if piece.b <= window.b else window.b
+                if a.value == b.value:
+                    # Closed endpoint of the piece touches closed bound of the window.
+                    yield a.value
+                else:
+                    yield Interval(a.copy(), b.copy())
+            else:
+                yield piece
+
+    def clip(self, lo, hi, bounds='[]'):
+        """
+        Return a new Set with everything in the Set that is between lo and hi.
+        Same as self & Set([Interval(lo, hi, bounds)]) but takes
+        O(log n + k) time where k is the number of pieces in the result.
+        """
+        new = Set()
+        new.pieces = list(self.irange(lo, hi, bounds))
+        return new
+
+    def _drop_prefix(self, s, start, stop, new_pieces):
+        """Observer dropping cached prefix sums on the first change of the Set."""
+        self._prefix = None
+        self._prefix_arrays = None
+        self.remove_observer(self._drop_prefix)
+
+    def _prefix_measure(self):
+        """
+        Return list of len(pieces) + 1 prefix sums of lengths of pieces:
+            item i is the total length of pieces[:i].
+        Scalars and infinite pieces count as zero. Infinite pieces can only be
+        the first and the last ones, which are always measured separately.
+        The list is built lazily and dropped on the first change of the Set.
+        """
+        if self._prefix is None:
+            lengths = [p.b.value - p.a.value
+                       if isinstance(p, Interval) and is_finite(p.a.value) and is_finite(p.b.value)
+                       else None
+                       for p in self.pieces]
+            zero = _zero_length(self.pieces)
+            total = zero
+            prefix = [zero]
+            for length in lengths:
+                if length is not None:
+                    total = total + length
+                prefix.append(total)
+            self._prefix = prefix
+            self.add_observer(self._drop_prefix)
+        return self._prefix
+
+    @staticmethod
+    def _clipped_measure(piece, lo, hi, zero):
+        """Return length of piece trimmed to be between lo and hi."""
+        if not isinstance(piece, Interval):
+            return zero
+        a = piece.a.value if lo is None else max(piece.a.value, lo)
+        b = piece.b.value if hi is None else min(piece.b.value, hi)
+        if not is_finite(a) or not is_finite(b):
+            return inf
+        return b - a
+
+    def measure(self, lo=None, hi=None):
+        """
+        Return total length of the Set or of its part between lo and hi.
+        Scalars and degenerate intervals count as zero, unbounded pieces make
+        the measure infinite.
+        Values must support subtraction: numbers, datetimes, etc.
+        Measure of datetimes is timedelta.
+
+        Prefix sums of lengths of pieces are built on the first call, so that
+        next calls take O(log n) time until the Set is changed.
+        """
+        pieces = self.pieces
+        prefix = self._prefix_measure()
+        zero = prefix[0]
+        if lo is not None and hi is not None and lo >= hi:
+            return zero
+        i = 0 if lo is None else self.search(lo)[0]
+        if hi is None:
+            j = len(pieces)
+        else:
+            j, piece = self.search(hi, i)
+            if piece is not None:
+                j += 1
+        if i >= j:
+            return zero
+        if j - i == 1:
+            return self._clipped_measure(pieces[i], lo, hi, zero)
+        first = self._clipped_measure(pieces[i], lo, None, zero)
+        last = self._clipped_measure(pieces[j-1], None, hi, zero)
+        if first is inf or last is inf:
+            return inf
+        return first + (prefix[j-1] - prefix[i+1]) + last
+
+    def rank(self, x):
+        """Return number of pieces of the Set that are entirely before scalar x."""
+        return self.search(x)[0]
+
+    def select(self, k):
+        """Return k-th piece of the Set, counting from 0."""
+        return self.pieces[k]
+
+    def _finite_prefix_measure(self):
+        """
+        Return prefix sums of lengths of pieces, see _prefix_measure().
+        Raise ValueError if the Set is unbounded or has zero measure.
+        """
+        pieces = self.pieces
+        prefix = self._prefix_measure()
+        if not pieces or prefix[-1] == prefix[0]:
+            raise ValueError('Set has zero measure')
+        first, last = pieces[0], pieces[-1]
+        if isinstance(first, Interval) and first.a.value == neg_inf \
+           or isinstance(last, Interval) and last.b.value == inf:
+            raise ValueError('Set is unbounded')
+        return prefix
+
+    def point_at(self, offset):
+        """
+        Return the least point such that the measure of the part of the Set
+        to the left of it equals to offset. offset must be between zero and
+        self.measure(). Note that the point can be an open endpoint of a piece.
+        Raises ValueError if the Set is unbounded or has zero measure.
+        Takes O(log n) time, see measure().
+        """
+        pieces = self.pieces
+        prefix = self._finite_prefix_measure()
+        zero = prefix[0]
+        total = prefix[-1]
+        if not zero <= offset <= total:
+            raise ValueError('offset must be between 0 and %s' % total)
+        if offset == zero:
+            # Start of the first piece having non-zero length.
+            return pieces[bisect_right(prefix, zero) - 1].a.value
+        # Piece i has prefix[i] < offset <= prefix[i+1].
+        i = bisect_left(prefix, offset) - 1
+        return pieces[i].a.value + (offset - prefix[i])
+
+    def quantile(self, q):
+        """
+        Return the point of the Set such that fraction q of the measure
+        of the Set is to the left of it, 0 <= q <= 1.
+        See point_at().
+        """
+        if not 0 <= q <= 1:
+            raise ValueError('q must be between 0 and 1')
+        return self.point_at(self.measure() * q)
+
+    def sample(self, k, rng=None):
+        """
+        Return list of k points drawn uniformly from the measure of the Set,
+        i.e. every point is in a piece chosen with probability proportional
+        to its length. Raises ValueError if the Set is unbounded or has zero measure.
+
+        rng is a random.Random instance, module random is used by default.
+        If rng is numpy.random.Generator, sampling is vectorized with NumPy
+        and numpy array is returned. In that case values of the Set must be numbers.
+
+        Every point takes O(log n) time: binary search over prefix sums of
+        lengths of pieces, which are cached until the Set is changed.
+        Points falling on open bounds of pieces are drawn again,
+        so that every point is in the Set.
+        """
+        if type(rng).__module__.startswith('numpy'):
+            return self._sample_numpy(k, rng)
+        pieces = self.pieces
+        prefix = self._finite_prefix_measure()
+        total = prefix[-1]
+        if rng is None:
+            rng = random
+        n = len(pieces)
+        points = []
+        while len(points) < k:
+            offset = rng.random() * total
+            # Piece i has prefix[i] <= offset < prefix[i+1].
+            i = bisect_right(prefix, offset) - 1
+            if i == n:
+                # offset rounded up to total, e.g. timedelta to microseconds.
+                continue
+            point = pieces[i].a.value + (offset - prefix[i])
+            # Open start of the piece, or its open end hit by rounding, is redrawn.
+            if point in pieces[i]:
+                points.append(point)
+        return points
+
+    def _sample_numpy(self, k, rng):
+        import numpy
+        prefix = self._finite_prefix_measure()
+        if self._prefix_arrays is None:
+            pieces = self.pieces
+            starts = [p.a.value if isinstance(p, Interval) else p for p in pieces]
+            ends = [p.b.value if isinstance(p, Interval) else p for p in pieces]
+            open_a = [isinstance(p, Interval) and p.a.open for p in pieces]
+            open_b = [isinstance(p, Interval) and p.b.open for p in pieces]
+            self._prefix_arrays = (numpy.array(prefix, dtype=float),
+                                   numpy.array(starts, dtype=float),
+                                   numpy.array(ends, dtype=float),
+                                   numpy.array(open_a, dtype=bool),
+                                   numpy.array(open_b, dtype=bool))
+        prefix, starts, ends, open_a, open_b = self._prefix_arrays
+        n = len(starts)
+        points = numpy.empty(k)
+        # Indices of points still to be drawn.
+        todo = numpy.arange(k)
+        while len(todo):
+            offsets = rng.random(len(todo)) * prefix[-1]
+            idx = numpy.searchsorted(prefix, offsets, side='right') - 1
+            valid = idx < n
+            idx = numpy.minimum(idx, n - 1)
+            p = starts[idx] + (offsets - prefix[idx])
+            valid &= (p > starts[idx]) | (p == starts[idx]) & ~open_a[idx]
+            valid &= (p < ends[idx]) | (p == ends[idx]) & ~open_b[idx]
+            points[todo[valid]] = p[valid]
+            todo = todo[~valid]
+        return points
+
+    def complement_view(self):
+        """
+        Return lazy view of the complement of the Set, see SetView.
+        Unlike ~self, nothing is copied and the view follows changes of the Set.
+        """
+        # Imported here since view module is built on top of Set.
+        from set_algebra.view import SetView
+        return SetView.complement(self)
+
     @_assert_pieces_are_ascending
     def __invert__(self):
         """
@@ -212,7 +735,7 @@ class Set(object):
         if not self.pieces:
             new.pieces.append(unbounded.copy())
             return new
-        if self.pieces[0] == unbounded.copy():
+        if self.pieces[0] == unbounded:
             return new
         # Get plain list of endpoints from original Set.
         endpoints = []
@@ -408,7 +931,7 @@ class Set(object):
             emsg = "unsupported operand type for &=: %s and %s"
             raise TypeError(emsg % (type(self), type(other)))
         new = Set.__and(self, other)
-        self.pieces = new.pieces
+        self._replace_pieces(new.pieces)
         return self
 
     def intersection(self, *others):
@@ -432,7 +955,7 @@ class Set(object):
                 new = Set.__and(new, other)
             else:
                 new = Set.__and(new, Set(other))
-        self.pieces = new.pieces
+        self._replace_pieces(new.pieces)
 
     def isdisjoint(self, other):
         """
@@ -534,7 +1057,7 @@ class Set(object):
             emsg = "unsupported operand type for ^=: %s and %s"
             raise TypeError(emsg % (type(self), type(other)))
         new = Set.__xor(self, other)
-        self.pieces = new.pieces
+        self._replace_pieces(new.pieces)
         return self
 
     def symmetric_difference(self, *others):
@@ -559,7 +1082,7 @@ class Set(object):
                 new = Set.__xor(new, other)
             else:
                 new = Set.__xor(new, Set(other))
-        self.pieces = new.pieces
+        self._replace_pieces(new.pieces)
 
     def _add_scalar(self, x, lo=0):
 
@@ -580,17 +1103,27 @@ class Set(object):
                     # Adding b to (a, b), (b, c)
                     interval = Interval(pre.a.copy(), nex.b.copy())
                     pieces[idx-1:idx+1] = [interval]
+                    if self._observers:
+                        self._notify(idx-1, idx+1, [interval])
+                    # Merged interval extends beyond x and may overlap next pieces to add.
+                    return idx - 1
                 else:
                     # Adding b to (a, b)
                     b = Endpoint(x, ']')
                     pieces[idx-1] = Interval(pre.a.copy(), b)
+                    if self._observers:
+                        self._notify(idx-1, idx, [pieces[idx-1]])
                 return idx
         if nex is not None and nex.a.value == x:
             # Adding a to (a, b)
             a = Endpoint(x, '[')
             pieces[idx] = Interval(a, nex.b.copy())
+            if self._observers:
+                self._notify(idx, idx+1, [pieces[idx]])
             return idx
         pieces.insert(idx, x)
+        if self._observers:
+            self._notify(idx, idx, [x])
         
         return idx + 1
             
@@ -629,19 +1162,49 @@ class Set(object):
                 b = Endpoint(nex, ']')
                 idx2 += 1
 
-        pieces[idx1:idx2] = [Interval(a, b)]
-        return min([idx2, len(self.pieces)])
+        interval = Interval(a, b)
+        pieces[idx1:idx2] = [interval]
+        if self._observers:
+            self._notify(idx1, idx2, [interval])
+        return idx1
 
     def _add(self, x, lo=0):
         """
         Add scalar or interval x to Set, starting from piece at index lo.
-        return index of the first piece that does not intersect with x.
+        return index where search for pieces greater than x can start.
         """
         if isinstance(x, Interval):
-            return self._add_interval(x, lo)
+            idx = self._add_interval(x, lo)
         else:
-            return self._add_scalar(x, lo)
-        
+            idx = self._add_scalar(x, lo)
+        if self.max_gap is not None:
+            idx, _ = self.search(x.a if isinstance(x, Interval) else x, lo)
+            idx = self._coalesce_at(idx)
+        return idx
+
+    def _coalesce_at(self, idx):
+        """
+        Merge piece at index idx with the neighbours separated from it
+        by gaps not longer than max_gap. Return index of the merged piece.
+        """
+        pieces = self.pieces
+        max_gap = self.max_gap
+        start = idx
+        while start > 0 and _gap_length(pieces[start-1], pieces[start]) <= max_gap:
+            start -= 1
+        stop = idx + 1
+        while stop < len(pieces) and _gap_length(pieces[stop-1], pieces[stop]) <= max_gap:
+            stop += 1
+        if stop - start > 1:
+            first, last = pieces[start], pieces[stop-1]
+            a = first.a.copy() if isinstance(first, Interval) else Endpoint(first, '[')
+            b = last.b.copy() if isinstance(last, Interval) else Endpoint(last, ']')
+            interval = Interval(a, b)
+            pieces[start:stop] = [interval]
+            if self._observers:
+                self._notify(start, stop, [interval])
+        return start
+
     @_assert_pieces_are_ascending
     def add(self, x):
         """Add scalar or interval x to Set, merge ones that intersect."""
@@ -656,17 +1219,23 @@ class Set(object):
         if isinstance(piece, Interval):
             if piece.a.value == x:
                 piece.a.open = True
+                new_pieces = [piece]
             elif piece.b.value == x:
                 piece.b.open = True
+                new_pieces = [piece]
             else:
                 # Split interval by x.
                 b1 = Endpoint(x, ')')
                 i1 = Interval(piece.a, b1)
                 a2 = Endpoint(x, '(')
                 i2 = Interval(a2, piece.b)
-                self.pieces[idx:idx+1] = [i1, i2]
+                new_pieces = [i1, i2]
+                self.pieces[idx:idx+1] = new_pieces
         else:
-            self.pieces[idx:idx+1] = []
+            new_pieces = []
+            self.pieces[idx:idx+1] = new_pieces
+        if self._observers:
+            self._notify(idx, idx+1, new_pieces)
 
         return idx
 
@@ -689,8 +1258,14 @@ class Set(object):
             else:
                 new_pieces.append(Interval(~x.b, piece2.b))
             pieces[idx1:idx1+1] = new_pieces
+            if self._observers:
+                self._notify(idx1, idx1+1, new_pieces)
             return idx1
 
+        # Bounds of the slice of pieces that is going to be changed.
+        start = idx1
+        stop = idx2 if piece2 is None else idx2 + 1
+
         if piece1 is not None:
             if isinstance(piece1, Interval):
                 if x.a.value == piece1.a.value:
@@ -714,6 +1289,9 @@ class Set(object):
                 idx2 += 1
 
         pieces[idx1:idx2] = []
+        if self._observers and stop > start:
+            stop_new = stop - (idx2 - idx1)
+            self._notify(start, stop, pieces[start:stop_new])
 
         return idx1
 
@@ -734,7 +1312,7 @@ class Set(object):
 
     def clear(self):
         """Remove all pieces from the Set."""
-        self.pieces = []
+        self._replace_pieces([])
 
     def copy(self):
         """
@@ -744,5 +1322,235 @@ class Set(object):
         """
         new = Set()
         new.pieces = _copy_pieces(self.pieces)
+        if self.max_gap is not None:
+            new.max_gap = self.max_gap
         return new
 
+    def __reduce__(self):
+        """
+        Pickle the Set as a flat list of values of its pieces and bytes
+        of their flags, instead of every Interval and Endpoint object.
+        Observers and cached data are not pickled.
+        """
+        values = []
+        flags = bytearray(len(self.pieces))
+        for i, p in enumerate(self.pieces):
+            if isinstance(p, Interval):
+                values.append(p.a.value)
+                values.append(p.b.value)
+                flags[i] = (binary.A_OPEN if p.a.open else 0) | (binary.B_OPEN if p.b.open else 0)
+            else:
+                values.append(p)
+                flags[i] = binary.SCALAR
+        return _restore_set, (type(self), values, bytes(flags), self.max_gap)
+
+    def to_bytes(self):
+        """
+        Return bytes with pieces of the Set in compact binary format,
+        see set_algebra.binary. Values must be ints, floats, naive datetimes
+        or dates, otherwise ValueError is raised.
+        >>> Set.from_buffer(Set('[1, 2), {5}').to_bytes())
+        Set([Interval('[1, 2)'), 5])
+        """
+        return binary.pack(self.pieces)
+
+    @classmethod
+    def from_buffer(cls, buf):
+        """
+        Return a new Set with pieces stored in buffer buf by to_bytes().
+        buf can be bytes, memoryview, mmap or any object supporting buffer
+        protocol, e.g. mmap of a file written with to_bytes().
+        Values are unpacked in bulk, without any parsing or validation.
+        """
+        new = cls()
+        new.pieces = binary.unpack(buf)
+        return new
+
+    def coalesce(self, max_gap):
+        """
+        Return a new Set where pieces separated by gaps not longer than max_gap
+        are merged into one interval, including the gaps.
+        Gap of a single point has zero length, so even max_gap=0 closes it:
+            Set('[1, 2), (2, 3]').coalesce(0) -> Set('[1, 3]')
+        Takes one pass over pieces.
+        """
+        pieces = []
+        for p in self.pieces:
+            if pieces and _gap_length(pieces[-1], p) <= max_gap:
+                pre = pieces[-1]
+                a = pre.a if isinstance(pre, Interval) else Endpoint(pre, '[')
+                b = p.b.copy() if isinstance(p, Interval) else Endpoint(p, ']')
+                pieces[-1] = Interval(a, b)
+            else:
+                pieces.append(p.copy() if isinstance(p, Interval) else p)
+        new = Set()
+        new.pieces = pieces
+        return new
+
+    def dilate(self, delta, right=None):
+        """
+        Return a new Set with every piece grown by delta to the left and by
+        right (default: delta) to the right. Pieces that come to intersect
+        or touch each other are merged, scalars become intervals.
+        Endpoints keep their bounds. delta and right must be non-negative.
+        Takes one pass over pieces.
+        """
+        if right is None:
+            right = delta
+        zero = delta - delta
+        if delta < zero or right < zero:
+            raise ValueError('delta and right must be non-negative')
+        if delta == zero and right == zero:
+            return self.copy()
+        pieces = []
+        for p in self.pieces:
+            if isinstance(p, Interval):
+                a_value, a_bound = p.a.value, p.a.open and '(' or '['
+                b_value, b_bound = p.b.value, p.b.open and ')' or ']'
+            else:
+                a_value, a_bound = p, '['
+                b_value, b_bound = p, ']'
+            if is_finite(a_value):
+                a_value = a_value - delta
+            if is_finite(b_value):
+                b_value = b_value + right
+            a = Endpoint(a_value, a_bound)
+            b = Endpoint(b_value, b_bound)
+            if pieces:
+                pre = pieces[-1]
+                if pre.b >= a or are_bounding(pre.b, a):
+                    pre.b = b
+                    continue
+            pieces.append(Interval(a, b))
+        new = Set()
+        new.pieces = pieces
+        return new
+
+    def erode(self, delta, right=None):
+        """
+        Return a new Set with every piece shrunk by delta from the left and by
+        right (default: delta) from the right. Pieces that vanish are dropped,
+        pieces shrunk to a single closed point become scalars.
+        Endpoints keep their bounds. delta and right must be non-negative.
+        Takes one pass over pieces.
+        """
+        if right is None:
+            right = delta
+        zero = delta - delta
+        if delta < zero or right < zero:
+            raise ValueError('delta and right must be non-negative')
+        if delta == zero and right == zero:
+            return self.copy()
+        pieces = []
+        for p in self.pieces:
+            if not isinstance(p, Interval):
+                continue
+            a_value = p.a.value
+            if is_finite(a_value):
+                a_value = a_value + delta
+            b_value = p.b.value
+            if is_finite(b_value):
+                b_value = b_value - right
+            if a_value < b_value:
+                a = Endpoint(a_value, p.a.open and '(' or '[')
+                b = Endpoint(b_value, p.b.open and ')' or ']')
+                pieces.append(Interval(a, b))
+            elif a_value == b_value and not p.a.open and not p.b.open:
+                pieces.append(a_value)
+        new = Set()
+        new.pieces = pieces
+        return new
+
+    def simplify(self, max_pieces):
+        """
+        Return tuple of two elements:
+            a new Set that is a superset of the Set with at most max_pieces
+                pieces, made by closing the smallest gaps between pieces.
+            total length of the closed gaps, i.e. the measure added.
+        The smallest gaps are chosen with a heap, which takes O(n log n) time.
+        Of equal gaps the leftmost ones are closed first.
+        """
+        if max_pieces < 1:
+            raise ValueError('max_pieces must be positive')
+        pieces = self.pieces
+        n = len(pieces)
+        gaps = [_gap_length(pieces[k-1], pieces[k]) for k in range(1, n)]
+        added = gaps[0] - gaps[0] if gaps else 0
+        if n <= max_pieces:
+            return self.copy(), added
+        close = [False] * len(gaps)
+        for k in heapq.nsmallest(n - max_pieces, range(len(gaps)), key=gaps.__getitem__):
+            close[k] = True
+            added = added + gaps[k]
+        new_pieces = []
+        for k, p in enumerate(pieces):
+            if k and close[k-1]:
+                pre = new_pieces[-1]
+                a = pre.a if isinstance(pre, Interval) else Endpoint(pre, '[')
+                b = p.b.copy() if isinstance(p, Interval) else Endpoint(p, ']')
+                new_pieces[-1] = Interval(a, b)
+            else:
+                new_pieces.append(p.copy() if isinstance(p, Interval) else p)
+        new = Set()
+        new.pieces = new_pieces
+        return new, added
+
+    def shift(self, offset):
+        """
+        Return a new Set with every piece moved by offset.
+        Translation preserves order of pieces, so they are not validated again.
+        """
+        make_endpoint = Endpoint._make
+        make_interval = Interval._make
+        pieces = []
+        for p in self.pieces:
+            if isinstance(p, Interval):
+                a, b = p.a, p.b
+                a_value = a.value + offset if is_finite(a.value) else a.value
+                b_value = b.value + offset if is_finite(b.value) else b.value
+                pieces.append(make_interval(make_endpoint(a_value, a.open, True),
+                                            make_endpoint(b_value, b.open, False)))
+            else:
+                pieces.append(p + offset)
+        new = Set()
+        new.pieces = pieces
+        return new
+
+    def scale(self, factor):
+        """
+        Return a new Set with every value multiplied by non-zero factor.
+        Negative factor reverses order of pieces and swaps their bounds:
+            Set('[1, 2)').scale(-1) -> Set('(-2, -1]')
+        Scaling preserves or reverses order of pieces,
+        so they are not validated again.
+        """
+        if factor == 0:
+            raise ValueError('factor must not be zero')
+        make_endpoint = Endpoint._make
+        make_interval = Interval._make
+        positive = factor > 0
+        pieces = []
+        for p in self.pieces:
+            if isinstance(p, Interval):
+                a, b = p.a, p.b
+                if is_finite(a.value):
+                    a_value = a.value * factor
+                else:
+                    a_value = a.value if positive else -a.value
+                if is_finite(b.value):
+                    b_value = b.value * factor
+                else:
+                    b_value = b.value if positive else -b.value
+                if positive:
+                    a = make_endpoint(a_value, a.open, True)
+                    b = make_endpoint(b_value, b.open, False)
+                else:
+                    a, b = make_endpoint(b_value, b.open, True), make_endpoint(a_value, a.open, False)
+                pieces.append(make_interval(a, b))
+            else:
+                pieces.append(p * factor)
+        if not positive:
+            pieces.reverse()
+        new = Set()
+        new.pieces = pieces
+        return new
@@ -0,0 +1,234 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from bisect import bisect_right
+
+from set_algebra import binary
+from set_algebra.infinity import inf, is_finite, neg_inf
+from set_algebra.interval import Interval
+from set_algebra.parser import string_types
+from set_algebra.set_ import Set
+
+
+# memoryview.cast() gives columns of native values, available since Python 3.3.
+_CAST = hasattr(memoryview, 'cast') and sys.byteorder == 'little'
+
+_replace = getattr(os, 'replace', os.rename)
+
+
+class _Column(object):
+    """Read-only sequence of n little-endian values of struct format fmt in buffer."""
+    __slots__ = ('_buf', '_offset', '_n', '_struct')
+
+    def __init__(self, buf, offset, n, fmt):
+        self._buf = buf
+        self._offset = offset
+        self._n = n
+        self._struct = struct.Struct('<' + fmt)
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, i):
+        if not 0 <= i < self._n:
+            raise IndexError('column index out of range')
+        return self._struct.unpack_from(self._buf, self._offset + i * self._struct.size)[0]
+
+
+def _column(buf, offset, n, fmt):
+    """Return sequence of n values of struct format fmt stored in buf at offset, without copying."""
+    if _CAST:
+        size = struct.calcsize(fmt)
+        return memoryview(buf)[offset:offset + n * size].cast(fmt)
+    return _Column(buf, offset, n, fmt)
+
+
+class SharedSet(object):
+    """
+    Read-only Set working right on a buffer in the binary format of
+    Set.to_bytes(), so that processes share one copy of it in memory.
+
+    SharedSet.publish(s, path) writes Set s to file path. Every process
+    makes SharedSet(path), which maps the file into memory read-only.
+    The pages of the file are shared by all the processes through the
+    OS page cache. Nothing is unpickled or copied - search() and "in"
+    binary search the values in the mapped file and make only the piece
+    found. SharedSet can be made from any other buffer as well, e.g.
+    multiprocessing.shared_memory.SharedMemory(name).buf or bytes.
+
+    Reload protocol: publish() writes a new version into a temporary file
+    and atomically renames it to path. Processes call reload(), which maps
+    the new file if path has been replaced since it was mapped. The old
+    version stays mapped and valid for as long as anything refers to it,
+    e.g. a running irange(), and is unmapped when garbage collected.
+    A SharedSet made from a buffer is replaced by making a new one.
+
+    Read API is the same as of Set: search(), "in", irange(), iteration,
+    len(), pieces, notation, to_set().
+
+    >>> SharedSet.publish(Set('[1, 5], [10, 20]'), '/tmp/policy.set')
+    >>> policy = SharedSet('/tmp/policy.set')
+    >>> 15 in policy
+    True
+    >>> policy.reload()
+    False
+    """
+    __slots__ = ('path', '_file_id', '_buf', '_code', '_size', '_starts', '_ends', '_flags')
+
+    def __init__(self, path_or_buffer):
+        if isinstance(path_or_buffer, string_types):
+            self.path = path_or_buffer
+            self._map()
+        else:
+            self.path = None
+            self._file_id = None
+            self._attach(path_or_buffer)
+
+    @staticmethod
+    def publish(s, path):
+        """
+        Write Set s to file path in the binary format, atomically replacing
+        previous version, so that readers never see a partially written file.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp = tempfile.mkstemp(dir=directory, prefix='.%s.' % os.path.basename(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(s.to_bytes())
+                f.flush()
+                os.fsync(f.fileno())
+            _replace(temp, path)
+        except BaseException:
+            os.remove(temp)
+            raise
+
+    def _map(self):
+        """Map file at path into memory."""
+        with open(self.path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._attach(buf)
+        self._file_id = (stat.st_dev, stat.st_ino)
+
+    def _attach(self, buf):
+        code, n = binary.read_header(buf)
+        fmt = binary.STRUCT_FORMATS[code]
+        offset = binary.HEADER.size
+        self._buf = buf
+        self._code = code
+        self._size = n
+        self._starts = _column(buf, offset, n, fmt)
+        self._ends = _column(buf, offset + 8 * n, n, fmt)
+        self._flags = _column(buf, offset + 16 * n, n, 'B')
+
+    def reload(self):
+        """
+        Map the latest version published to path.
+        Return True if a new version has been mapped, False if it is the same.
+        """
+        if self.path is None:
+            return False
+        stat = os.stat(self.path)
+        if (stat.st_dev, stat.st_ino) == self._file_id:
+            return False
+        self._map()
+        return True
+
+    def __repr__(self):
+        if self.path is None:
+            return '<%s of %d pieces>' % (type(self).__name__, self._size)
+        return '%s(%r)' % (type(self).__name__, self.path)
+
+    def _piece(self, i):
+        """Return piece i made from the buffer."""
+        return binary.decode_piece(self._code, self._starts[i], self._ends[i], self._flags[i])
+
+    def _key(self, x):
+        """Return scalar x as value stored in the buffer."""
+        if not is_finite(x):
+            lowest, greatest = binary.SENTINELS[self._code]
+            return lowest if x == neg_inf else greatest
+        encode = binary.ENCODERS.get(self._code)
+        return x if encode is None else encode(x)
+
+    def __iter__(self):
+        """Iterate over pieces in ascending order."""
+        for i in range(self._size):
+            yield self._piece(i)
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __nonzero__(self):
+        return self._size > 0
+
+    @property
+    def pieces(self):
+        """List of all the pieces."""
+        return list(self)
+
+    @property
+    def notation(self):
+        return self.to_set().notation
+
+    def to_set(self):
+        """Return a new Set with all the pieces."""
+        return Set.from_buffer(self._buf)
+
+    def search(self, x):
+        """
+        Search scalar x in SharedSet, same as Set.search().
+        Return tuple of two elements:
+            the index where to insert x in list of pieces.
+            piece that contains x or equals to x, or None if none found.
+        Takes O(log n) reads of the buffer.
+        """
+        key = self._key(x)
+        i = bisect_right(self._starts, key) - 1
+        if i < 0:
+            if not (self._size and self._flags[0] & binary.A_INF and x != neg_inf):
+                return 0, None
+            # x is less than the stored value standing for -inf.
+            i = 0
+        f = self._flags[i]
+        if key == self._starts[i] and f & binary.A_OPEN \
+                and not (f & binary.A_INF and x != neg_inf):
+            return i, None
+        end = self._ends[i]
+        if key < end or key == end and not f & binary.B_OPEN \
+                or f & binary.B_INF and x != inf:
+            return i, self._piece(i)
+        return i + 1, None
+
+    def __contains__(self, x):
+        """
+        x in self
+        Test scalar or interval x for membership in SharedSet.
+        """
+        if isinstance(x, Interval):
+            idx, piece = self.search(x.a.value)
+            if piece is None and idx < self._size:
+                # x can be open at start of the next piece.
+                piece = self._piece(idx)
+            return isinstance(piece, Interval) and x in piece
+        return self.search(x)[1] is not None
+
+    def irange(self, lo, hi, bounds='[]'):
+        """
+        Generate pieces of the SharedSet that overlap with the interval
+        from lo to hi, trimmed to fit into it, see Set.irange().
+        Only pieces overlapping with the interval are made.
+        """
+        first, _ = self.search(lo)
+        last, piece = self.search(hi)
+        if piece is not None:
+            last += 1
+        s = Set()
+        s.pieces = [self._piece(i) for i in range(first, last)]
+        for piece in s.irange(lo, hi, bounds):
+            yield piece
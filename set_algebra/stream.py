@@ -0,0 +1,131 @@
+"""
+Set operations over streams of pieces.
+
+union(), intersection(), difference(), xor() and complement() take
+iterables of pieces (Intervals and scalars) sorted in ascending order,
+such as Set.pieces or pieces read from a sorted file, and lazily yield
+pieces of the result, same as of respective Set operator, e.g.
+    list(union(a.pieces, b.pieces)) == (a | b).pieces
+Only one piece of every input is held in memory at a time, so inputs
+do not have to fit into memory. Pieces of the same input may touch,
+e.g. [1, 2), [2, 3), they are coalesced in the output.
+ValueError is raised when pieces of an input are not sorted or intersect.
+"""
+from heapq import heappop, heappush
+
+from set_algebra.endpoint import Endpoint
+from set_algebra.infinity import inf, neg_inf
+from set_algebra.interval import Interval
+
+
+# Pieces are processed as pairs of cuts. Cut is a position between points
+# on the axis, given as tuple (value, side): side 0 is right before value,
+# side 1 is right after value. So [1, 2) is from (1, 0) to (2, 0)
+# and {1} is from (1, 0) to (1, 1). Set operations become a sweep over cuts.
+
+def _cuts(pieces):
+    """Yield cuts of start and end of every piece, checking their order."""
+    last = None
+    for p in pieces:
+        if isinstance(p, Interval):
+            start = (p.a.value, 1 if p.a.open else 0)
+            end = (p.b.value, 0 if p.b.open else 1)
+        else:
+            start = (p, 0)
+            end = (p, 1)
+        if last is not None and start < last:
+            raise ValueError('pieces must be sorted in ascending order and must not intersect')
+        yield start
+        yield end
+        last = end
+
+
+def _piece(start, end):
+    """Return scalar or Interval between two cuts."""
+    if start[0] == end[0] and start[1] == 0 and end[1] == 1:
+        return start[0]
+    make = Endpoint._make
+    return Interval._make(make(start[0], start[1] == 1, True),
+                          make(end[0], end[1] == 0, False))
+
+
+def _sweep(iterables, predicate):
+    """
+    Yield canonical pieces of the result of set operation over iterables
+    of sorted pieces. predicate(flags) tells whether a point is in the result,
+    flags[i] telling whether it is in iterable i.
+    Keeps one cut per iterable in memory.
+    """
+    iterators = [_cuts(it) for it in iterables]
+    flags = [False] * len(iterators)
+    heap = []
+    for i, it in enumerate(iterators):
+        cut = next(it, None)
+        if cut is not None:
+            heappush(heap, (cut, i))
+    inside = predicate(flags)
+    start = (neg_inf, 1)
+    while heap:
+        cut = heap[0][0]
+        # All the cuts at the same position are applied at once,
+        # so touching pieces are coalesced and scalars absorbed.
+        while heap and heap[0][0] == cut:
+            _, i = heappop(heap)
+            flags[i] = not flags[i]
+            nex = next(iterators[i], None)
+            if nex is not None:
+                heappush(heap, (nex, i))
+        now = predicate(flags)
+        if now != inside:
+            if now:
+                start = cut
+            elif start < cut:
+                yield _piece(start, cut)
+            inside = now
+    if inside and start < (inf, 0):
+        yield _piece(start, (inf, 0))
+
+
+def _union(flags):
+    return any(flags)
+
+
+def _intersection(flags):
+    return all(flags)
+
+
+def _difference(flags):
+    return flags[0] and not any(flags[1:])
+
+
+def _symmetric_difference(flags):
+    return sum(flags) % 2 == 1
+
+
+def _complement(flags):
+    return not flags[0]
+
+
+def union(*iterables):
+    """Yield pieces of union of all the iterables of pieces."""
+    return _sweep(iterables, _union)
+
+
+def intersection(iterable, *others):
+    """Yield pieces of intersection of all the iterables of pieces."""
+    return _sweep((iterable,) + others, _intersection)
+
+
+def difference(iterable, *others):
+    """Yield pieces that are in iterable but not in any of the others."""
+    return _sweep((iterable,) + others, _difference)
+
+
+def xor(*iterables):
+    """Yield pieces that are in odd number of the iterables, same as Set.symmetric_difference()."""
+    return _sweep(iterables, _symmetric_difference)
+
+
+def complement(iterable):
+    """Yield pieces of complement of iterable of pieces, same as ~Set."""
+    return _sweep((iterable,), _complement)
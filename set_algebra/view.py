@@ -0,0 +1,152 @@
+from itertools import islice
+
+from set_algebra.interval import Interval
+from set_algebra.parser import OPEN_LEFT_TO_BOUNDS_MAPPING
+from set_algebra.set_ import Set
+from set_algebra.stream import (_complement, _difference, _intersection,
+    _sweep, _symmetric_difference, _union)
+
+
+class SetView(object):
+    """
+    Read-only lazy view of union, intersection, difference,
+    symmetric difference or complement of Sets and/or other views.
+
+    View is created in O(1) time and keeps references to its operands,
+    nothing is copied, so the view always reflects their current state:
+        SetView.union(a, b)
+        SetView.intersection(a, b, ...)
+        SetView.difference(a, b, ...)
+        SetView.symmetric_difference(a, b, ...)
+        SetView.complement(a), same as a.complement_view()
+    Views can be combined further with operators | & - ^ ~.
+
+    "x in view" asks the operands in O(log n) time for scalar x.
+    Iteration and irange() yield canonical pieces of the result, merging
+    pieces of the operands on the fly. to_set() materializes the view.
+
+    >>> allowed = Set('[0, 10], [20, 30]')
+    >>> view = allowed.complement_view()
+    >>> 15 in view
+    True
+    >>> list(view.irange(0, 25))
+    [Interval('(10, 20)')]
+    """
+    __slots__ = ('_operands', '_predicate')
+
+    def __init__(self, predicate, operands):
+        for s in operands:
+            if not isinstance(s, (Set, SetView)):
+                raise TypeError('SetView operand must be Set or SetView, not %s' % type(s).__name__)
+        self._predicate = predicate
+        self._operands = operands
+
+    @classmethod
+    def union(cls, *sets):
+        """Return view of union of all the sets."""
+        return cls(_union, sets)
+
+    @classmethod
+    def intersection(cls, *sets):
+        """Return view of intersection of all the sets."""
+        if not sets:
+            raise TypeError('intersection requires at least one set')
+        return cls(_intersection, sets)
+
+    @classmethod
+    def difference(cls, s, *others):
+        """Return view of everything in s that is not in any of the others."""
+        return cls(_difference, (s,) + others)
+
+    @classmethod
+    def symmetric_difference(cls, *sets):
+        """Return view of everything that is in odd number of the sets."""
+        return cls(_symmetric_difference, sets)
+
+    @classmethod
+    def complement(cls, s):
+        """Return view of everything that is not in s."""
+        return cls(_complement, (s,))
+
+    def __repr__(self):
+        name = self._predicate.__name__.lstrip('_')
+        operands = ', '.join(map(repr, self._operands))
+        return '%s.%s(%s)' % (type(self).__name__, name, operands)
+
+    def __or__(self, other):
+        return SetView.union(self, other)
+
+    def __and__(self, other):
+        return SetView.intersection(self, other)
+
+    def __sub__(self, other):
+        return SetView.difference(self, other)
+
+    def __xor__(self, other):
+        return SetView.symmetric_difference(self, other)
+
+    def __invert__(self):
+        return SetView.complement(self)
+
+    def _iter_window(self, window):
+        """Yield pieces of the view trimmed to fit into Interval window, or all if None."""
+        iterables = []
+        for s in self._operands:
+            if window is None:
+                iterables.append(s.pieces if isinstance(s, Set) else s._iter_window(None))
+            elif isinstance(s, Set):
+                bounds = OPEN_LEFT_TO_BOUNDS_MAPPING[window.a.open, True] \
+                       + OPEN_LEFT_TO_BOUNDS_MAPPING[window.b.open, False]
+                iterables.append(s.irange(window.a.value, window.b.value, bounds))
+            else:
+                iterables.append(s._iter_window(window))
+        predicate = self._predicate
+        if window is not None and predicate([False] * len(iterables)):
+            # Result covers points outside of all the operands,
+            # so it is restricted to the window explicitly.
+            iterables.append([window])
+            predicate = lambda flags, p=self._predicate: flags[-1] and p(flags[:-1])
+        return _sweep(iterables, predicate)
+
+    def __iter__(self):
+        """Iterate over canonical pieces of the view in ascending order."""
+        return self._iter_window(None)
+
+    def irange(self, lo, hi, bounds='[]'):
+        """
+        Generate pieces of the view that overlap with the interval
+        from lo to hi, trimmed to fit into it, see Set.irange().
+        Only pieces of the operands within the window are touched.
+        """
+        return self._iter_window(Interval(lo, hi, bounds))
+
+    def __contains__(self, x):
+        """
+        x in view
+        Test scalar or interval x for membership in the view.
+        """
+        if isinstance(x, Interval):
+            pieces = list(islice(self._iter_window(x), 2))
+            return pieces == [x]
+        return self._predicate([x in s for s in self._operands])
+
+    def __bool__(self):
+        return next(iter(self), None) is not None
+
+    def __nonzero__(self):
+        return next(iter(self), None) is not None
+
+    @property
+    def pieces(self):
+        """List of pieces of the view, computed on every access."""
+        return list(self)
+
+    @property
+    def notation(self):
+        return self.to_set().notation
+
+    def to_set(self):
+        """Return a new Set with the content of the view."""
+        new = Set()
+        new.pieces = list(self)
+        return new
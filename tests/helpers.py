@@ -0,0 +1,23 @@
+from set_algebra import Interval, Set
+
+
+BOUNDS = ['[]', '[)', '(]', '()']
+
+
+def random_set(rng, n=20, hi=100, max_length=5, unbounded=False):
+    """
+    Return random Set of about n pieces between 0 and hi + max_length.
+    If unbounded, the Set is randomly extended to -inf and/or inf.
+    """
+    pieces = []
+    for _ in range(n):
+        a = rng.randint(0, hi)
+        if rng.random() < 0.3:
+            pieces.append(a)
+        else:
+            pieces.append(Interval(a, a + rng.randint(1, max_length), rng.choice(BOUNDS)))
+    if unbounded and rng.random() < 0.2:
+        pieces.append(Interval('(-inf, -10]'))
+    if unbounded and rng.random() < 0.2:
+        pieces.append(Interval('[%d, inf)' % (hi + max_length + 10)))
+    return Set(pieces)
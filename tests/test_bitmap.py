@@ -0,0 +1,131 @@
+import random
+
+import pytest
+
+from set_algebra import BitmapSet, Interval, IntSet, Set
+from set_algebra import bitmap
+from set_algebra.bitmap import RUNS_MAX, _Runs
+
+
+def test_bitmap_set_init():
+
+    assert BitmapSet().pieces == []
+    assert not BitmapSet()
+    assert BitmapSet([3, 1, 2]).pieces == [Interval('[1, 3]')]
+    assert BitmapSet('[1, 2], [3, 4], {6}').notation == '[1, 4], {6}'
+    assert BitmapSet('(0.5, 1.5), (3, 7)').notation == '{1}, [4, 6]'
+    assert BitmapSet(IntSet('[1, 5]')) == BitmapSet(Set('[1, 5]'))
+    assert BitmapSet([-70000, Interval('[-5, 5]')]).notation == '{-70000}, [-5, 5]'
+    s = BitmapSet([Interval('[65530, 65540]')])
+    assert s.keys == [0, 1]
+    assert s.notation == '[65530, 65540]'
+    assert s.to_set() == Set('[65530, 65540]')
+    assert s.to_int_set() == IntSet('[65530, 65540]')
+    assert BitmapSet(s) == s
+    assert BitmapSet(s) is not s
+
+    with pytest.raises(ValueError):
+        BitmapSet('[0, inf)')
+    with pytest.raises(ValueError):
+        BitmapSet([0.5])
+
+
+def test_bitmap_set_containers():
+
+    sparse = BitmapSet(range(0, 2 * RUNS_MAX, 2))
+    assert isinstance(sparse.chunks[0], _Runs)
+    dense = BitmapSet(range(0, 2 * RUNS_MAX + 2, 2))
+    assert isinstance(dense.chunks[0], int)
+    full = BitmapSet([Interval(0, 10**6, '[]')])
+    assert all(isinstance(c, _Runs) and len(c.starts) == 1 for c in full.chunks)
+    # Result of operation takes the smaller container again.
+    assert isinstance((dense & BitmapSet([Interval('[0, 100]')])).chunks[0], _Runs)
+    assert isinstance((sparse | dense).chunks[0], int)
+
+
+def test_bitmap_set_add_remove():
+
+    s = BitmapSet()
+    s.add(5)
+    s.add(Interval('[7, 9]'))
+    s.add(6)
+    assert s.notation == '[5, 9]'
+    s.remove(Interval('(6, 8]'))
+    assert s.notation == '[5, 6], {9}'
+    s.add(Interval('[65535, 65537]'))
+    s.remove(65536)
+    assert s.notation == '[5, 6], {9}, {65535}, {65537}'
+    s.remove(Interval(0, 10**6, '[]'))
+    assert s.keys == []
+    for x in range(0, 3 * RUNS_MAX, 2):
+        s.add(x)
+    assert isinstance(s.chunks[0], int)
+    assert len(s) == 3 * RUNS_MAX // 2
+    for x in range(0, 3 * RUNS_MAX, 2):
+        s.remove(x)
+    assert not s
+    s.add(1)
+    s.clear()
+    assert s == BitmapSet()
+
+
+def test_bitmap_set_sparse_operands_merge_runs(monkeypatch):
+
+    rng = random.Random(40)
+    a = set(rng.sample(range(10**9), 5000))
+    b = set(rng.sample(range(10**9), 5000)) | set(rng.sample(sorted(a), 100))
+    b.update(range(70000, 70100))
+    sa = BitmapSet(a)
+    sb = BitmapSet(b)
+
+    def no_bitmaps(c):
+        raise AssertionError('run lists must not be converted to bitmaps')
+
+    # Chunks of a few integers are merged run by run, never as 2**16 bit bitmaps.
+    monkeypatch.setattr(bitmap, '_bitmap', no_bitmaps)
+    for op in ['__or__', '__and__', '__sub__', '__xor__']:
+        result = getattr(sa, op)(sb)
+        assert set(result) == getattr(a, op)(b)
+        assert all(isinstance(c, _Runs) for c in result.chunks)
+    assert sa == BitmapSet(a)
+    assert len(sa | sb) == len(a | b)
+
+
+def test_bitmap_set_matches_python_set():
+
+    rng = random.Random(39)
+    for _ in range(12):
+        a = set(rng.sample(range(200000), rng.randint(0, 3000)))
+        b = set(rng.sample(range(200000), rng.randint(0, 3000)))
+        b.update(range(1000, 1000 + rng.randint(0, 20000)))
+        sa = BitmapSet(a)
+        sb = BitmapSet(b)
+        assert set(sa | sb) == a | b
+        assert set(sa & sb) == a & b
+        assert set(sa - sb) == a - b
+        assert set(sa ^ sb) == a ^ b
+        assert len(sa) == len(a)
+        assert (sa <= sb) == (a <= b)
+        assert (sa | sb >= sb)
+        assert sa.isdisjoint(sb) == a.isdisjoint(b)
+        assert sa.to_int_set() == IntSet(a)
+        for x in rng.sample(range(200000), 100):
+            assert (x in sa) == (x in a)
+            assert (x in sb) == (x in b)
+        s = sa.copy()
+        s.symmetric_difference_update(sb)
+        assert s == sa ^ sb
+
+    s = BitmapSet([1, 2, 3, Interval('[100000, 100100]')])
+    assert Interval('[1, 3]') in s
+    assert Interval('(99999, 100100.5)') in s
+    assert Interval('[1, 4]') not in s
+    assert Interval('[100000, 200000]') not in s
+    assert 2.5 not in s
+    assert 'a' not in s
+    assert s.union([4]).notation == '[1, 4], [100000, 100100]'
+    assert s.intersection('[0, 2]').notation == '[1, 2]'
+    assert s.difference([2]).notation == '{1}, {3}, [100000, 100100]'
+
+    with pytest.raises(TypeError):
+        BitmapSet() | IntSet()
@@ -0,0 +1,128 @@
+import os
+import random
+
+import pytest
+
+from set_algebra import DiskSet, Interval, Set
+
+from helpers import random_set
+
+
+def test_disk_set_from_sorted(tmpdir):
+
+    s = Set('(-inf, 0), {1}, [2, 3], (4, 5]')
+    d = DiskSet.from_sorted(str(tmpdir.join('d')), s.pieces, chunk_size=2)
+    assert len(d) == 4
+    assert d.pieces == s.pieces
+    assert d.notation == s.notation
+    assert d.to_set() == s
+    assert d == s
+    assert len(os.listdir(d.directory)) == 3
+    assert DiskSet(d.directory) == d
+    assert not DiskSet.from_sorted(str(tmpdir.join('empty')), [])
+
+
+def test_disk_set_from_sorted_coalesces_and_validates(tmpdir):
+
+    pieces = [Interval('[1, 2)'), 2, Interval('(2, 3]'), 5]
+    d = DiskSet.from_sorted(str(tmpdir.join('d')), iter(pieces))
+    assert d.pieces == [Interval('[1, 3]'), 5]
+    with pytest.raises(ValueError):
+        DiskSet.from_sorted(str(tmpdir.join('d')), [])
+    with pytest.raises(ValueError):
+        DiskSet.from_sorted(str(tmpdir.join('unsorted')), [3, 1])
+
+
+def test_disk_set_from_sorted_failure_leaves_nothing(tmpdir):
+
+    def failing_pieces():
+        for i in range(10):
+            yield i
+        raise RuntimeError('source failed')
+
+    path = str(tmpdir.join('d'))
+    with pytest.raises(RuntimeError):
+        DiskSet.from_sorted(path, failing_pieces(), chunk_size=3)
+    with pytest.raises(ValueError):
+        DiskSet.from_sorted(path, list(range(10)) + [5], chunk_size=3)
+    assert tmpdir.listdir() == []
+    # Retry into the same directory sees none of the failed attempts.
+    d = DiskSet.from_sorted(path, [20, 21], chunk_size=3)
+    assert d.pieces == [20, 21]
+    assert sorted(os.listdir(path)) == ['00000000.chunk', 'index']
+
+    tmpdir.mkdir('empty')
+    assert DiskSet.from_sorted(str(tmpdir.join('empty')), [1]).pieces == [1]
+    tmpdir.mkdir('other').join('file').write('x')
+    with pytest.raises(ValueError):
+        DiskSet.from_sorted(str(tmpdir.join('other')), [1])
+
+
+def test_disk_set_from_iterable(tmpdir):
+
+    rng = random.Random(1)
+    # Overlapping pieces in random order.
+    pieces = [random_set(rng, n=1).pieces[0] for _ in range(200)]
+    d = DiskSet.from_iterable(str(tmpdir.join('d')), pieces, chunk_size=7, run_size=10)
+    assert d == Set(pieces)
+
+
+def test_disk_set_search():
+
+    rng = random.Random(2)
+    s = random_set(rng, n=100, hi=500, unbounded=True)
+    d = DiskSet.from_sorted(None, s.pieces, chunk_size=5)
+    try:
+        for x in range(-20, 530):
+            assert d.search(x) == s.search(x)
+            assert d.search(x + 0.5) == s.search(x + 0.5)
+            assert (x in d) == (x in s)
+        for piece in s.pieces:
+            if isinstance(piece, Interval):
+                assert piece in d
+        assert Interval('[-5, 600]') not in d
+        n = len(s.pieces)
+        for _ in range(300):
+            x = rng.randint(-20, 530)
+            lo = rng.randint(0, n)
+            hi = rng.randint(lo, n)
+            assert d.search(x, lo, hi) == s.search(x, lo, hi)
+            assert d.search(x, lo) == s.search(x, lo)
+    finally:
+        d.destroy()
+
+
+def test_disk_set_irange(tmpdir):
+
+    rng = random.Random(3)
+    s = random_set(rng, n=100, hi=500)
+    d = DiskSet.from_sorted(str(tmpdir.join('d')), s.pieces, chunk_size=4)
+    for _ in range(200):
+        lo = rng.randint(-10, 520)
+        hi = lo + rng.randint(0, 100)
+        bounds = rng.choice(['[]', '[)', '(]', '()'])
+        if lo == hi:
+            bounds = '[]'
+        assert list(d.irange(lo, hi, bounds)) == list(s.irange(lo, hi, bounds))
+
+
+def test_disk_set_operations(tmpdir):
+
+    rng = random.Random(4)
+    for i in range(20):
+        a = random_set(rng, n=50, unbounded=True)
+        b = random_set(rng, n=50, unbounded=True)
+        c = random_set(rng, n=50, unbounded=True)
+        da = DiskSet.from_sorted(str(tmpdir.join('a%d' % i)), a.pieces, chunk_size=3)
+        db = DiskSet.from_sorted(str(tmpdir.join('b%d' % i)), b.pieces, chunk_size=3)
+        path = str(tmpdir.join('union%d' % i))
+        assert da.union(db, c, directory=path) == a | b | c
+        assert DiskSet(path) == a | b | c
+        assert da.intersection(db, c, directory=str(tmpdir.join('and%d' % i))) == a & b & c
+        assert da.difference(db, directory=str(tmpdir.join('sub%d' % i))) == a - b
+        assert da.symmetric_difference(c, directory=str(tmpdir.join('xor%d' % i))) == a ^ c
+        for result, expected in [(da | b, a | b), (da & db, a & b), (da - c, a - c), (da ^ db, a ^ b)]:
+            assert result == expected
+            result.destroy()
+    with pytest.raises(TypeError):
+        da | [1]
@@ -0,0 +1,102 @@
+import datetime
+import random
+
+from set_algebra import Endpoint, GapIndex, Interval, Set, inf
+
+
+def as_interval(piece):
+    return piece if isinstance(piece, Interval) else Interval(piece, piece, '[]')
+
+
+def brute_first_fit(s, start, length):
+    for gap in map(as_interval, (~s).pieces):
+        if gap.b < start:
+            continue
+        if start in gap:
+            gap = Interval(Endpoint(start, '['), gap.b)
+        if gap.b.value == inf or gap.b.value - gap.a.value >= length:
+            return gap
+    return None
+
+
+def brute_best_fit(s, length):
+    gaps = list(map(as_interval, (~s).pieces))
+    finite = [g for g in gaps if g.a.value != -inf and g.b.value != inf]
+    fits = [g for g in finite if g.b.value - g.a.value >= length]
+    if fits:
+        return min(fits, key=lambda g: g.b.value - g.a.value)
+    if gaps and gaps[-1].b.value == inf:
+        return gaps[-1]
+    return gaps[0] if gaps else None
+
+
+def test_gap_index():
+
+    busy = Set('[0, 10), [12, 20), {25}, [30, 40)')
+    gaps = GapIndex(busy)
+    assert gaps.first_fit(5, 2) == Interval('[10, 12)')
+    assert gaps.first_fit(5, 5) == Interval('[20, 25)')
+    assert gaps.first_fit(21, 3) == Interval('[21, 25)')
+    assert gaps.first_fit(21, 5) == Interval('(25, 30)')
+    assert gaps.first_fit(5, 6) == Interval('[40, inf)')
+    assert gaps.first_fit(-5, 3) == Interval('[-5, 0)')
+    assert gaps.first_fit(-5, 6) == Interval('[40, inf)')
+    assert gaps.best_fit(4) == Interval('[20, 25)')
+    assert gaps.best_fit(5) == Interval('[20, 25)')
+    assert gaps.best_fit(6) == Interval('[40, inf)')
+
+    busy.add(Interval('[20, 25)'))
+    assert gaps.first_fit(5, 5) == Interval('(25, 30)')
+    assert gaps.best_fit(5) == Interval('(25, 30)')
+    busy.add(Interval('[40, inf)'))
+    assert gaps.first_fit(35, 6) is None
+    assert gaps.best_fit(6) == Interval('(-inf, 0)')
+
+    gaps.close()
+    busy.add(Interval('[10, 12)'))
+    assert busy._observers is None
+
+
+def test_gap_index_empty_set():
+
+    gaps = GapIndex(Set())
+    assert gaps.first_fit(0, 100) == Interval('[0, inf)')
+    assert gaps.best_fit(100) == Interval('(-inf, inf)')
+
+
+def test_gap_index_datetime():
+
+    day = datetime.datetime(2018, 6, 16)
+    hour = datetime.timedelta(hours=1)
+    busy = Set([Interval(day + 9*hour, day + 12*hour, '[)'),
+                Interval(day + 13*hour, day + 18*hour, '[)')])
+    gaps = GapIndex(busy)
+    slot = gaps.first_fit(day + 10*hour, hour)
+    assert slot == Interval(day + 12*hour, day + 13*hour, '[)')
+    busy.add(Interval(slot.a.value, slot.a.value + hour, '[)'))
+    slot = gaps.first_fit(day + 10*hour, hour)
+    assert slot == Interval(day + 18*hour, inf, '[)')
+
+
+def test_gap_index_is_maintained_incrementally():
+
+    rng = random.Random(30)
+    busy = Set()
+    gaps = GapIndex(busy)
+    for _ in range(300):
+        a = rng.randint(0, 200)
+        if rng.random() < 0.2:
+            x = a
+        else:
+            x = Interval(a, a + rng.randint(1, 10), rng.choice(['[]', '[)', '(]', '()']))
+        if rng.random() < 0.6:
+            busy.add(x)
+        else:
+            busy.remove(x)
+        for _ in range(5):
+            start = rng.randint(-10, 220)
+            length = rng.randint(0, 12)
+            assert gaps.first_fit(start, length) == brute_first_fit(busy, start, length)
+            assert gaps.best_fit(length) == brute_best_fit(busy, length)
+        size = gaps._by_length.size if gaps._by_length is not None else 0
+        assert size == max(len(busy.pieces) - 1, 0)
@@ -0,0 +1,136 @@
+import random
+
+import pytest
+
+from set_algebra import Interval, IntSet, Set
+from set_algebra.int_set import MAX, MIN
+
+
+def test_int_set_init():
+
+    assert IntSet().pieces == []
+    assert not IntSet()
+    assert IntSet([1, 2, 3]).pieces == [Interval('[1, 3]')]
+    assert IntSet([1, 2, Interval('(2, 5)')]).notation == '[1, 4]'
+    assert IntSet('[1, 2], [3, 4], {6}').notation == '[1, 4], {6}'
+    assert IntSet('(0.5, 1.5), [2.1, 3.9]').notation == '{1}, {3}'
+    assert IntSet('(1, 2)').pieces == []
+    assert IntSet('(-inf, 0)').notation == '(-inf, -1]'
+    assert IntSet(Set('[1, 10)')) == IntSet([Interval('[1, 9]')])
+    s = IntSet('[1, 5]')
+    assert IntSet(s) == s
+    assert IntSet(s) is not s
+    assert IntSet('[1, 3]').to_set() == Set('[1, 3]')
+    assert IntSet([3, 4.0]).notation == '[3, 4]'
+
+    with pytest.raises(ValueError):
+        IntSet([1.5])
+    with pytest.raises(TypeError):
+        IntSet(['a'])
+    with pytest.raises(ValueError):
+        IntSet([2**63])
+
+
+def test_int_set_storage_is_compact():
+
+    s = IntSet(range(0, 1000, 2))
+    s.add(Interval('[1, 999]'))
+    assert list(s.starts) == [0]
+    assert list(s.ends) == [999]
+    s = IntSet('(-inf, 0], [5, inf)')
+    assert (list(s.starts), list(s.ends)) == ([MIN, 5], [0, MAX])
+
+
+def test_int_set_contains():
+
+    s = IntSet('[1, 3], {5}, [7, inf)')
+    assert 1 in s
+    assert 3 in s
+    assert 4 not in s
+    assert 5 in s
+    assert 10**9 in s
+    assert 2.0 in s
+    assert 2.5 not in s
+    assert 0 not in s
+    assert Interval('(0, 4)') in s
+    assert Interval('[0, 4)') not in s
+    assert Interval('(4.5, 5.5)') in s
+    assert Interval('[7, inf)') in s
+    assert Interval('(-inf, 2]') not in s
+
+
+def test_int_set_add_remove():
+
+    s = IntSet()
+    s.add(5)
+    s.add(Interval('[7, 9]'))
+    assert s.notation == '{5}, [7, 9]'
+    s.add(6)
+    assert s.notation == '[5, 9]'
+    s.add(Interval('(10, 12)'))
+    assert s.notation == '[5, 9], {11}'
+    s.add(10)
+    assert s.notation == '[5, 11]'
+    s.add(Interval('(-inf, 0]'))
+    assert s.notation == '(-inf, 0], [5, 11]'
+    s.remove(Interval('(6, 9)'))
+    assert s.notation == '(-inf, 0], [5, 6], [9, 11]'
+    s.remove(10)
+    assert s.notation == '(-inf, 0], [5, 6], {9}, {11}'
+    s.remove(Interval('[-3, 100]'))
+    assert s.notation == '(-inf, -4]'
+    s.remove(100)
+    s.remove(Interval('(1, 2)'))
+    assert s.notation == '(-inf, -4]'
+    s.clear()
+    assert s == IntSet()
+
+
+def test_int_set_operators():
+
+    rng = random.Random(38)
+    for _ in range(100):
+        a = set(rng.sample(range(60), rng.randint(0, 40)))
+        b = set(rng.sample(range(60), rng.randint(0, 40)))
+        sa = IntSet(a)
+        sb = IntSet(b)
+        assert sa | sb == IntSet(a | b)
+        assert sa & sb == IntSet(a & b)
+        assert sa - sb == IntSet(a - b)
+        assert sa ^ sb == IntSet(a ^ b)
+        assert (sa <= sb) == (a <= b)
+        assert (sa < sb) == (a < b)
+        assert (sa >= sb) == (a >= b)
+        assert (sa > sb) == (a > b)
+        assert sa.isdisjoint(sb) == a.isdisjoint(b)
+        assert ~~sa == sa
+        assert ~sa & sa == IntSet()
+        assert ~sa | sa == IntSet('(-inf, inf)')
+        assert sa - sb == sa & ~sb
+        c = sa.copy()
+        c ^= sb
+        assert c == sa ^ sb
+        for x in range(-1, 61):
+            assert (x in sa) == (x in a)
+            assert (x in ~sa) == (x not in a)
+
+    s = IntSet('[0, 10]')
+    assert s.union([20], IntSet([30])).notation == '[0, 10], {20}, {30}'
+    assert s.intersection('[5, 20]', [Interval('[0, 6]')]).notation == '[5, 6]'
+    assert s.difference([5]).notation == '[0, 4], [6, 10]'
+    assert s.symmetric_difference('[5, 15]').notation == '[0, 4], [11, 15]'
+    assert s.issubset('[0, 20]')
+    assert s.issuperset([0, 10])
+    assert s.union() is not s
+    s.update([11])
+    s.difference_update([0])
+    s.intersection_update('[0, 8]')
+    s.symmetric_difference_update([0])
+    assert s.notation == '[0, 8]'
+    assert ~IntSet() == IntSet(Set('(-inf, inf)'))
+    assert (~IntSet('(-inf, 0]')).notation == '[1, inf)'
+
+    with pytest.raises(TypeError):
+        IntSet() | Set()
+    with pytest.raises(TypeError):
+        IntSet() <= [1]
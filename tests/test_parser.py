@@ -0,0 +1,176 @@
+import datetime
+import io
+
+import pytest
+
+from set_algebra import Endpoint, Interval, Set, inf, is_finite, neg_inf
+from set_algebra import parser
+from set_algebra.parser import (disable_parse_cache, enable_parse_cache,
+    parse_cache_info, parse_datetime, parse_endpoint_notation, parse_interval_notation,
+    parse_value)
+
+
+@pytest.fixture(params=[True, False], ids=['fromisoformat', 'regex'])
+def fromisoformat(request, monkeypatch):
+    if request.param and parser._datetime_fromisoformat is None:
+        pytest.skip('datetime.fromisoformat() is not available')
+    if not request.param:
+        monkeypatch.setattr(parser, '_datetime_fromisoformat', None)
+    return request.param
+
+
+@pytest.fixture
+def parse_cache():
+    enable_parse_cache(maxsize=2)
+    yield
+    disable_parse_cache()
+
+
+def test_parse_datetime(fromisoformat):
+
+    utc = datetime.timezone.utc
+    tests = [
+        ('2020-01-31', datetime.date(2020, 1, 31)),
+        ('2020-01-31T12', datetime.datetime(2020, 1, 31, 12)),
+        ('2020-01-31T12:30', datetime.datetime(2020, 1, 31, 12, 30)),
+        ('2020-01-31 12:30:15', datetime.datetime(2020, 1, 31, 12, 30, 15)),
+        ('2020-01-31T12:30:15.25', datetime.datetime(2020, 1, 31, 12, 30, 15, 250000)),
+        ('2020-01-31T12:30:15.123456', datetime.datetime(2020, 1, 31, 12, 30, 15, 123456)),
+        ('2020-01-31T12:30Z', datetime.datetime(2020, 1, 31, 12, 30, tzinfo=utc)),
+        ('2020-01-31T12:30:00+00:00', datetime.datetime(2020, 1, 31, 12, 30, tzinfo=utc)),
+        ('2020-01-31T12:30:00-05:30', datetime.datetime(2020, 1, 31, 18, tzinfo=utc)),
+    ]
+    for value_str, expected in tests:
+        value = parse_datetime(value_str)
+        assert type(value) is type(expected)
+        assert value == expected
+        assert parse_value(' %s ' % value_str) == expected
+    for value_str in ['2020-13-01', '2020-02-30', '2020-01-01T', '2020-01-01T25:00',
+                      '2020-01-01x', '2020-1-1', '2020-01-01T12:30:00+5']:
+        with pytest.raises(ValueError):
+            parse_value(value_str)
+
+
+def test_datetime_notation_round_trip(fromisoformat):
+
+    tests = [
+        '(-inf, 2020-01-01), {2020-02-01}, [2020-03-01, inf)',
+        '[2020-01-01T00:00, 2020-01-01T12:00:00.25), {2020-01-02 03:04:05.123456}, '
+        '(2020-01-03T00:00:00, inf)',
+        '[2020-01-01T00:00Z, 2020-01-02T00:00+02:00], {2020-01-03 00:00:00-05:30}',
+    ]
+    for notation in tests:
+        s = Set(notation)
+        assert all(isinstance(p, (Interval, datetime.date)) for p in s.pieces)
+        assert Set(s.notation) == s
+        assert Set.read_notation(io.StringIO(s.notation), block_size=7) == s
+        for p in s.pieces:
+            if isinstance(p, Interval):
+                assert Interval(p.notation) == p
+                assert Endpoint(p.a.notation) == p.a
+    day = datetime.timedelta(days=1)
+    start = datetime.datetime(2020, 1, 1, 12)
+    s = Set([Interval(start + 2 * i * day, start + (2 * i + 1) * day, '[)') for i in range(100)])
+    assert Set(s.notation) == s
+
+
+def test_parse_interval_notation():
+
+    tests = [
+        ('[0, 1]', ((0, False, True), (1, False, False))),
+        (' (-inf , 2.5) ', ((neg_inf, True, True), (2.5, True, False))),
+        ('[0, inf)', ((0, False, True), (inf, True, False))),
+    ]
+    for notation, expected in tests:
+        assert parse_interval_notation(notation) == expected
+    for notation in ['[0 1]', '[0, 1, 2]', '0, 1', '[0, x]']:
+        with pytest.raises(ValueError):
+            parse_interval_notation(notation)
+    with pytest.raises(TypeError):
+        parse_interval_notation(None)
+
+
+def test_parse_cache_is_disabled_by_default():
+
+    assert parser._endpoint_cache is None
+    Endpoint('[1')
+    assert parse_cache_info() == (0, 0, 0, 0)
+
+
+def test_parse_cache_counts_hits_and_misses(parse_cache):
+
+    assert Endpoint('[1') == Endpoint('[1')
+    assert Interval('[0, 100]') == Interval('[0, 100]')
+    assert Interval('[0, 100]') == Interval(0, 100, '[]')
+    info = parse_cache_info()
+    assert (info.hits, info.misses, info.maxsize, info.currsize) == (3, 2, 2, 2)
+    # Endpoint and interval notations do not mix.
+    with pytest.raises(ValueError):
+        Endpoint('[0, 100]')
+    assert parse_endpoint_notation('[0') == (0, False, True)
+
+
+def test_parse_cache_drops_least_recently_used(parse_cache):
+
+    for notation in ['[1', '[2', '[1', '[3', '[1', '[2']:
+        Endpoint(notation)
+    assert list(parser._endpoint_cache.data) == ['[1', '[2']
+    assert parse_cache_info().hits == 2
+    assert parse_cache_info().misses == 4
+
+
+def test_parse_cache_returns_new_endpoints(parse_cache):
+
+    e1 = Endpoint('[1')
+    e2 = Endpoint('[1')
+    assert e1 is not e2
+    e1.value = 5
+    assert Endpoint('[1').value == 1
+    i1 = Interval('[0, 1]')
+    i1.a.open = True
+    assert Interval('[0, 1]') == Interval(0, 1, '[]')
+
+
+def test_parse_cache_does_not_cache_errors(parse_cache):
+
+    tests = ['[inf, 5]', '(1, 0)', '1], [2', '[x, 1]']
+    for notation in tests:
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                Interval(notation)
+    with pytest.raises(ValueError):
+        Endpoint('[inf')
+    assert parse_cache_info().currsize <= 4
+
+
+def test_parse_cache_info_reports_configured_maxsize():
+
+    enable_parse_cache(1024)
+    try:
+        assert parse_cache_info().maxsize == 1024
+    finally:
+        disable_parse_cache()
+
+
+def test_enable_parse_cache_raises():
+
+    with pytest.raises(ValueError):
+        enable_parse_cache(maxsize=0)
+
+
+def test_is_finite():
+
+    tests = [
+        (0, True),
+        (2**70, True),
+        (datetime.date(2020, 1, 1), True),
+        (datetime.datetime(2020, 1, 1), True),
+        (1.5, True),
+        ('a', True),
+        (inf, False),
+        (neg_inf, False),
+        (float('inf'), False),
+        (float('-inf'), False),
+    ]
+    for value, expected in tests:
+        assert is_finite(value) is expected
@@ -0,0 +1,145 @@
+import random
+
+import pytest
+
+from set_algebra import Interval, PersistentSet, Set
+from set_algebra.persistent import CHUNK_SIZE
+
+
+def random_piece(rng, hi=1000):
+    a = rng.randint(0, hi)
+    if rng.random() < 0.3:
+        return a
+    return Interval(a, a + rng.randint(1, 20), rng.choice(['[]', '[)', '(]', '()']))
+
+
+def test_persistent_set_init():
+
+    assert PersistentSet().pieces == []
+    assert not PersistentSet()
+    assert PersistentSet('[1, 2], {4}').pieces == [Interval('[1, 2]'), 4]
+    assert PersistentSet([4, Interval('[1, 2]')]).pieces == [Interval('[1, 2]'), 4]
+    s = Set('[1, 2], {4}')
+    p = PersistentSet(s)
+    assert p == s
+    assert PersistentSet(p) == p
+    assert p.notation == '[1, 2], {4}'
+    assert eval(repr(p)) == p
+
+
+def test_persistent_set_versions_are_independent():
+
+    v1 = PersistentSet('[1, 5]')
+    v2 = v1.add(Interval('[10, 20]'))
+    v3 = v2.remove(3)
+    v4 = v3.remove(Interval('[0, 12)'))
+    assert v1.notation == '[1, 5]'
+    assert v2.notation == '[1, 5], [10, 20]'
+    assert v3.notation == '[1, 3), (3, 5], [10, 20]'
+    assert v4.notation == '[12, 20]'
+    assert 3 in v2
+    assert 3 not in v3
+    assert Interval('[2, 4]') in v2
+    assert Interval('[2, 4]') not in v3
+
+
+def test_persistent_set_shares_untouched_chunks():
+
+    v1 = PersistentSet([Interval(i*10, i*10 + 5, '[]') for i in range(CHUNK_SIZE * 10)])
+    v2 = v1.add(Interval('[11, 12]'))
+    v3 = v1.remove(CHUNK_SIZE * 50 + 1)
+    shared = set(map(id, v1._chunks))
+    assert len(shared - set(map(id, v2._chunks))) <= 2
+    assert len(shared - set(map(id, v3._chunks))) <= 3
+    assert v2 == v1
+    assert v3 != v1
+
+
+def test_persistent_set_matches_set():
+
+    rng = random.Random(27)
+    s = Set()
+    p = PersistentSet()
+    versions = []
+    for _ in range(400):
+        x = random_piece(rng)
+        if rng.random() < 0.7:
+            s.add(x)
+            p = p.add(x)
+        else:
+            s.remove(x)
+            p = p.remove(x)
+        assert p == s
+        versions.append((p, s.copy()))
+
+    for p, s in versions[::20]:
+        assert p.pieces == s.pieces
+        for x in range(0, 1030, 7):
+            assert p.search(x) == s.search(x)
+            assert (x in p) == (x in s)
+            lo = rng.randint(0, len(s.pieces))
+            hi = min(lo + rng.randint(0, 40), len(s.pieces))
+            assert p.search(x, lo, hi) == s.search(x, lo, hi)
+
+
+def test_persistent_set_operators():
+
+    rng = random.Random(127)
+    for _ in range(20):
+        s1 = Set([random_piece(rng, 300) for _ in range(100)])
+        s2 = Set([random_piece(rng, 300) for _ in range(100)])
+        p1 = PersistentSet(s1)
+        p2 = PersistentSet(s2)
+        assert p1 | p2 == s1 | s2
+        assert p1 | s2 == s1 | s2
+        assert p1 - p2 == s1 - s2
+        assert p1 & p2 == s1 & s2
+        assert p1 ^ p2 == s1 ^ s2
+        assert ~p1 == ~s1
+        assert p1 == s1
+
+    with pytest.raises(TypeError):
+        PersistentSet() | [1]
+
+
+def test_persistent_set_operators_share_untouched_chunks():
+
+    v1 = PersistentSet([Interval(i*10, i*10 + 5, '[]') for i in range(CHUNK_SIZE * 10)])
+    other = Set([Interval(101, 102, '[]'), 115, Interval(131, 139, '[]')])
+    shared = set(map(id, v1._chunks))
+    for v2 in (v1 | other, v1 - other, v1 ^ other):
+        assert len(shared - set(map(id, v2._chunks))) <= 2
+    assert (v1 | other) == v1.to_set() | other
+    assert (v1 - other) == v1.to_set() - other
+    assert (v1 ^ other) == v1.to_set() ^ other
+    assert v1 | Set() is v1
+
+
+def test_persistent_set_and_shares_chunks_inside_other():
+
+    v1 = PersistentSet([Interval(i*10, i*10 + 5, '[]') for i in range(CHUNK_SIZE * 10)])
+    other = Set([Interval(-100, 3000, '[)'), 3102, Interval(3130, 5000, '[]')])
+    v2 = v1 & other
+    assert v2 == v1.to_set() & other
+    shared = set(map(id, v1._chunks)) & set(map(id, v2._chunks))
+    # Chunks are dropped after 5000, rebuilt around 3000, 3102 and 3130.
+    assert len(shared) >= len(v2._chunks) - 3
+    assert v1 & Set() == PersistentSet()
+    assert v1 & Set('(-inf, inf)') == v1
+    assert (v1 & Set('(-inf, inf)'))._chunks == v1._chunks
+    # Every chunk loses most of its pieces.
+    other = Set([Interval(i*640 + 600, i*640 + 700, '[]') for i in range(10)])
+    v3 = v1 & other
+    assert v3 == v1.to_set() & other
+    assert all(CHUNK_SIZE // 2 <= len(chunk) <= CHUNK_SIZE for chunk in v3._chunks)
+
+
+def test_persistent_set_joins_underfull_chunks():
+
+    n = CHUNK_SIZE * 10
+    v = PersistentSet([Interval(i*10, i*10 + 5, '[]') for i in range(n)])
+    for i in range(n):
+        if i % 4:
+            v = v.remove(Interval(i*10, i*10 + 5, '[]'))
+    assert v == Set([Interval(i*10, i*10 + 5, '[]') for i in range(0, n, 4)])
+    assert all(CHUNK_SIZE // 2 <= len(chunk) <= CHUNK_SIZE for chunk in v._chunks)
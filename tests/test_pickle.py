@@ -0,0 +1,104 @@
+import copy
+import datetime
+import pickle
+import random
+
+from set_algebra import Endpoint, Interval, Set, inf, neg_inf
+
+from helpers import random_set
+
+
+PROTOCOLS = range(pickle.HIGHEST_PROTOCOL + 1)
+
+
+def round_trip(obj, protocol):
+    return pickle.loads(pickle.dumps(obj, protocol))
+
+
+def test_pickle_infinity():
+
+    for protocol in PROTOCOLS:
+        assert round_trip(inf, protocol) is inf
+        assert round_trip(neg_inf, protocol) is neg_inf
+        assert round_trip([inf, neg_inf, inf], protocol) == [inf, neg_inf, inf]
+    assert copy.deepcopy(inf) is inf
+
+
+def test_pickle_endpoint_and_interval():
+
+    tests = [
+        Endpoint('[1'),
+        Endpoint('(-inf'),
+        Endpoint('2.5)'),
+        Endpoint('b', ']'),
+        Interval('[0, 1)'),
+        Interval('(-inf, inf)'),
+        Interval(datetime.date(2020, 1, 1), datetime.date(2021, 1, 1), '(]'),
+    ]
+    for obj in tests:
+        for protocol in PROTOCOLS:
+            restored = round_trip(obj, protocol)
+            assert type(restored) is type(obj)
+            assert restored == obj
+    assert round_trip(Interval('(-inf, 0]'), 2).a.value is neg_inf
+
+
+def test_pickle_set():
+
+    tests = [
+        Set(),
+        Set('(-inf, 0), {1}, [2, 3.5], (4, inf)'),
+        Set([Interval('a', 'c', '[)'), 'x']),
+        Set([Interval(datetime.datetime(2020, 1, 1), datetime.datetime(2020, 1, 2), '[)')]),
+        Set([Interval(2**70, 2**71, '()'), True]),
+    ]
+    rng = random.Random(8)
+    tests.extend(random_set(rng, unbounded=True) for _ in range(20))
+    for s in tests:
+        for protocol in PROTOCOLS:
+            restored = round_trip(s, protocol)
+            assert type(restored) is Set
+            assert restored == s
+            assert [type(p) for p in restored.pieces] == [type(p) for p in s.pieces]
+
+
+def test_pickle_set_skips_observers_and_caches():
+
+    s = Set('[1, 2], [3, 4]', max_gap=0.5)
+    s.add_observer(lambda *args: None)
+    s.measure()
+    s.compile()
+    restored = round_trip(s, 2)
+    assert restored == s
+    assert restored.max_gap == 0.5
+    assert restored._observers is None
+    assert restored._prefix is None
+    restored.add(Interval('[2.2, 2.8]'))
+    assert restored.notation == '[1, 4]'
+
+
+def test_pickle_set_subclass():
+
+    restored = round_trip(SubSet('[1, 2]'), 2)
+    assert type(restored) is SubSet
+    assert restored.notation == '[1, 2]'
+
+
+def test_pickle_set_is_compact():
+
+    s = Set([Interval(i, i + 1, '[)') for i in range(0, 3000, 3)])
+    # Two small ints and a flag per piece.
+    assert len(pickle.dumps(s, 2)) < 8 * len(s.pieces)
+
+
+def test_copy_set():
+
+    s = Set('[1, 2], {5}')
+    for fn in (copy.copy, copy.deepcopy):
+        c = fn(s)
+        assert c == s
+        assert c.pieces[0] is not s.pieces[0]
+
+
+class SubSet(Set):
+    pass
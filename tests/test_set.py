@@ -151,6 +151,36 @@ def test_set_init_from_notation_raises():
             s = Set(notation)
 
 
+def test_set_init_from_notation_whitespace():
+
+    tests = [
+        ('[1,2]', [Interval('[1, 2]')]),
+        ('  ( -inf ,0 ) , { 1 },[2.5e1 , inf)  ', [Interval('(-inf, 0)'), 1, Interval('[25.0, inf)')]),
+        ('(0, 1), (1, 2)', [Interval('(0, 1)'), Interval('(1, 2)')]),
+        ('{-3}, {7}', [-3, 7]),
+    ]
+    for notation, pieces in tests:
+        assert Set(notation).pieces == pieces
+
+
+def test_set_init_from_notation_error_position():
+
+    tests = [
+        ('[1, 2], [3, 4', 'position 8'),
+        ('[1, 2] [3, 4]', 'position 7'),
+        ('[1, 2], {x}', 'position 8'),
+        ('[1, 2], {3},', 'position 12'),
+        ('[1, 2], {2}', 'position 8'),
+        ('[1, 2], [0, 4]', 'position 8'),
+        ('{1}, [inf, inf]', 'position 5'),
+        ('{1}, [5, 4]', 'position 5'),
+    ]
+    for notation, position in tests:
+        with pytest.raises(ValueError) as excinfo:
+            Set(notation)
+        assert position in str(excinfo.value), notation
+
+
 def test_set_repr():
 
     s = Set()
@@ -841,6 +871,17 @@ def test_set_or():
     assert s1 == Set('(-inf, 0), {2}, [4, 6], (9, 12]')
     assert s2 == Set('(-inf, 0], (2, 3), {5}, (7, 8), {9}, (20, inf)')
 
+    # Merged interval extends beyond the added one and overlaps the next one.
+    s1 = Set('[0, 1], [2, 10]')
+    s2 = Set('[0.5, 2.5], [5, 12]')
+    assert s1 | s2 == s2 | s1 == Set('[0, 12]')
+    s1.update(s2)
+    assert s1 == Set('[0, 12]')
+
+    s1 = Set('[16, 17), (17, 21]')
+    s2 = Set('{17}, [19, 24)')
+    assert s1 | s2 == s2 | s1 == Set('[16, 24)')
+
     with pytest.raises(TypeError):
         Set() | 0
     
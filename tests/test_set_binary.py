@@ -0,0 +1,101 @@
+import datetime
+import mmap
+import random
+
+import pytest
+
+from set_algebra import Interval, Set, inf, neg_inf
+from set_algebra.binary import HEADER, PIECE_SIZE
+
+from helpers import random_set
+
+
+def do_bulk_round_trip_tests(tests):
+
+    for pieces, code in tests:
+        s = Set(pieces)
+        data = s.to_bytes()
+        assert len(data) == HEADER.size + PIECE_SIZE * len(s.pieces)
+        assert HEADER.unpack_from(data)[2] == code
+        restored = Set.from_buffer(data)
+        assert restored == s, s
+        assert [type(p) for p in restored.pieces] == [type(p) for p in s.pieces]
+        assert [type(p.a.value) for p in restored.pieces if isinstance(p, Interval)] \
+            == [type(p.a.value) for p in s.pieces if isinstance(p, Interval)]
+
+
+def test_set_binary_round_trip():
+
+    dt = datetime.datetime
+    d = datetime.date
+    tests = [
+        ([], b'q'),
+        ([Interval('(-inf, inf)')], b'q'),
+        ([Interval('(-inf, -5]'), 0, Interval('(1, 2)'), Interval(2**62, inf, '[)')], b'q'),
+        ([Interval('[0.5, 1]'), 3, Interval('(4, 4.25]'), Interval('(7, inf)')], b'd'),
+        ([Interval(-2**53, 0.5, '[]'), 2**53], b'd'),
+        ([Interval(dt(2020, 1, 1), dt(2020, 1, 1, 12, 30, 0, 5), '[)'), dt(2021, 2, 3)], b'M'),
+        ([Interval(neg_inf, dt(1900, 1, 1), '()'), Interval(dt(2000, 1, 1), inf, '()')], b'M'),
+        ([Interval(d(1, 1, 1), d(2020, 1, 1), '[]'), d(9999, 12, 31)], b'D'),
+    ]
+    do_bulk_round_trip_tests(tests)
+
+
+def test_set_binary_random_round_trip():
+
+    rng = random.Random(5)
+    for _ in range(100):
+        s = random_set(rng, unbounded=True)
+        assert Set.from_buffer(s.to_bytes()) == s
+
+
+def test_set_binary_from_buffers(tmpdir):
+
+    s = Set('(-inf, 0), {1}, [2, 3]')
+    data = s.to_bytes()
+    assert Set.from_buffer(memoryview(data)) == s
+    assert Set.from_buffer(bytearray(data)) == s
+    path = str(tmpdir.join('set.bin'))
+    with open(path, 'wb') as f:
+        f.write(data)
+    with open(path, 'rb') as f:
+        m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        assert Set.from_buffer(m) == s
+        m.close()
+
+
+def test_set_binary_unsupported_values():
+
+    tests = [
+        [Interval('a', 'b', '[]')],
+        [Interval(0, 2**63, '[]')],
+        [Interval(0.5, 2**53 + 1, '[]')],
+        [Interval(datetime.datetime(2020, 1, 1), datetime.datetime(2020, 1, 2), '[]'), 10**9],
+        [datetime.datetime(2020, 1, 1, tzinfo=FixedOffset())],
+    ]
+    for pieces in tests:
+        s = Set()
+        s.pieces = pieces
+        with pytest.raises(ValueError):
+            s.to_bytes()
+
+
+def test_set_binary_invalid_buffers():
+
+    data = Set('[1, 2], {5}').to_bytes()
+    tests = [
+        b'',
+        b'SETB' + data[4:],
+        data[:4] + b'\x09' + data[5:],
+        data[:5] + b'x' + data[6:],
+        data[:-1],
+    ]
+    for buf in tests:
+        with pytest.raises(ValueError):
+            Set.from_buffer(buf)
+
+
+class FixedOffset(datetime.tzinfo):
+
+    def utcoffset(self, dt):
+        return datetime.timedelta(hours=1)
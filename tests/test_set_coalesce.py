@@ -0,0 +1,76 @@
+import random
+
+from set_algebra import Interval, Set
+
+
+def test_coalesce():
+
+    s = Set('(-inf, 0), [0.5, 1), {1.2}, (2, 3], {5}, [5.5, 6), (8, inf)')
+    assert s.coalesce(0.5).notation == '(-inf, 1.2], (2, 3], [5, 6), (8, inf)'
+    assert s.coalesce(0.2).notation == '(-inf, 0), [0.5, 1.2], (2, 3], {5}, [5.5, 6), (8, inf)'
+    assert s.coalesce(0) == s
+    assert Set('(0, 1), (1, 2)').coalesce(0) == Set('(0, 2)')
+    assert s.coalesce(10) == Set('(-inf, inf)')
+    assert Set().coalesce(1) == Set()
+
+    piece = s.pieces[3]
+    assert s.coalesce(0).pieces[3] is not piece
+
+
+def test_auto_coalesce_on_add():
+
+    s = Set(max_gap=1)
+    s.add(Interval('[0, 2]'))
+    s.add(Interval('[5, 6]'))
+    assert s.notation == '[0, 2], [5, 6]'
+    s.add(3)
+    assert s.notation == '[0, 3], [5, 6]'
+    s.add(Interval('(3.5, 4)'))
+    assert s.notation == '[0, 6]'
+    s.add(6.5)
+    assert s.notation == '[0, 6.5]'
+
+    s |= Set('{8}, {9}')
+    assert s.notation == '[0, 6.5], [8, 9]'
+    s.remove(Interval('[2, 4]'))
+    assert s.notation == '[0, 2), (4, 6.5], [8, 9]'
+
+    s.max_gap = None
+    s.add(10)
+    assert s.notation == '[0, 2), (4, 6.5], [8, 9], {10}'
+
+    # Single point gaps have zero length and are closed even with max_gap=0.
+    s = Set(max_gap=0)
+    s.add(Interval('[1, 2)'))
+    s.add(Interval('(2, 3]'))
+    s.add(Interval('(3.5, 4]'))
+    assert s.notation == '[1, 3], (3.5, 4]'
+
+
+def test_auto_coalesce_init():
+
+    assert Set('{1}, {2}, {4}', max_gap=1).notation == '[1, 2], {4}'
+    assert Set(Set('{1}, {2}, {4}'), max_gap=1).notation == '[1, 2], {4}'
+    assert Set([1, 4, 2], max_gap=1).notation == '[1, 2], {4}'
+    s = Set([1, 4, 2], max_gap=1)
+    assert s.copy().max_gap == 1
+    assert (s | Set([3])).notation == '[1, 4]'
+    assert Set().max_gap is None
+
+
+def test_auto_coalesce_matches_coalesce():
+
+    rng = random.Random(35)
+    for _ in range(30):
+        pieces = []
+        for _ in range(40):
+            a = rng.randint(0, 300)
+            if rng.random() < 0.3:
+                pieces.append(a)
+            else:
+                pieces.append(Interval(a, a + rng.randint(1, 5), rng.choice(['[]', '[)', '(]', '()'])))
+        max_gap = rng.randint(0, 5)
+        s = Set(max_gap=max_gap)
+        for p in pieces:
+            s.add(p)
+        assert s == Set(pieces).coalesce(max_gap)
@@ -0,0 +1,87 @@
+import random
+from datetime import date
+
+import pytest
+
+from set_algebra import Interval, Set
+from set_algebra.set_ import COMPILE_INLINE_MAX
+
+from helpers import random_set
+
+
+def test_compile_matches_contains():
+
+    rng = random.Random(40)
+    xs = [x / 4.0 for x in range(-10, 430)]
+    for n in (0, 1, 3, COMPILE_INLINE_MAX, 50):
+        for _ in range(20):
+            s = random_set(rng, n)
+            if rng.random() < 0.5:
+                s.add(Interval(-rng.randint(5, 10), 0, '(]'))
+            contains = s.compile()
+            assert [x for x in xs if x in s] == list(filter(contains, xs))
+
+    for notation in [None, '(-inf, inf)', '(-inf, 0), {1}', '[1, 2], (3, inf)']:
+        s = Set(notation)
+        contains = s.compile()
+        assert [x for x in xs if x in s] == list(filter(contains, xs))
+        s = s | Set([Interval(i * 10, i * 10 + 2, '[)') for i in range(20, 40)])
+        contains = s.compile()
+        assert [x for x in xs if x in s] == list(filter(contains, xs))
+
+
+def test_compile_other_types():
+
+    s = Set([Interval(date(2020, 1, 1), date(2020, 2, 1), '[)'), date(2020, 3, 1)])
+    contains = s.compile()
+    assert contains(date(2020, 1, 1))
+    assert contains(date(2020, 1, 31))
+    assert not contains(date(2020, 2, 1))
+    assert contains(date(2020, 3, 1))
+    assert not contains(date(2019, 12, 31))
+
+
+def test_compile_bounds():
+
+    tests = [
+        ('[0, 1)', [(0, True), (0.5, True), (1, False), (-0.5, False)]),
+        ('(0, 1]', [(0, False), (1, True)]),
+        ('{0}, (0.5, 1)', [(0, True), (0.5, False), (0.75, True), (1, False)]),
+        ('(-inf, 0)', [(-10**9, True), (0, False)]),
+        ('[0, inf)', [(0, True), (10**9, True), (-1, False)]),
+        ('(-inf, 0), (0, inf)', [(0, False), (1, True), (-1, True)]),
+    ]
+    for notation, cases in tests:
+        s = Set(notation)
+        # Inlined comparisons and binary search over many pieces.
+        many = s | Set([Interval(i, i + 1, '[)') for i in range(10, 30, 2)])
+        for contains in (s.compile(), many.compile()):
+            for x, expected in cases:
+                assert contains(x) is expected, '%s in %s' % (x, notation)
+
+
+def test_compile_raises_after_change():
+
+    s = Set('[0, 5), {7}')
+    contains = s.compile()
+    assert contains(0)
+    s.add(10)
+    with pytest.raises(RuntimeError):
+        contains(0)
+    assert not s._observers
+    assert s.compile()(10)
+
+    # Compiled functions share one observer.
+    functions = [s.compile() for _ in range(100)]
+    assert len(s._observers) == 1
+    s.remove(10)
+    assert not s._observers
+    for contains in functions:
+        with pytest.raises(RuntimeError):
+            contains(0)
+
+    s = random_set(random.Random(4), 50)
+    contains = s.compile()
+    s &= Set('[0, 50]')
+    with pytest.raises(RuntimeError):
+        contains(0)
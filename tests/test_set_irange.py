@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from set_algebra import Interval, Set
+
+
+def test_irange():
+
+    s = Set('(-inf, 0), [1, 2], {3}, (4, 6), [7, inf)')
+
+    assert list(s.irange(1, 2)) == [Interval('[1, 2]')]
+    assert list(s.irange(0, 3)) == [Interval('[1, 2]'), 3]
+    assert list(s.irange(0, 3, '[)')) == [Interval('[1, 2]')]
+    assert list(s.irange(-5, 1.5)) == [Interval('[-5, 0)'), Interval('[1, 1.5]')]
+    assert list(s.irange(2, 5)) == [2, 3, Interval('(4, 5]')]
+    assert list(s.irange(2, 5, '()')) == [3, Interval('(4, 5)')]
+    assert list(s.irange(4, 7)) == [Interval('(4, 6)'), 7]
+    assert list(s.irange(5, 5)) == [5]
+    assert list(s.irange(6, 6.5)) == []
+    assert list(s.irange(10, 20, '(]')) == [Interval('(10, 20]')]
+    assert list(Set().irange(0, 1)) == []
+
+    with pytest.raises(ValueError):
+        list(s.irange(2, 1))
+
+
+def test_irange_yields_copies():
+
+    s = Set('[1, 5]')
+    piece = next(s.irange(0, 10))
+    assert piece == s.pieces[0]
+    assert piece is not s.pieces[0]
+    assert piece.a is not s.pieces[0].a
+
+
+def test_clip():
+
+    s = Set('(-inf, 0), [1, 2], {3}, (4, 6), [7, inf)')
+    assert s.clip(2, 5).notation == '{2}, {3}, (4, 5]'
+    assert s.clip(-1, 1, '(]').notation == '(-1, 0), {1}'
+    assert s.clip(6, 7, '()') == Set()
+
+    rng = random.Random(28)
+    for _ in range(50):
+        pieces = []
+        for _ in range(30):
+            a = rng.randint(0, 100)
+            if rng.random() < 0.3:
+                pieces.append(a)
+            else:
+                pieces.append(Interval(a, a + rng.randint(1, 5), rng.choice(['[]', '()', '[)', '(]'])))
+        s = Set(pieces)
+        lo = rng.randint(-5, 105)
+        hi = lo + rng.randint(1, 30)
+        bounds = rng.choice(['[]', '()', '[)', '(]'])
+        assert s.clip(lo, hi, bounds) == s & Set([Interval(lo, hi, bounds)])
@@ -0,0 +1,82 @@
+import datetime
+import random
+
+from set_algebra import Interval, Set, inf
+
+
+def brute_measure(s, lo, hi):
+    window = Set([Interval(lo, hi, '[]')]) if lo < hi else Set()
+    total = 0
+    for p in (s & window).pieces:
+        if isinstance(p, Interval):
+            total += p.b.value - p.a.value
+    return total
+
+
+def test_measure():
+
+    assert Set().measure() == 0
+    assert Set('{1}, {2}').measure() == 0
+    assert Set('[1, 1]').measure() == 0
+    assert Set('[1, 3), {4}, (5, 10]').measure() == 7
+    assert Set('(-inf, 0)').measure() is inf
+    assert Set('[0, 1], [2, inf)').measure() is inf
+
+
+def test_measure_window():
+
+    s = Set('(-inf, 0), [1, 3), {4}, (5, 10], [20, inf)')
+    assert s.measure(-5, 0) == 5
+    assert s.measure(-5, 2) == 6
+    assert s.measure(0, 1) == 0
+    assert s.measure(2, 6) == 2
+    assert s.measure(2, 30) == 16
+    assert s.measure(4, 5) == 0
+    assert s.measure(10, 20) == 0
+    assert s.measure(6, 7) == 1
+    assert s.measure(7, 6) == 0
+    assert s.measure(lo=5) is inf
+    assert s.measure(hi=5) is inf
+    assert s.measure(lo=1, hi=100) == 87
+    assert Set('[1, 3), (5, 10]').measure(lo=2) == 6
+    assert Set('[1, 3), (5, 10]').measure(hi=6) == 3
+
+
+def test_measure_datetime():
+
+    day = datetime.datetime(2018, 6, 16)
+    hour = datetime.timedelta(hours=1)
+    s = Set([Interval(day + 9*hour, day + 12*hour, '[)'),
+             Interval(day + 13*hour, day + 18*hour, '[)')])
+    assert s.measure() == 8*hour
+    assert s.measure(day + 10*hour, day + 14*hour) == 3*hour
+    # Zero measure is timedelta as well.
+    zero = datetime.timedelta(0)
+    for s in [Set([day]), Set([day, day + hour]), Set([Interval(day, inf, '[)')])]:
+        measure = s.measure(hi=day)
+        assert type(measure) is datetime.timedelta and measure == zero
+    assert type(Set([day, day + hour]).measure()) is datetime.timedelta
+    assert Set([Interval(day, day + hour, '[)')]).measure(day, day) == zero
+    assert Set().measure() == 0
+
+
+def test_measure_cache_is_dropped_on_change():
+
+    rng = random.Random(31)
+    s = Set()
+    for _ in range(200):
+        a = rng.randint(0, 100)
+        x = Interval(a, a + rng.randint(1, 10), '[)')
+        if rng.random() < 0.6:
+            s.add(x)
+        else:
+            s.remove(x)
+        for _ in range(3):
+            lo = rng.randint(-5, 110)
+            hi = lo + rng.randint(0, 50)
+            assert s.measure(lo, hi) == brute_measure(s, lo, hi)
+        assert s.measure() == brute_measure(s, -1, 200)
+    assert s._observers is not None
+    s.clear()
+    assert s._observers is None
+    assert s.measure() == 0
@@ -0,0 +1,120 @@
+import datetime
+import random
+
+import pytest
+
+from set_algebra import Interval, Set
+
+from helpers import random_set
+
+
+def do_bulk_morphology_tests(tests, fn):
+
+    for s, args, expected in tests:
+        S = Set(s)
+        result = fn(S, *args)
+        assert result == Set(expected), '%s %s -> %s' % (S.notation, args, result.notation)
+        assert S == Set(s)
+
+
+def test_dilate_touching():
+
+    tests = [
+        ('[0, 1), (2, 3]', (0.5,), '[-0.5, 1.5), (1.5, 3.5]'),
+        ('[0, 1], (2, 3]', (0.5,), '[-0.5, 3.5]'),
+        ('[0, 1), (2, 3]', (0.5, 0), '[-0.5, 1), (1.5, 3]'),
+        ('[0, 1), [2, 3]', (0, 1), '[0, 4]'),
+        ('[0, 1), (2, 3]', (0, 1), '[0, 2), (2, 4]'),
+        ('[0, 1], (2, 3]', (0, 1), '[0, 4]'),
+        ('{0}, {2}', (1,), '[-1, 3]'),
+        ('{0}, {2}', (0, 1), '[0, 1], [2, 3]'),
+        ('{0}, (1, 2)', (0, 1), '[0, 3)'),
+        ('{0}, [1, 2)', (0, 1), '[0, 3)'),
+    ]
+    do_bulk_morphology_tests(tests, Set.dilate)
+
+
+def test_dilate_unbounded():
+
+    tests = [
+        ('(-inf, 0)', (1,), '(-inf, 1)'),
+        ('(0, inf)', (1,), '(-1, inf)'),
+        ('(-inf, 0), (2, inf)', (1,), '(-inf, 1), (1, inf)'),
+        ('(-inf, 0], (2, inf)', (1,), '(-inf, inf)'),
+        ('(-inf, 0), (2, inf)', (1, 0), '(-inf, 0), (1, inf)'),
+        ('(-inf, 0), (2, inf)', (0, 2), '(-inf, 2), (2, inf)'),
+        ('(-inf, inf)', (1,), '(-inf, inf)'),
+    ]
+    do_bulk_morphology_tests(tests, Set.dilate)
+
+
+def test_erode_edges():
+
+    tests = [
+        ('[0, 2]', (1,), '{1}'),
+        ('[0, 2)', (1,), []),
+        ('(0, 2]', (1,), []),
+        ('[0, 2]', (0.5, 1.5), '{0.5}'),
+        ('[0, 2], {5}', (0.5,), '[0.5, 1.5]'),
+        ('(-inf, 0)', (1,), '(-inf, -1)'),
+        ('(0, inf)', (1,), '(1, inf)'),
+        ('(-inf, inf)', (1,), '(-inf, inf)'),
+    ]
+    do_bulk_morphology_tests(tests, Set.erode)
+
+
+def test_dilate():
+
+    s = Set('(-inf, 0), [2, 3), {5}, (8, 9], (12, inf)')
+    assert s.dilate(1).notation == '(-inf, 6], (7, 10], (11, inf)'
+    assert s.dilate(0.5, 2).notation == '(-inf, 7], (7.5, 11], (11.5, inf)'
+    assert s.dilate(0.5, 0).notation == '(-inf, 0), [1.5, 3), [4.5, 5], (7.5, 9], (11.5, inf)'
+    assert s.dilate(0) == s
+    assert s.dilate(0, 0) is not s
+    assert Set('{1}, {2}').dilate(0.5) == Set('[0.5, 2.5]')
+    assert Set('(0, 1), (2, 3)').dilate(0.5) == Set('(-0.5, 1.5), (1.5, 3.5)')
+    assert Set().dilate(1) == Set()
+
+    with pytest.raises(ValueError):
+        s.dilate(-1)
+
+
+def test_dilate_matches_add():
+
+    rng = random.Random(34)
+    for _ in range(50):
+        s = random_set(rng, n=30, hi=200, max_length=10)
+        left = rng.randint(0, 3)
+        right = rng.randint(1, 3)
+        expected = Set()
+        for p in s.pieces:
+            if isinstance(p, Interval):
+                bounds = (p.a.open and '(' or '[') + (p.b.open and ')' or ']')
+                expected.add(Interval(p.a.value - left, p.b.value + right, bounds))
+            else:
+                expected.add(Interval(p - left, p + right, '[]'))
+        assert s.dilate(left, right) == expected
+
+
+def test_erode():
+
+    s = Set('(-inf, 0), [2, 3), {5}, [7, 9], (12, 20), (30, inf)')
+    assert s.erode(1).notation == '(-inf, -1), {8}, (13, 19), (31, inf)'
+    assert s.erode(0.5, 0).notation == '(-inf, 0), [2.5, 3), [7.5, 9], (12.5, 20), (30.5, inf)'
+    assert s.erode(0) == s
+    assert Set('(0, 2)').erode(1) == Set()
+    assert Set('[0, 2]').erode(1) == Set([1])
+
+    with pytest.raises(ValueError):
+        s.erode(-1)
+
+
+def test_erode_dilate_datetime():
+
+    day = datetime.datetime(2018, 6, 16)
+    hour = datetime.timedelta(hours=1)
+    s = Set([Interval(day + 9*hour, day + 12*hour, '[)'),
+             Interval(day + 13*hour, day + 18*hour, '[)')])
+    assert s.dilate(hour).pieces == [Interval(day + 8*hour, day + 19*hour, '[)')]
+    assert s.erode(hour).pieces == [Interval(day + 10*hour, day + 11*hour, '[)'),
+                                    Interval(day + 14*hour, day + 17*hour, '[)')]
@@ -0,0 +1,92 @@
+from set_algebra import Endpoint, Set
+
+
+def test_next_piece():
+
+    s = Set('(-inf, 0), [1, 2], {3}, (4, 6]')
+    i0, i1, _, i3 = s.pieces
+    assert s.next_piece(-10) == (0, i0)
+    assert s.next_piece(0) == (1, i1)
+    assert s.next_piece(1) == (1, i1)
+    assert s.next_piece(2.5) == (2, 3)
+    assert s.next_piece(3) == (2, 3)
+    assert s.next_piece(4) == (3, i3)
+    assert s.next_piece(6) == (3, i3)
+    assert s.next_piece(7) == (4, None)
+    assert Set().next_piece(0) == (0, None)
+
+    # Sequential scan with hint.
+    idx = 0
+    found = []
+    for x in [-1, 0.5, 2, 3.5, 5, 8]:
+        idx, piece = s.next_piece(x, idx)
+        found.append(idx)
+    assert found == [0, 1, 1, 3, 3, 4]
+
+    # Pieces at and after hi are not found.
+    assert s.next_piece(0, hi=1) == (1, None)
+    assert s.next_piece(2.5, 1, 2) == (2, None)
+    assert s.next_piece(1.5, 1, 2) == (1, i1)
+
+
+def test_prev_piece():
+
+    s = Set('(-inf, 0), [1, 2], {3}, (4, 6]')
+    i0, i1, _, i3 = s.pieces
+    assert s.prev_piece(-10) == (0, i0)
+    assert s.prev_piece(0) == (0, i0)
+    assert s.prev_piece(0.5) == (0, i0)
+    assert s.prev_piece(2.5) == (1, i1)
+    assert s.prev_piece(3) == (2, 3)
+    assert s.prev_piece(4) == (2, 3)
+    assert s.prev_piece(100) == (3, i3)
+    assert Set('[1, 2]').prev_piece(0) == (-1, None)
+    assert Set().prev_piece(0) == (-1, None)
+
+    # Sequential descending scan with hint.
+    hi = len(s.pieces)
+    found = []
+    for x in [8, 5, 3.5, 2, 0.5, -1]:
+        idx, piece = s.prev_piece(x, hi=hi)
+        hi = idx + 1
+        found.append(idx)
+    assert found == [3, 3, 2, 1, 0, 0]
+
+    # Pieces before lo are not found.
+    assert s.prev_piece(0.5, lo=1) == (0, None)
+    assert s.prev_piece(3.5, lo=3) == (2, None)
+    assert s.prev_piece(3.5, lo=2) == (2, 3)
+
+
+def test_ceil():
+
+    s = Set('(-inf, 0), [1, 2], {3}, (4, 6]')
+    assert s.ceil(-10) == Endpoint('[-10')
+    assert s.ceil(0) == Endpoint('[1')
+    assert s.ceil(2) == Endpoint('[2')
+    assert s.ceil(2.5) == Endpoint('[3')
+    assert s.ceil(3.5) == Endpoint('(4')
+    assert s.ceil(4) == Endpoint('(4')
+    assert s.ceil(6) == Endpoint('[6')
+    assert s.ceil(6.5) is None
+    assert s.ceil(0, lo=1) == Endpoint('[1')
+    assert s.ceil(0, hi=1) is None
+    assert s.ceil(2.5, 1, 2) is None
+    assert s.ceil(2.5, 1, 3) == Endpoint('[3')
+
+
+def test_floor():
+
+    s = Set('(-inf, 0), [1, 2], {3}, (4, 6]')
+    assert s.floor(-10) == Endpoint('-10]')
+    assert s.floor(0) == Endpoint('0)')
+    assert s.floor(0.5) == Endpoint('0)')
+    assert s.floor(2.5) == Endpoint('2]')
+    assert s.floor(3.5) == Endpoint('3]')
+    assert s.floor(4) == Endpoint('3]')
+    assert s.floor(10) == Endpoint('6]')
+    assert s.floor(3.5, lo=3) is None
+    assert s.floor(3.5, lo=2) == Endpoint('3]')
+    assert Set('(1, 2)').floor(1) is None
+    assert Set().floor(1) is None
+    assert Set('(1, 2)').ceil(2) is None
@@ -0,0 +1,101 @@
+import io
+import random
+
+import pytest
+
+from set_algebra import Interval, Set
+from set_algebra import parser, set_
+
+from helpers import random_set
+
+
+BLOCK_SIZES = [1, 2, 5, 64, 65536]
+
+
+def test_set_write_notation(monkeypatch):
+
+    monkeypatch.setattr(set_, 'NOTATION_BATCH', 3)
+    rng = random.Random(9)
+    sets = [Set(), Set('{1}'), Set('(-inf, 0), {1}, [2, 3.5]')]
+    sets.extend(random_set(rng, unbounded=True) for _ in range(20))
+    for s in sets:
+        fp = io.StringIO()
+        s.write_notation(fp)
+        assert fp.getvalue() == s.notation
+
+
+def test_set_read_notation():
+
+    rng = random.Random(10)
+    notations = [
+        '[1, 2]',
+        '  ( -inf ,0 ) , { 1 },[2.5e1 , inf)  ',
+        '{123456789}, {123456790}',
+    ]
+    notations.extend(random_set(rng, unbounded=True).notation for _ in range(20))
+    for notation in notations:
+        for block_size in BLOCK_SIZES:
+            s = Set.read_notation(io.StringIO(notation), block_size)
+            assert s.pieces == Set(notation).pieces, (notation, block_size)
+
+
+def test_set_read_notation_empty():
+
+    for notation in ['', '   ', '\n']:
+        for block_size in BLOCK_SIZES:
+            assert Set.read_notation(io.StringIO(notation), block_size) == Set()
+
+
+def test_set_read_notation_raises():
+
+    tests = [
+        ',',
+        '[1',
+        '[1, 2],',
+        '[1, 2], ',
+        '[1, 2] [3, 4]',
+        '[1, 2]x',
+        '[1, 2], {x}',
+        '[1, 2], {2}',
+        '{1}, [5, 4]',
+        '{1}, [1, 2], , {5}',
+    ]
+    for notation in tests:
+        with pytest.raises(ValueError) as expected:
+            Set(notation)
+        for block_size in BLOCK_SIZES:
+            with pytest.raises(ValueError) as excinfo:
+                Set.read_notation(io.StringIO(notation), block_size)
+            # Quoted rest of notation can be shorter, but position is the same.
+            assert str(excinfo.value).split(':')[0] == str(expected.value).split(':')[0], \
+                (notation, block_size)
+
+
+def test_set_read_notation_bounded_lookahead(monkeypatch):
+
+    monkeypatch.setattr(parser, 'MAX_PIECE_LENGTH', 50)
+    notation = '[1, 2], [3, %s]' % ('9' * 100)
+    with pytest.raises(ValueError) as excinfo:
+        Set.read_notation(io.StringIO(notation), block_size=16)
+    assert 'position 8' in str(excinfo.value)
+    # Limit does not depend on block size.
+    for block_size in BLOCK_SIZES:
+        with pytest.raises(ValueError) as excinfo:
+            Set.read_notation(io.StringIO(notation), block_size)
+        assert 'position 8' in str(excinfo.value)
+    monkeypatch.setattr(parser, 'MAX_PIECE_LENGTH', 200)
+    for block_size in BLOCK_SIZES:
+        assert Set.read_notation(io.StringIO(notation), block_size) == Set(notation)
+    assert Set.read_notation(io.StringIO(notation), block_size=16).pieces[1] \
+        == Interval(3, 10**100 - 1, '[]')
+
+
+def test_set_notation_file_round_trip(tmpdir):
+
+    rng = random.Random(11)
+    s = random_set(rng, n=2000, hi=10000, unbounded=True)
+    path = str(tmpdir.join('s.txt'))
+    with io.open(path, 'w') as f:
+        s.write_notation(f)
+    with io.open(path) as f:
+        assert Set.read_notation(f, block_size=100) == s
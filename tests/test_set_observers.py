@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+from set_algebra import Interval, Set
+
+
+class Mirror(object):
+    """Observer that keeps a copy of Set pieces up to date using change events."""
+
+    def __init__(self, s):
+        self.pieces = list(s.pieces)
+        self.events = []
+
+    def __call__(self, s, start, stop, new_pieces):
+        self.events.append((start, stop, list(new_pieces)))
+        self.pieces[start:stop] = new_pieces
+
+
+def test_observer_events():
+
+    s = Set('[1, 2], [5, 6]')
+    mirror = Mirror(s)
+    s.add_observer(mirror)
+
+    s.add(4)
+    assert mirror.events[-1] == (1, 1, [4])
+
+    s.add(Interval('(2, 3)'))
+    assert mirror.events[-1] == (0, 1, [Interval('[1, 3)')])
+
+    s.remove(1)
+    assert mirror.events[-1] == (0, 1, [Interval('(1, 3)')])
+
+    s.remove(4)
+    assert mirror.events[-1] == (1, 2, [])
+
+    s.remove(Interval('[1.5, 5.5)'))
+    assert mirror.events[-1] == (0, 2, [Interval('(1, 1.5)'), Interval('[5.5, 6]')])
+
+    s.clear()
+    assert mirror.events[-1] == (0, 2, [])
+    assert mirror.pieces == s.pieces == []
+
+
+def test_observer_not_notified_when_nothing_changes():
+
+    s = Set('[1, 2]')
+    mirror = Mirror(s)
+    s.add_observer(mirror)
+    s.add(1)
+    s.remove(3)
+    s.remove(Interval('[4, 5]'))
+    assert mirror.events == []
+
+
+def test_observer_mirrors_random_mutations():
+
+    rng = random.Random(26)
+    s = Set()
+    mirror = Mirror(s)
+    s.add_observer(mirror)
+
+    for _ in range(500):
+        a = rng.randint(0, 50)
+        b = a + rng.randint(1, 10)
+        if rng.random() < 0.3:
+            x = a
+        else:
+            x = Interval(a, b, rng.choice(['[]', '[)', '(]', '()']))
+        op = rng.choice(['add', 'remove', 'ior', 'isub', 'iand', 'ixor'])
+        if op == 'add':
+            s.add(x)
+        elif op == 'remove':
+            s.remove(x)
+        elif op == 'ior':
+            s |= Set([x])
+        elif op == 'isub':
+            s -= Set([x])
+        elif op == 'iand':
+            s &= ~Set([x])
+        else:
+            s ^= Set([x])
+        assert mirror.pieces == s.pieces
+
+
+def test_remove_observer():
+
+    s = Set()
+    mirror = Mirror(s)
+    s.add_observer(mirror)
+    s.add(1)
+    s.remove_observer(mirror)
+    s.add(2)
+    assert mirror.events == [(0, 0, [1])]
+
+    with pytest.raises(ValueError):
+        s.remove_observer(mirror)
+
+
+def test_observers_are_not_copied():
+
+    s = Set('[1, 2]')
+    mirror = Mirror(s)
+    s.add_observer(mirror)
+    s2 = s.copy()
+    s2.add(5)
+    s3 = s | Set([7])
+    assert mirror.events == []
+    assert s3.pieces == [Interval('[1, 2]'), 7]
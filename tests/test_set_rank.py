@@ -0,0 +1,67 @@
+import datetime
+
+import pytest
+
+from set_algebra import Interval, Set
+
+
+s = Set('[0, 2), {3}, (4, 6], {7}, [10, 14]')
+
+
+def test_rank():
+
+    assert s.rank(-1) == 0
+    assert s.rank(0) == 0
+    assert s.rank(2) == 1
+    assert s.rank(3) == 1
+    assert s.rank(3.5) == 2
+    assert s.rank(7) == 3
+    assert s.rank(20) == 5
+    assert Set().rank(0) == 0
+
+
+def test_select():
+
+    assert s.select(0) == Interval('[0, 2)')
+    assert s.select(1) == 3
+    assert s.select(-1) == Interval('[10, 14]')
+    with pytest.raises(IndexError):
+        s.select(5)
+
+
+def test_point_at():
+
+    assert s.point_at(0) == 0
+    assert s.point_at(1) == 1
+    assert s.point_at(2) == 2
+    assert s.point_at(2.5) == 4.5
+    assert s.point_at(3) == 5
+    assert s.point_at(4) == 6
+    assert s.point_at(4.5) == 10.5
+    assert s.point_at(8) == 14
+    assert Set('[0, 2), {5}').point_at(2) == 2
+    assert Set('{-1}, (0, 2)').point_at(0) == 0
+
+    for offset in [-1, 8.5]:
+        with pytest.raises(ValueError):
+            s.point_at(offset)
+    for invalid in ['', '{1}, {2}', '(-inf, 0)', '[0, 1], [2, inf)']:
+        with pytest.raises(ValueError):
+            Set(invalid).point_at(0)
+
+
+def test_quantile():
+
+    assert s.quantile(0) == 0
+    assert s.quantile(0.25) == 2
+    assert s.quantile(0.5) == 6
+    assert s.quantile(0.75) == 12
+    assert s.quantile(1) == 14
+    with pytest.raises(ValueError):
+        s.quantile(1.5)
+
+    day = datetime.datetime(2018, 6, 16)
+    hour = datetime.timedelta(hours=1)
+    s2 = Set([Interval(day, day + 2*hour, '[)'), Interval(day + 10*hour, day + 12*hour, '[)')])
+    assert s2.quantile(0.5) == day + 2*hour
+    assert s2.quantile(0.75) == day + 11*hour
@@ -0,0 +1,100 @@
+import datetime
+import random
+
+import pytest
+
+from set_algebra import Interval, Set
+
+
+def test_sample():
+
+    s = Set('[0, 1), {2}, [10, 13)')
+    rng = random.Random(33)
+    points = s.sample(4000, rng)
+    assert len(points) == 4000
+    assert all(p in s and p != 2 for p in points)
+    in_first = sum(1 for p in points if p < 1)
+    assert 800 < in_first < 1200
+
+    assert s.sample(0) == []
+    assert len(s.sample(3)) == 3
+
+
+class SequenceRandom(object):
+    """Stand-in for random.Random returning given numbers from random()."""
+
+    def __init__(self, numbers):
+        self.numbers = iter(numbers)
+
+    def random(self):
+        return next(self.numbers)
+
+
+def test_sample_open_bounds():
+
+    s = Set('(0, 1), (2, 3]')
+    # Offsets 0 and 1 fall on open starts of the pieces.
+    assert s.sample(2, SequenceRandom([0.0, 0.5, 0.25, 0.75])) == [0.5, 2.5]
+    rng = random.Random(34)
+    s = Set('(0, 0.5), (0.5, 0.5000000000000001), (1, 2)')
+    assert all(p in s for p in s.sample(2000, rng))
+
+    # Offset is rounded to microseconds up to the total measure.
+    day = datetime.datetime(2018, 6, 16)
+    hour = datetime.timedelta(hours=1)
+    s = Set([Interval(day, day + hour, '[)')])
+    assert s.sample(1, SequenceRandom([1 - 2**-53, 0.5])) == [day + hour / 2]
+
+
+def test_sample_datetime():
+
+    day = datetime.datetime(2018, 6, 16)
+    hour = datetime.timedelta(hours=1)
+    s = Set([Interval(day + 9*hour, day + 12*hour, '[)'),
+             Interval(day + 13*hour, day + 18*hour, '[)')])
+    for p in s.sample(100, random.Random(1)):
+        assert p in s
+
+
+def test_sample_raises():
+
+    for notation in ['', '{1}', '(-inf, 0)', '[0, 1], [2, inf)']:
+        with pytest.raises(ValueError):
+            Set(notation).sample(1)
+
+
+def test_sample_numpy():
+
+    numpy = pytest.importorskip('numpy')
+    s = Set('[0, 1), {2}, [10, 13)')
+    points = s.sample(10000, numpy.random.default_rng(33))
+    assert len(points) == 10000
+    assert ((points >= 0) & (points < 1) | (points >= 10) & (points < 13)).all()
+    assert 2000 < (points < 1).sum() < 3000
+    s.add(Interval('[20, 21)'))
+    points = s.sample(1000, numpy.random.default_rng(33))
+    assert (points >= 20).any()
+
+
+def test_sample_numpy_open_bounds():
+
+    numpy = pytest.importorskip('numpy')
+
+    class SequenceGenerator(object):
+        """Stand-in for numpy.random.Generator returning given numbers from random()."""
+
+        def __init__(self, numbers):
+            self.numbers = list(numbers)
+
+        def random(self, size):
+            numbers, self.numbers = self.numbers[:size], self.numbers[size:]
+            return numpy.array(numbers)
+
+    SequenceGenerator.__module__ = 'numpy.random'
+    s = Set('(0, 1), (2, 3]')
+    # Points 0 and 2 on open starts are redrawn as 0.2 and 2.5.
+    points = s.sample(4, SequenceGenerator([0.0, 0.5, 0.25, 0.75, 0.1, 0.75]))
+    assert points.tolist() == [0.2, 2.5, 0.5, 2.5]
+    rng = numpy.random.default_rng(34)
+    s = Set('(0, 0.5), (0.5, 0.5000000000000001), (1, 2)')
+    assert all(p in s for p in s.sample(2000, rng))
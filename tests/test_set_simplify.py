@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from set_algebra import Interval, Set
+
+
+def test_simplify():
+
+    s = Set('(-inf, 0), [1, 2), {4}, (4.5, 6], [10, 11], (20, inf)')
+    new, added = s.simplify(6)
+    assert new == s and added == 0
+    new, added = s.simplify(5)
+    assert new.notation == '(-inf, 0), [1, 2), [4, 6], [10, 11], (20, inf)'
+    assert added == 0.5
+    new, added = s.simplify(3)
+    assert new.notation == '(-inf, 6], [10, 11], (20, inf)'
+    assert added == 3.5
+    new, added = s.simplify(1)
+    assert new == Set('(-inf, inf)')
+    assert added == 16.5
+
+    assert Set().simplify(1) == (Set(), 0)
+    assert Set('(0, 1), (1, 2), (2, 3)').simplify(2) == (Set('(0, 2), (2, 3)'), 0)
+
+    with pytest.raises(ValueError):
+        s.simplify(0)
+
+
+def test_simplify_adds_minimal_measure():
+
+    rng = random.Random(36)
+    for _ in range(20):
+        s = Set([Interval(a, a + rng.randint(1, 4), '[)') for a in rng.sample(range(0, 100, 5), 8)])
+        n = len(s.pieces)
+        k = rng.randint(1, n)
+        new, added = s.simplify(k)
+        assert len(new.pieces) <= k
+        assert new >= s
+        assert new.measure() - s.measure() == added
+        gaps = sorted(s.pieces[i].a.value - s.pieces[i-1].b.value for i in range(1, n))
+        assert added == sum(gaps[:n-k])
@@ -0,0 +1,68 @@
+import datetime
+import random
+
+import pytest
+
+from set_algebra import Interval, Set
+
+
+def rebuilt(s, fn):
+    """Build Set of pieces of s with values transformed with fn one by one."""
+    new = Set()
+    for p in s.pieces:
+        if isinstance(p, Interval):
+            a, a_bound = fn(p.a.value), p.a.open and '(' or '['
+            b, b_bound = fn(p.b.value), p.b.open and ')' or ']'
+            if a > b:
+                a, a_bound, b, b_bound = b, b_bound, a, a_bound
+                a_bound = {')': '(', ']': '['}[a_bound]
+                b_bound = {'(': ')', '[': ']'}[b_bound]
+            new.add(Interval(a, b, a_bound + b_bound))
+        else:
+            new.add(fn(p))
+    return new
+
+
+def test_shift():
+
+    s = Set('(-inf, 0), [1, 2), {4}, (5, inf)')
+    assert s.shift(10).notation == '(-inf, 10), [11, 12), {14}, (15, inf)'
+    assert s.shift(-0.5).notation == '(-inf, -0.5), [0.5, 1.5), {3.5}, (4.5, inf)'
+    assert s.shift(0) == s
+    assert s.shift(0).pieces[1] is not s.pieces[1]
+    assert Set().shift(1) == Set()
+
+    day = datetime.datetime(2018, 6, 16)
+    hour = datetime.timedelta(hours=1)
+    s = Set([Interval(day, day + hour, '[)')])
+    assert s.shift(2*hour) == Set([Interval(day + 2*hour, day + 3*hour, '[)')])
+
+
+def test_scale():
+
+    s = Set('(-inf, 0), [1, 2), {4}, (5, inf)')
+    assert s.scale(2).notation == '(-inf, 0), [2, 4), {8}, (10, inf)'
+    assert s.scale(-1).notation == '(-inf, -5), {-4}, (-2, -1], (0, inf)'
+    assert s.scale(-1).scale(-1) == s
+    assert Set('[1, 2)').scale(-1) == Set('(-2, -1]')
+
+    with pytest.raises(ValueError):
+        s.scale(0)
+
+
+def test_transforms_match_rebuilt_sets():
+
+    rng = random.Random(37)
+    for _ in range(30):
+        pieces = []
+        for _ in range(20):
+            a = rng.randint(-100, 100)
+            if rng.random() < 0.3:
+                pieces.append(a)
+            else:
+                pieces.append(Interval(a, a + rng.randint(1, 5), rng.choice(['[]', '[)', '(]', '()'])))
+        s = Set(pieces)
+        offset = rng.randint(-50, 50)
+        factor = rng.choice([-3, -1, 2, 5])
+        assert s.shift(offset) == rebuilt(s, lambda x: x + offset)
+        assert s.scale(factor) == rebuilt(s, lambda x: x * factor)
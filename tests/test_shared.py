@@ -0,0 +1,144 @@
+import datetime
+import random
+
+import pytest
+
+from set_algebra import Interval, Set, SharedSet, inf, neg_inf
+from set_algebra import shared
+
+from helpers import random_set
+
+
+@pytest.fixture(params=[True, False], ids=['cast', 'struct'])
+def cast(request, monkeypatch):
+    if request.param and not shared._CAST:
+        pytest.skip('memoryview.cast() is not available')
+    monkeypatch.setattr(shared, '_CAST', request.param)
+    return request.param
+
+
+def test_shared_set_publish_and_attach(tmpdir, cast):
+
+    path = str(tmpdir.join('s.set'))
+    s = Set('(-inf, 0), {1}, [2, 3], (4, 5]')
+    SharedSet.publish(s, path)
+    shared_set = SharedSet(path)
+    assert len(shared_set) == 4
+    assert shared_set.pieces == s.pieces
+    assert shared_set.notation == s.notation
+    assert shared_set.to_set() == s
+    assert SharedSet(s.to_bytes()).pieces == s.pieces
+    assert tmpdir.listdir() == [tmpdir.join('s.set')]
+    assert not SharedSet(Set().to_bytes())
+
+
+def test_shared_set_search(cast):
+
+    rng = random.Random(6)
+    for _ in range(20):
+        s = random_set(rng, unbounded=True)
+        shared_set = SharedSet(s.to_bytes())
+        for x in range(-20, 130):
+            assert shared_set.search(x) == s.search(x)
+            assert shared_set.search(x + 0.5) == s.search(x + 0.5)
+            assert (x in shared_set) == (x in s)
+        for x in [neg_inf, inf, float('-inf'), float('inf'), -2**63, 2**63 - 1, -10**30, 10**30]:
+            assert shared_set.search(x) == s.search(x)
+        for piece in s.pieces:
+            if isinstance(piece, Interval):
+                assert piece in shared_set
+        for piece in (~s).pieces:
+            if isinstance(piece, Interval):
+                assert piece not in shared_set
+
+
+def test_shared_set_contains_interval():
+
+    tests = [
+        ('[0, 1), (1, 3)', '(1, 2)', True),
+        ('[0, 1), (1, 3)', '[1, 2)', False),
+        ('[0, 1), (1, 3)', '[0, 1)', True),
+        ('[0, 1), (1, 3)', '[0, 1]', False),
+        ('{0}, [1, 2]', '[0, 1]', False),
+        ('(-inf, inf)', '(-inf, 5]', True),
+    ]
+    for notation, interval, expected in tests:
+        assert (Interval(interval) in SharedSet(Set(notation).to_bytes())) is expected
+
+
+def test_shared_set_irange(cast):
+
+    rng = random.Random(7)
+    s = random_set(rng, n=100, hi=500, unbounded=True)
+    shared_set = SharedSet(s.to_bytes())
+    for _ in range(200):
+        lo = rng.randint(-20, 620)
+        hi = lo + rng.randint(0, 100)
+        bounds = rng.choice(['[]', '[)', '(]', '()']) if lo < hi else '[]'
+        assert list(shared_set.irange(lo, hi, bounds)) == list(s.irange(lo, hi, bounds))
+
+
+def test_shared_set_datetimes():
+
+    day = datetime.timedelta(days=1)
+    start = datetime.datetime(2020, 1, 1, 12)
+    s = Set([Interval(start, start + day, '[)'), Interval(start + 2 * day, inf, '()')])
+    shared_set = SharedSet(s.to_bytes())
+    assert start in shared_set
+    assert start + day not in shared_set
+    assert datetime.datetime(3000, 1, 1) in shared_set
+    assert shared_set.search(start + day) == s.search(start + day)
+    assert list(shared_set.irange(start, start + 3 * day)) == list(s.irange(start, start + 3 * day))
+
+    dates = Set([Interval(datetime.date(2020, 1, 1), datetime.date(2020, 2, 1), '[]')])
+    assert datetime.date(2020, 1, 15) in SharedSet(dates.to_bytes())
+
+
+def test_shared_set_reload(tmpdir):
+
+    path = str(tmpdir.join('s.set'))
+    SharedSet.publish(Set('[1, 2]'), path)
+    first = SharedSet(path)
+    reader = SharedSet(path)
+    assert not reader.reload()
+    pieces = reader.irange(0, 10)
+    assert next(pieces) == Interval('[1, 2]')
+
+    SharedSet.publish(Set('[5, 6], {8}'), path)
+    assert first.pieces == [Interval('[1, 2]')]
+    assert reader.reload()
+    assert reader.pieces == [Interval('[5, 6]'), 8]
+    assert not reader.reload()
+    # Readers of the old version are not affected.
+    assert list(pieces) == []
+    assert first.pieces == [Interval('[1, 2]')]
+    assert len(tmpdir.listdir()) == 1
+
+
+def test_shared_set_publish_failure(tmpdir):
+
+    path = str(tmpdir.join('s.set'))
+    SharedSet.publish(Set('[1, 2]'), path)
+    with pytest.raises(ValueError):
+        SharedSet.publish(Set([Interval('a', 'b', '[]')]), path)
+    assert SharedSet(path).pieces == [Interval('[1, 2]')]
+    assert len(tmpdir.listdir()) == 1
+
+
+def test_shared_set_shared_memory():
+
+    shared_memory = pytest.importorskip('multiprocessing.shared_memory')
+    s = Set('[1, 5], [10, 20]')
+    data = s.to_bytes()
+    segment = shared_memory.SharedMemory(create=True, size=len(data))
+    try:
+        segment.buf[:len(data)] = data
+        attached = shared_memory.SharedMemory(segment.name)
+        shared_set = SharedSet(attached.buf)
+        assert 15 in shared_set
+        assert shared_set.pieces == s.pieces
+        del shared_set
+        attached.close()
+    finally:
+        segment.close()
+        segment.unlink()
@@ -0,0 +1,94 @@
+import itertools
+import random
+
+import pytest
+
+from set_algebra import Interval, Set, stream
+
+from helpers import random_set
+
+
+def test_stream_matches_set_operators():
+
+    rng = random.Random(42)
+    for _ in range(100):
+        a = random_set(rng, unbounded=True)
+        b = random_set(rng, unbounded=True)
+        c = random_set(rng, unbounded=True)
+        assert list(stream.union(iter(a.pieces), iter(b.pieces), iter(c.pieces))) == (a | b | c).pieces
+        assert list(stream.intersection(a.pieces, b.pieces)) == (a & b).pieces
+        assert list(stream.intersection(a.pieces, b.pieces, c.pieces)) == (a & b & c).pieces
+        assert list(stream.difference(a.pieces, b.pieces, c.pieces)) == (a - b - c).pieces
+        assert list(stream.xor(a.pieces, b.pieces)) == (a ^ b).pieces
+        assert list(stream.xor(a.pieces, b.pieces, c.pieces)) == (a ^ b ^ c).pieces
+        assert list(stream.complement(a.pieces)) == (~a).pieces
+        assert list(stream.union(a.pieces)) == a.pieces
+
+
+def do_bulk_stream_tests(tests, fn):
+
+    for x, y, expected in tests:
+        X = Set(x)
+        Y = Set(y)
+        result = list(fn(iter(X.pieces), iter(Y.pieces)))
+        assert result == Set(expected).pieces, '%s, %s -> %s' % (X.notation, Y.notation, result)
+
+
+def test_stream_xor_touching():
+
+    tests = [
+        ('[0, 1]', '[1, 2]', '[0, 1), (1, 2]'),
+        ('[0, 1)', '[1, 2]', '[0, 2]'),
+        ('[0, 2]', '{1}', '[0, 1), (1, 2]'),
+        ('(0, 1), (1, 2)', '{1}', '(0, 2)'),
+        ('(-inf, 0]', '[0, inf)', '(-inf, 0), (0, inf)'),
+        ('(-inf, inf)', '(-inf, inf)', []),
+    ]
+    do_bulk_stream_tests(tests, stream.xor)
+
+
+def test_stream_difference_unbounded():
+
+    tests = [
+        ('(-inf, inf)', '[0, 1)', '(-inf, 0), [1, inf)'),
+        ('(-inf, 5]', '(-inf, 0]', '(0, 5]'),
+        ('[0, inf)', '(1, inf)', '[0, 1]'),
+        ('{0}', '(-inf, inf)', []),
+    ]
+    do_bulk_stream_tests(tests, stream.difference)
+
+
+def test_stream_coalescing():
+
+    pieces = [Interval('[1, 2)'), Interval('[2, 3)'), 3, Interval('(3, 4)')]
+    assert list(stream.union(pieces)) == [Interval('[1, 4)')]
+    assert list(stream.union([1, 3], [2, Interval('(3, 5]')], [Interval('(1, 2)')])) \
+        == [Interval('[1, 2]'), Interval('[3, 5]')]
+    assert list(stream.union([Interval('(1, 2)')], [Interval('[1, 2]')])) == [Interval('[1, 2]')]
+    assert list(stream.intersection([Interval('[1, 2]')], [Interval('[2, 3]')])) == [2]
+    assert list(stream.difference([Interval('[1, 3]')], [2])) == [Interval('[1, 2)'), Interval('(2, 3]')]
+    assert list(stream.complement([])) == [Interval('(-inf, inf)')]
+    assert list(stream.complement([Interval('(-inf, inf)')])) == []
+    assert list(stream.union()) == []
+
+
+def test_stream_is_lazy():
+
+    # Runs [3k, 3k + 1] and [3k + 1, 3k + 2) merge, gaps [3k + 2, 3k + 3) remain.
+    first = (Interval(i, i + 1, '[]') for i in itertools.count(0, 3))
+    second = (Interval(i, i + 1, '[)') for i in itertools.count(1, 3))
+    result = stream.intersection(stream.union(first, second), [Interval('[10, 20]')])
+    assert next(result) == Interval('[10, 11)')
+    assert next(result) == Interval('[12, 14)')
+
+    squares = (i * i for i in itertools.count())
+    assert list(itertools.islice(stream.complement(squares), 3)) \
+        == [Interval('(-inf, 0)'), Interval('(0, 1)'), Interval('(1, 4)')]
+
+
+def test_stream_requires_sorted_pieces():
+
+    with pytest.raises(ValueError):
+        list(stream.union([2, 1]))
+    with pytest.raises(ValueError):
+        list(stream.union([Interval('[1, 3]'), Interval('[2, 4]')]))
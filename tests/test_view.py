@@ -0,0 +1,128 @@
+import random
+
+import pytest
+
+from set_algebra import Interval, Set, SetView, neg_inf
+
+from helpers import random_set
+
+
+def test_view_matches_set_operators():
+
+    rng = random.Random(41)
+    xs = [x / 2.0 for x in range(-30, 240)]
+    for _ in range(30):
+        a = random_set(rng, unbounded=True)
+        b = random_set(rng, unbounded=True)
+        c = random_set(rng, unbounded=True)
+        cases = [
+            (SetView.union(a, b, c), a | b | c),
+            (SetView.intersection(a, b), a & b),
+            (SetView.difference(a, b, c), a - b - c),
+            (SetView.symmetric_difference(a, b, c), a ^ b ^ c),
+            (a.complement_view(), ~a),
+            (~SetView.union(a, b) & c, ~(a | b) & c),
+            (a.complement_view() - b.complement_view(), ~a - ~b),
+        ]
+        for view, expected in cases:
+            assert view.to_set() == expected
+            assert list(view) == expected.pieces
+            for x in xs:
+                assert (x in view) == (x in expected)
+            lo = rng.randint(-20, 120)
+            hi = lo + rng.randint(1, 40)
+            bounds = rng.choice(['[]', '()', '[)', '(]'])
+            assert list(view.irange(lo, hi, bounds)) == list(expected.irange(lo, hi, bounds))
+            for p in expected.pieces[:5]:
+                if isinstance(p, Interval) and p.a.value != neg_inf:
+                    assert p in view
+                    assert Interval(p.a.value - 1, p.b.value, '[)') not in view
+
+
+def do_bulk_view_tests(tests, make_view):
+
+    for x, y, expected in tests:
+        X = Set(x)
+        Y = Set(y)
+        view = make_view(X, Y)
+        assert view.to_set() == Set(expected), '%s, %s -> %s' % (X.notation, Y.notation, view.notation)
+
+
+def test_view_union_touching():
+
+    tests = [
+        ('[0, 1)', '[1, 2]', '[0, 2]'),
+        ('[0, 1)', '(1, 2]', '[0, 1), (1, 2]'),
+        ('[0, 1)', '{1}', '[0, 1]'),
+        ('(0, 1), (1, 2)', '{1}', '(0, 2)'),
+        ('{1}', '[1, 2]', '[1, 2]'),
+        ('(-inf, 0)', '[0, inf)', '(-inf, inf)'),
+        ('(-inf, 0)', '(0, inf)', '(-inf, 0), (0, inf)'),
+    ]
+    do_bulk_view_tests(tests, SetView.union)
+
+
+def test_view_intersection_touching():
+
+    tests = [
+        ('[0, 1]', '[1, 2]', '{1}'),
+        ('[0, 1)', '[1, 2]', []),
+        ('[0, 1]', '(1, 2]', []),
+        ('(-inf, 1]', '[1, inf)', '{1}'),
+        ('(-inf, inf)', '{1}, (2, 3)', '{1}, (2, 3)'),
+    ]
+    do_bulk_view_tests(tests, SetView.intersection)
+
+
+def test_view_difference_touching():
+
+    tests = [
+        ('[0, 2]', '{1}', '[0, 1), (1, 2]'),
+        ('[0, 2]', '[1, 2]', '[0, 1)'),
+        ('[0, 2]', '(1, 2)', '[0, 1], {2}'),
+        ('(-inf, inf)', '{0}', '(-inf, 0), (0, inf)'),
+        ('(-inf, inf)', '(-inf, inf)', []),
+    ]
+    do_bulk_view_tests(tests, SetView.difference)
+
+
+def test_view_complement_edges():
+
+    tests = [
+        ('{0}', '(-inf, 0), (0, inf)'),
+        ('[0, 1)', '(-inf, 0), [1, inf)'),
+        ('(-inf, 0]', '(0, inf)'),
+        ('(-inf, 0), (0, inf)', '{0}'),
+        ('(0, 1), (1, 2)', '(-inf, 0], {1}, [2, inf)'),
+    ]
+    for x, expected in tests:
+        assert Set(x).complement_view().to_set() == Set(expected)
+
+
+def test_view_is_lazy():
+
+    a = Set('[0, 10]')
+    b = Set('(10, 20]')
+    view = SetView.union(a, b)
+    assert view.notation == '[0, 20]'
+    assert Interval('[5, 15]') in view
+    b.remove(15)
+    assert view.notation == '[0, 15), (15, 20]'
+    assert 15 not in view
+    assert Interval('[5, 15]') not in view
+    assert view.pieces == [Interval('[0, 15)'), Interval('(15, 20]')]
+
+    empty = SetView.intersection(a, Set('[11, 12]'))
+    assert not empty
+    assert view
+    assert Set().complement_view().notation == '(-inf, inf)'
+    assert not Set('(-inf, inf)').complement_view()
+    assert repr(SetView.union(a)) == 'SetView.union(%r)' % a
+
+
+def test_view_errors():
+
+    with pytest.raises(TypeError):
+        SetView.union(Set(), [1, 2])
+    with pytest.raises(TypeError):
+        SetView.intersection()